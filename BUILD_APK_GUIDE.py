@@ -27,7 +27,8 @@
 # ارفع الملفات التالية إلى Colab:
 # - main.py
 # - ui_components.py
-# - score_calculator.py
+# - app_config.py و modern_ui.py
+# - مجلد cc_core كاملاً (نواة الحساب)
 # - buildozer.spec
 
 from google.colab import files
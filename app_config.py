@@ -43,11 +43,5 @@ SUIT_COLORS = {
     'club': (0.2, 0.2, 0.2, 1),     # أسود
 }
 
-# نقاط اللعبة
-POINTS = {
-    'trick': 15,        # نقاط الأكلة
-    'diamond': 10,      # نقاط الديناري
-    'queen': 25,        # نقاط البنت
-    'king_heart': 75,   # نقاط شيخ القبة
-    'round_total': -500 # مجموع الجولة
-}
+# نقاط اللعبة وأنواع القواعد (معرفة في النواة cc_core.rules)
+from cc_core.rules import POINTS, RULE_VARIANTS, DEFAULT_RULES  # noqa: E402,F401
@@ -0,0 +1,106 @@
+"""
+تشكيل النص العربي مع ذاكرة مؤقتة
+Arabic shaping (reshape + bidi) behind a bounded LRU cache
+
+الشاشات تعيد بناء عشرات النصوص نفسها في كل زيارة، فالتشكيل يُحفظ
+لكل نص ويُعاد مباشرة. النصوص الثابتة الأكثر استخداماً تُحفظ في ملف عند
+الإغلاق وتُحمّل عند التشغيل التالي فلا يُعاد تشكيلها.
+"""
+
+import json
+import os
+from collections import OrderedDict
+from typing import Dict
+
+import arabic_reshaper
+from bidi.algorithm import get_display
+
+CACHE_SIZE = 2048       # أقصى عدد نصوص في الذاكرة
+PERSIST_SIZE = 512      # أقصى عدد نصوص تُحفظ في الملف
+
+# التشكيل يتغير بتغير المكتبة، فالملف المحفوظ بإصدار آخر يُتجاهل
+SHAPER_VERSION = getattr(arabic_reshaper, '__version__', '')
+
+
+def shape(text: str) -> str:
+    """تشكيل النص وترتيبه للعرض من اليمين لليسار (بدون ذاكرة)"""
+    return get_display(arabic_reshaper.reshape(text))
+
+
+class ShapingCache:
+    """ذاكرة LRU محدودة للنصوص المشكّلة مع عدادات الإصابة"""
+
+    def __init__(self, maxsize: int = CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()   # النص -> [المشكّل، مرات الاستخدام]
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, text: str) -> str:
+        entry = self._entries.get(text)
+        if entry is not None:
+            self.hits += 1
+            entry[1] += 1
+            self._entries.move_to_end(text)
+            return entry[0]
+
+        self.misses += 1
+        shaped = shape(text)
+        if self.maxsize > 0:
+            self._entries[text] = [shaped, 1]
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return shaped
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+    # ==================== الحفظ ====================
+
+    def load(self, path: str) -> int:
+        """تحميل النصوص المحفوظة (بدون احتسابها إصابة أو إخفاقاً)"""
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return 0
+        if data.get('version') != SHAPER_VERSION:
+            return 0
+        loaded = 0
+        for text, shaped in data.get('entries', {}).items():
+            if text not in self._entries and len(self._entries) < self.maxsize:
+                self._entries[text] = [shaped, 0]
+                loaded += 1
+        return loaded
+
+    def save(self, path: str, limit: int = PERSIST_SIZE):
+        """حفظ النصوص الثابتة الأكثر استخداماً (النصوص التي فيها أرقام نتائج تتغير)"""
+        hot = sorted(
+            ((text, entry) for text, entry in self._entries.items()
+             if entry[1] and not any(c.isdigit() for c in text)),
+            key=lambda item: item[1][1], reverse=True
+        )[:limit]
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': SHAPER_VERSION,
+                'entries': {text: entry[0] for text, entry in hot},
+            }, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+
+# ذاكرة مشتركة لكل الشاشات
+shaping_cache = ShapingCache()
@@ -0,0 +1,106 @@
+"""
+قياس أرشيف SQLite عند مليون جولة
+Benchmark: GameArchive write throughput, UI-thread cost and query latency
+
+python benchmarks/bench_archive.py [rounds]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cc_core.archive import GameArchive  # noqa: E402
+
+ROUNDS_PER_GAME = 10
+TEAMS = [f"team{i}" for i in range(500)]
+DAY = 86400
+
+
+def timed(fn, repeat=20):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main():
+    total_rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    games = total_rounds // ROUNDS_PER_GAME
+    rng = random.Random(0)
+    epoch = time.time() - 365 * DAY
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = GameArchive(os.path.join(tmp, 'archive.db'))
+
+        # ألعاب عبر الطابور ثم الجولات بالاستيراد الجماعي
+        start = time.perf_counter()
+        starts = {}
+        for g in range(games):
+            game_id = f"g{g:07d}"
+            starts[game_id] = epoch + g * (365 * DAY / games)
+            archive.start_game(game_id, rng.choice(TEAMS), rng.choice(TEAMS), starts[game_id])
+        archive.flush()
+        games_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        archive.import_rounds(
+            (game_id, r, -200 - (r * 7) % 90, -300 + (r * 7) % 90, None, t + r * 600)
+            for game_id, t in starts.items() for r in range(1, ROUNDS_PER_GAME + 1)
+        )
+        import_s = time.perf_counter() - start
+        print(f"archive: {archive.count()[0]:,} games / {archive.count()[1]:,} rounds "
+              f"({os.path.getsize(os.path.join(tmp, 'archive.db')) / (1 << 20):.0f} MB)")
+        print(f"start_game via queue: {games / games_s:,.0f} games/s")
+        print(f"import_rounds:        {total_rounds / import_s:,.0f} rounds/s")
+
+        # تكلفة add_round على خيط الواجهة + معدل الكتابة في الخلفية
+        live = [f"live{i}" for i in range(100)]
+        for game_id in live:
+            archive.start_game(game_id, "فريقنا", "الخصم")
+        archive.flush()
+        costs = []
+        start = time.perf_counter()
+        for i in range(20_000):
+            t = time.perf_counter()
+            archive.add_round(live[i % 100], i // 100 + 1, -205, -295, 69685)
+            costs.append(time.perf_counter() - t)
+        archive.flush()
+        elapsed = time.perf_counter() - start
+        costs.sort()
+        print(f"add_round on caller:  p50 {costs[len(costs) // 2] * 1e6:.1f} us, "
+              f"p99 {costs[int(len(costs) * 0.99)] * 1e6:.1f} us")
+        print(f"background writes:    {len(costs) / elapsed:,.0f} rounds/s (batched transactions)")
+
+        # الاستعلامات
+        mid = epoch + 180 * DAY
+        first = archive.list_games(limit=50)
+        queries = [
+            ("latest 50 games", lambda: archive.list_games(limit=50)),
+            ("next page (keyset)", lambda: archive.list_games(
+                limit=50, before=(first[-1]['started_at'], first[-1]['id']))),
+            ("team page", lambda: archive.list_games(team="team7", limit=50)),
+            ("team + date range", lambda: archive.list_games(
+                team="team7", since=mid, until=mid + 30 * DAY, limit=50)),
+            ("games in one week", lambda: archive.list_games(
+                since=mid, until=mid + 7 * DAY, limit=500)),
+            ("rounds of a game", lambda: archive.rounds(f"g{games // 2:07d}")),
+            ("rounds in one hour", lambda: archive.rounds_between(mid, mid + 3600)),
+            ("team stats (year)", lambda: archive.team_stats("team7")),
+        ]
+        print(f"{'query':<22} {'ms':>8} {'rows':>6}")
+        for name, query in queries:
+            ms, result = timed(query)
+            rows = len(result) if isinstance(result, list) else 1
+            print(f"{name:<22} {ms:>8.2f} {rows:>6}")
+
+        archive.close()
+
+
+if __name__ == "__main__":
+    main()
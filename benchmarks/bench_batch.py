@@ -0,0 +1,75 @@
+"""
+قياس الحساب الجماعي لملفات الجولات مع عدد العمليات
+Benchmark: cc_core.batch throughput vs worker count
+
+python benchmarks/bench_batch.py [rounds]
+"""
+
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cc_core.batch import run  # noqa: E402
+
+SUITS = ('spade', 'heart', 'diamond', 'club')
+
+
+def write_rounds(path, rounds, seed=0):
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(rounds):
+            queens = rng.sample(SUITS, rng.randrange(5))
+            missing = [s for s in SUITS if s not in queens]
+            has_king = rng.random() < 0.5
+            row = {
+                'game': f"g{i // 20}",
+                'round': i % 20 + 1,
+                'total_cards': 4 * rng.randrange(14),
+                'diamond_count': rng.randrange(14),
+                'queens': [{'suit': s, 'is_doubled': rng.random() < 0.2} for s in queens],
+                'has_king_heart': has_king,
+                'king_heart_doubled': has_king and rng.random() < 0.2,
+                'doubled_to_opponent': [
+                    {'rank': 'Q', 'suit': s} for s in missing if rng.random() < 0.2
+                ] + ([{'rank': 'K', 'suit': 'heart'}] if not has_king and rng.random() < 0.2 else []),
+            }
+            f.write(json.dumps(row) + '\n')
+
+
+class Discard(io.TextIOBase):
+    def write(self, text):
+        return len(text)
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    cores = os.cpu_count() or 1
+    worker_counts = sorted({1, 2, 4, 8, cores} & set(range(1, cores + 1)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'rounds.jsonl')
+        write_rounds(path, rounds)
+        size_mb = os.path.getsize(path) / (1 << 20)
+        print(f"{rounds:,} rounds, {size_mb:.0f} MB, {cores} cores")
+        print(f"{'workers':>8} {'format':>7} {'seconds':>9} {'rounds/s':>12} {'MB/s':>8} {'speedup':>8}")
+
+        for fmt in ('jsonl', 'csv'):
+            base = None
+            for workers in worker_counts:
+                start = time.perf_counter()
+                games, errors = run(path, Discard(), fmt, workers, chunk_bytes=4 << 20)
+                elapsed = time.perf_counter() - start
+                assert not errors and sum(g[0] for g in games.values()) == rounds
+                base = base or elapsed
+                print(f"{workers:>8} {fmt:>7} {elapsed:>9.2f} {rounds / elapsed:>12,.0f} "
+                      f"{size_mb / elapsed:>8.1f} {base / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+قياس نسخ إطار الكاميرا من صورة Kivy إلى NumPy
+Benchmark: per-frame capture cost and allocations at 640x480 and 1280x720
+
+python benchmarks/bench_camera_frames.py [frames]
+
+صورة Kivy بحجم الكاميرا (صورة مركبة من bench_detector) تُقرأ بعدة طرق:
+    png        حفظ PNG على القرص ثم قراءته (الطريق الساذج)
+    pixels     texture.pixels ثم تحويل RGBA إلى BGR وقلب الصورة على المعالج
+    grab       FrameGrabber: RGBA مقروءة من صورة الكاميرا بدون أي تحويل على المعالج
+    grab gray  FrameGrabber مع تحويل رمادي في مصفوفة يُعاد استخدامها
+    grab 320   FrameGrabber مصغر على الـ GPU إلى عرض 320 ورمادي
+ويطبع الوسيط لزمن الإطار، والذاكرة المحجوزة لكل إطار (ذروة tracemalloc)،
+وهل الإطار مطابق للصورة الأصلية (أقصى فرق في البكسل).
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_LOG_MODE', 'PYTHON')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kivy.config import Config  # noqa: E402
+Config.set('graphics', 'maxfps', '0')   # بدون انتظار بين الإطارات
+
+import cv2  # noqa: E402
+import numpy as np  # noqa: E402
+from kivy.base import EventLoop  # noqa: E402
+from kivy.core.window import Window  # noqa: E402
+from kivy.graphics.texture import Texture  # noqa: E402
+
+from bench_detector import make_frame  # noqa: E402
+from camera_frames import FrameGrabber  # noqa: E402
+
+SIZES = ((640, 480), (1280, 720))
+
+
+def camera_texture(image):
+    """صورة Kivy كما تعطيها الكاميرا (الصف الأول في الأسفل)"""
+    h, w = image.shape[:2]
+    texture = Texture.create(size=(w, h), colorfmt='rgba')
+    rgba = cv2.cvtColor(cv2.flip(image, 0), cv2.COLOR_BGR2RGBA)
+    texture.blit_buffer(rgba.tobytes(), colorfmt='rgba', bufferfmt='ubyte')
+    return texture
+
+
+def via_png(texture, path):
+    texture.save(path)
+    return cv2.imread(path, cv2.IMREAD_COLOR)
+
+
+def via_pixels(texture):
+    w, h = texture.size
+    rgba = np.frombuffer(texture.pixels, np.uint8).reshape(h, w, 4)
+    frame = cv2.cvtColor(rgba, cv2.COLOR_RGBA2BGR)
+    return cv2.flip(frame, 0, dst=frame)
+
+
+def measure(grab, frames):
+    """(ms الوسيط، KB لكل إطار، الإطار الأخير)"""
+    grab()  # الإعداد (Fbo وملف PNG) خارج القياس
+    times = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        frame = grab()
+        times.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    peaks = []
+    for _ in range(min(frames, 20)):
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        frame = grab()
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+        del frame
+    tracemalloc.stop()
+    return statistics.median(times), statistics.median(peaks) / 1024, grab()
+
+
+def difference(frame, image):
+    """أقصى فرق بكسل عن الأصل (None للإطار المصغر)"""
+    if frame.shape[:2] != image.shape[:2]:
+        return None
+    if frame.ndim == 2:
+        expected = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    else:
+        expected = image
+        if frame.shape[2] == 4:
+            frame = cv2.cvtColor(frame, cv2.COLOR_RGBA2BGR)
+    return int(np.abs(frame.astype(np.int16) - expected).max())
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    Window.size = (400, 750)
+    EventLoop.idle()
+    rng = np.random.default_rng(5)
+    tmp = tempfile.mkdtemp()
+
+    print(f"{'size':<10} {'method':<10} {'ms':>7} {'KB/frame':>9} {'shape':>14} {'diff':>5}")
+    for w, h in SIZES:
+        image = cv2.resize(make_frame(rng)[0], (w, h), interpolation=cv2.INTER_LINEAR)
+        texture = camera_texture(image)
+        path = os.path.join(tmp, 'frame.png')
+        methods = (
+            ('png', lambda: via_png(texture, path)),
+            ('pixels', lambda: via_pixels(texture)),
+            ('grab', lambda g=FrameGrabber(): g.grab(texture)),
+            ('grab gray', lambda g=FrameGrabber(gray=True): g.grab(texture)),
+            ('grab 320', lambda g=FrameGrabber(width=320, gray=True): g.grab(texture)),
+        )
+        for name, grab in methods:
+            ms, kb, frame = measure(grab, frames)
+            diff = difference(frame, image)
+            print(f"{f'{w}x{h}':<10} {name:<10} {ms:>7.2f} {kb:>9.0f} {str(frame.shape):>14} "
+                  f"{'-' if diff is None else diff:>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+قياس رسم البطاقات مع أطلس الصور وبدونه
+Benchmark: CardWidget redraw, card toggling and DoublingScreen opening (atlas vs direct)
+
+python benchmarks/bench_cards.py [frames]
+
+في نافذة Kivy حقيقية يقيس لكل طريقة:
+    draw us    زمن _draw لبطاقة واحدة (بعد أن يكون شكلها في الأطلس)
+    open ms    فتح شاشة التدبيل: on_enter وإطارات التخطيط حتى تستقر
+    toggle     زمن الإطار عند تبديل حالة كل البطاقات في كل إطار، في شاشة التدبيل
+               وفي شبكة من GRID_CARDS بطاقة صغيرة (مثل نتائج الكاميرا)
+    idle       زمن إطار بدون أي تغيير للمقارنة (الرسم البرمجي للنافذة كلها)
+    direct  رسم الأشكال مباشرة في كل تغيير (كما كان)
+    atlas   مستطيل واحد بجزء من صفحة الأطلس
+"""
+
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_LOG_MODE', 'PYTHON')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kivy.config import Config  # noqa: E402
+Config.set('graphics', 'maxfps', '0')   # بدون انتظار بين الإطارات
+
+from kivy.base import EventLoop  # noqa: E402
+from kivy.core.text import LabelBase  # noqa: E402
+from kivy.core.window import Window  # noqa: E402
+from kivy.metrics import dp  # noqa: E402
+from kivy.uix.gridlayout import GridLayout  # noqa: E402
+from kivy.uix.screenmanager import ScreenManager, Screen, NoTransition  # noqa: E402
+
+import modern_ui  # noqa: E402
+from card_atlas import card_atlas  # noqa: E402
+
+if modern_ui.ARABIC_FONT:
+    LabelBase.register(name=modern_ui.ARABIC_FONT, fn_regular=modern_ui.FONT_PATH)
+
+SETTLE_FRAMES = 3   # إطارات حتى يستقر تخطيط الشاشة بعد فتحها
+GRID_CARDS = 40
+
+
+class FakeApp:
+    def __init__(self):
+        self.current_round_data = {'tricks': 5, 'diamonds': 4, 'queens': ['spade', 'club'],
+                                   'has_king': True}
+
+
+def frame():
+    EventLoop.idle()
+
+
+def cards_of(widget):
+    return [w for w in widget.walk() if isinstance(w, modern_ui.CardWidget)]
+
+
+def draw_cost(cards, count=2000):
+    """زمن _draw لبطاقة بالميكروثانية"""
+    start = time.perf_counter()
+    for i in range(count):
+        cards[i % len(cards)]._draw()
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def open_doubling(sm):
+    """من شاشة فارغة إلى شاشة التدبيل مستقرة (ms)"""
+    sm.current = 'blank'
+    frame()
+    start = time.perf_counter()
+    sm.current = 'doubling'
+    for _ in range(SETTLE_FRAMES):
+        frame()
+    return (time.perf_counter() - start) * 1000
+
+
+def grid_screen():
+    screen = Screen(name='grid')
+    grid = GridLayout(cols=5, spacing=dp(5), padding=dp(10))
+    suits = ('spade', 'heart', 'diamond', 'club')
+    for i in range(GRID_CARDS):
+        card = modern_ui.CardWidget(suit=suits[i % 4], rank='Q')
+        card.size = (dp(45), dp(60))
+        grid.add_widget(card)
+    screen.add_widget(grid)
+    return screen
+
+
+def idle_frames(frames):
+    times = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        frame()
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def toggle_frames(cards, frames):
+    times = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        for card in cards:
+            card.state = 'normal' if card.state == 'down' else 'down'
+        frame()
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    Window.size = (400, 750)
+    frame()
+
+    sm = ScreenManager(transition=NoTransition())
+    sm.app = FakeApp()
+    sm.add_widget(Screen(name='blank'))
+    doubling = modern_ui.DoublingScreen()
+    sm.add_widget(doubling)
+    Window.add_widget(sm)
+    frame()
+    open_doubling(sm)   # تحميل الخطوط وبناء الشاشة قبل القياس
+
+    print(f"{'mode':<7} {'draw us':>8} {'open ms':>8} {'doubling p50':>13} "
+          f"{f'grid{GRID_CARDS} p50':>11} {'p95':>7} {'idle p50':>9}")
+    for mode, use_atlas in (('direct', False), ('atlas', True)):
+        modern_ui.CardWidget.use_atlas = use_atlas
+        card_atlas.clear()
+        opens = [open_doubling(sm) for _ in range(20)]
+        cards = cards_of(doubling)
+        draw = draw_cost(cards)
+        doubling_times = toggle_frames(cards, frames)
+
+        sm.add_widget(grid_screen())
+        sm.current = 'grid'
+        frame()
+        frame()
+        grid_times = toggle_frames(cards_of(sm.current_screen), frames)
+        idle = idle_frames(frames)
+        sm.remove_widget(sm.current_screen)
+
+        print(f"{mode:<7} {draw:>8.1f} {statistics.median(opens):>8.2f} "
+              f"{statistics.median(doubling_times):>13.2f} {statistics.median(grid_times):>11.2f} "
+              f"{statistics.quantiles(grid_times, n=20)[-1]:>7.2f} {statistics.median(idle):>9.2f}")
+    print(f"atlas: {card_atlas.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+قياس ذاكرة نتائج الكشف (البصمة الإدراكية)
+Benchmark: DetectionCache hit rate, latency saved and false hits on re-captures
+
+python benchmarks/bench_detection_cache.py [piles]
+
+لكل كومة بطاقات مركبة (bench_detector) عدة التقاطات بترتيب عشوائي:
+    first    أول صورة للكومة (إخفاق متوقع)
+    same     نفس اللقطة بضوضاء كاميرا وضغط JPEG جديدين (إصابة متوقعة)
+    shifted  الكاميرا تحركت بكسلين (صورة جديدة: إخفاق متوقع)
+    swapped  بطاقة استُبدلت بأخرى من نفس النوع في مكانها (يجب ألا تصيب)
+ويطبع لكل نوع نسبة الإصابة والزمن (الوسيط)، والرموز الخاطئة (ليست في الصورة)
+في نتائج الإصابات مقارنة بالتحليل الكامل لنفس الصور، وإحصاءات stats() للكاشف.
+ثم يعيد فتح ملف SQLite كتشغيل جديد ويعيد لقطات same من القرص.
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2  # noqa: E402
+import numpy as np  # noqa: E402
+
+from bench_detector import make_layout, render_frame  # noqa: E402
+from card_detector import CardDetector, RANKS  # noqa: E402
+from detection_cache import DetectionCache  # noqa: E402
+
+KINDS = ('first', 'same', 'shifted', 'swapped')
+
+
+def variants(layout, rng):
+    """[(النوع، الصورة، الرموز الصحيحة)] لكومة واحدة"""
+    table, cards = layout
+    shifted = (table, [(r, s, (x + 2, y + 1), a, h, j) for r, s, (x, y), a, h, j in cards])
+    rank, suit, center, angle, height, jitter = cards[0]
+    other = RANKS[(RANKS.index(rank) + 5) % len(RANKS)]
+    swapped = (table, [(other, suit, center, angle, height, jitter)] + cards[1:])
+    return [capture('same', layout, rng), capture('same', layout, rng),
+            capture('shifted', shifted, rng), capture('swapped', swapped, rng)]
+
+
+def capture(kind, layout, rng):
+    image, truth = render_frame(layout, rng)
+    return kind, image, {code for code, _ in truth}
+
+
+def false_codes(cards, truth):
+    return sum(card.card_code not in truth for card in cards)
+
+
+def timed(detector, image):
+    start = time.perf_counter()
+    cards = detector.detect_cards(image)
+    return cards, (time.perf_counter() - start) * 1000
+
+
+def main():
+    piles = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    cv2.setNumThreads(1)
+    rng = np.random.default_rng(23)
+    path = os.path.join(tempfile.mkdtemp(), 'detection_cache.sqlite')
+
+    plain = CardDetector()
+    cached = CardDetector(cache=DetectionCache(path=path))
+    cached._templates = plain.templates
+
+    # كل كومة تُصوَّر أولاً، وبقية لقطاتها تأتي مختلطة بلقطات الكوم الأخرى
+    captures, later = [], []
+    for _ in range(piles):
+        layout = make_layout(rng)
+        captures.append(capture('first', layout, rng))
+        later.extend(variants(layout, rng))
+    order = rng.permutation(len(later))
+    captures += [later[i] for i in order]
+
+    results = {kind: {'hits': 0, 'count': 0, 'ms': []} for kind in KINDS}
+    wrong, wrong_full = 0, 0
+    for kind, image, truth in captures:
+        hits = cached.cache.hits
+        cards, ms = timed(cached, image)
+        row = results[kind]
+        row['count'] += 1
+        row['ms'].append(ms)
+        if cached.cache.hits > hits:
+            row['hits'] += 1
+            wrong += false_codes(cards, truth)
+            wrong_full += false_codes(plain.detect_cards(image), truth)
+
+    print(f"captures {len(captures)}  piles {piles}")
+    print(f"{'kind':<8} {'count':>6} {'hit rate':>9} {'ms p50':>8}")
+    for kind in KINDS:
+        row = results[kind]
+        print(f"{kind:<8} {row['count']:>6} {row['hits'] / row['count']:>9.0%} "
+              f"{statistics.median(row['ms']):>8.2f}")
+    print(f"false codes in hits: {wrong} (full detection of the same frames: {wrong_full})")
+    stats = cached.stats()
+    print("stats: " + "  ".join(
+        f"{k} {v:.2f}" if isinstance(v, float) else f"{k} {v}" for k, v in stats.items()))
+    misses = stats['cache_misses']
+    print(f"lookup overhead per capture {stats['cache_lookup_ms'] / len(captures):.2f} ms, "
+          f"saved {stats['cache_saved_ms']:.0f} ms of {stats['cache_saved_ms'] + stats['detect_ms']:.0f} ms "
+          f"({misses} full detections)")
+
+    # تشغيل جديد: الذاكرة فارغة والقرص ممتلئ
+    cached.cache.close()
+    reopened = CardDetector(cache=DetectionCache(path=path))
+    reopened._templates = plain.templates
+    same = [image for kind, image, _ in later if kind == 'same']
+    times = [timed(reopened, image)[1] for image in same]
+    stats = reopened.cache.stats()
+    print(f"after restart: {stats['disk_hits']} disk hits + {stats['hits'] - stats['disk_hits']} memory "
+          f"of {len(same)} same-shot captures, ms p50 {statistics.median(times):.2f}")
+
+
+if __name__ == "__main__":
+    main()
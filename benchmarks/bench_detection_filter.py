@@ -0,0 +1,159 @@
+"""
+قياس تنقية نتائج الكشف (NMS ودمج الزوايا) بمئات المستطيلات في الصورة
+Benchmark: detection_filter (NumPy) vs a pure-Python loop vs counting every prediction
+
+python benchmarks/bench_detection_filter.py [frames]
+
+رد Roboflow مركب قبل التنقية لصورة 1280x720: بطاقات مختلفة من ورق واحد على
+الطاولة، ولكل بطاقة زاويتا مؤشر متقابلتان، ولكل زاوية عدة مستطيلات متداخلة
+بثقة مختلفة، وأحياناً مستطيل بصنف خاطئ في نفس المكان، ومستطيلات ضوضاء.
+لكل عدد بطاقات يطبع:
+    boxes     متوسط المستطيلات في الصورة
+    python    الوسيط لزمن نفس الخوارزمية بحلقات Python (card_tracker.iou)
+    numpy     الوسيط لزمن filter_detections، والتسريع
+    same      الصور التي أعطت فيها الطريقتان نفس النتيجة
+    cards     البطاقات المعدودة: processDetections (كل نتيجة ثقتها 0.5+) / بعد التنقية / الحقيقة
+    diamonds  الديناري بنفس الترتيب
+    tricks    تقدير الأكلات floor(العدد / 4) بنفس الترتيب
+"""
+
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from card_detector import MIN_CONFIDENCE, RANKS, SUITS  # noqa: E402
+from card_tracker import iou  # noqa: E402
+from detection_filter import MERGE_DISTANCE, NMS_IOU, filter_detections  # noqa: E402
+
+FRAME = (1280, 720)
+CARD = (80, 112)            # البطاقة في الصورة (عرض، ارتفاع)
+INDEX = (22, 40)            # مستطيل زاوية المؤشر
+DECK = [rank + suit for suit in SUITS for rank in RANKS]
+SCENES = (  # (البطاقات، مستطيلات لكل زاوية، مستطيلات الضوضاء)
+    (13, 4, 40),
+    (26, 5, 80),
+    (52, 6, 150),
+)
+
+
+def make_predictions(rng, cards, per_corner, noise):
+    """(المستطيلات، الثقة، الأصناف) كرد النموذج الخام، ورموز البطاقات الحقيقية"""
+    cols = int(np.ceil(np.sqrt(cards * FRAME[0] / FRAME[1])))
+    cell = (FRAME[0] / cols, FRAME[1] / int(np.ceil(cards / cols)))
+    codes = rng.choice(len(DECK), cards, replace=False)
+    boxes, scores, classes = [], [], []
+    for i, code in enumerate(codes):
+        cx = (i % cols + 0.5) * cell[0] + rng.uniform(-5, 5)
+        cy = (i // cols + 0.5) * cell[1] + rng.uniform(-5, 5)
+        for sign in (-1, 1):    # الزاويتان المتقابلتان
+            x = cx + sign * (CARD[0] - INDEX[0]) / 2
+            y = cy + sign * (CARD[1] - INDEX[1]) / 2
+            for _ in range(per_corner):
+                jx, jy = rng.normal(0, 2, 2)
+                boxes.append((x + jx - INDEX[0] / 2, y + jy - INDEX[1] / 2,
+                              x + jx + INDEX[0] / 2, y + jy + INDEX[1] / 2))
+                scores.append(rng.uniform(0.4, 0.95))
+                classes.append(code)
+            if rng.random() < 0.15:     # رتبة أو نوع مقروء خطأ
+                boxes.append(boxes[-1])
+                scores.append(rng.uniform(0.2, 0.55))
+                classes.append(int(rng.integers(len(DECK))))
+    for _ in range(noise):
+        x, y = rng.uniform(0, FRAME[0]), rng.uniform(0, FRAME[1])
+        boxes.append((x, y, x + INDEX[0], y + INDEX[1]))
+        scores.append(rng.uniform(0.05, 0.5))
+        classes.append(int(rng.integers(len(DECK))))
+    return (np.array(boxes, np.float32), np.array(scores, np.float32),
+            np.array(classes, np.intp)), [DECK[c] for c in codes]
+
+
+def filter_python(boxes, scores, classes):
+    """نفس المراحل بحلقات Python على قوائم"""
+    preds = [(tuple(b), s, c) for b, s, c in zip(boxes.tolist(), scores.tolist(), classes.tolist())
+             if s >= MIN_CONFIDENCE]
+    preds.sort(key=lambda p: -p[1])
+    kept = []
+    for box, score, cls in preds:
+        if all(c != cls or iou(b, box) <= NMS_IOU for b, _, c in kept):
+            kept.append((box, score, cls))
+
+    def near(a, b):
+        (ba, _, ca), (bb, _, cb) = a, b
+        side = max(ba[2] - ba[0], ba[3] - ba[1], bb[2] - bb[0], bb[3] - bb[1])
+        dx = (ba[0] + ba[2] - bb[0] - bb[2]) / 2
+        dy = (ba[1] + ba[3] - bb[1] - bb[3]) / 2
+        return ca == cb and (dx * dx + dy * dy) ** 0.5 <= MERGE_DISTANCE * side
+
+    seen, merged = set(), []
+    for start in range(len(kept)):
+        if start in seen:
+            continue
+        group, stack = [], [start]
+        seen.add(start)
+        while stack:
+            i = stack.pop()
+            group.append(kept[i])
+            for j in range(len(kept)):
+                if j not in seen and near(kept[i], kept[j]):
+                    seen.add(j)
+                    stack.append(j)
+        box = (min(g[0][0] for g in group), min(g[0][1] for g in group),
+               max(g[0][2] for g in group), max(g[0][3] for g in group))
+        merged.append((box, max(g[1] for g in group), group[0][2]))
+    return merged
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def summary(codes):
+    """(البطاقات، الديناري، الأكلات) كما يحسبها processDetections"""
+    return len(codes), sum(code.endswith('D') for code in codes), len(codes) // 4
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    rng = np.random.default_rng(25)
+
+    print(f"frames {frames}  min_confidence {MIN_CONFIDENCE}  iou {NMS_IOU}  merge {MERGE_DISTANCE}")
+    print(f"{'cards':>5} {'boxes':>6} {'python':>8} {'numpy':>7} {'x':>5} {'same':>6}  "
+          f"{'cards':<12} {'diamonds':<11} {'tricks'}")
+    for cards, per_corner, noise in SCENES:
+        counts, py_ms, np_ms, same = [], [], [], 0
+        raw, filtered, truth = [], [], []
+        for _ in range(frames):
+            (boxes, scores, classes), codes = make_predictions(rng, cards, per_corner, noise)
+            counts.append(len(boxes))
+            slow, ms = timed(filter_python, boxes, scores, classes)
+            py_ms.append(ms)
+            fast, ms = timed(filter_detections, boxes, scores, classes)
+            np_ms.append(ms)
+
+            key_slow = sorted((c, tuple(round(v) for v in b)) for b, _, c in slow)
+            key_fast = sorted((int(c), tuple(round(v) for v in b)) for b, c in zip(fast[0].tolist(), fast[2]))
+            same += key_slow == key_fast
+            raw.append(summary([DECK[c] for c, s in zip(classes, scores) if s >= MIN_CONFIDENCE]))
+            filtered.append(summary([DECK[c] for c in fast[2]]))
+            truth.append(summary(codes))
+
+        def mean(rows, k):
+            return f"{statistics.mean(r[k] for r in rows):.1f}"
+
+        def columns(k):
+            return f"{mean(raw, k)}/{mean(filtered, k)}/{mean(truth, k)}"
+
+        py, fast_ms = statistics.median(py_ms), statistics.median(np_ms)
+        print(f"{cards:>5} {statistics.mean(counts):>6.0f} {py:>8.2f} {fast_ms:>7.2f} "
+              f"{py / fast_ms:>5.1f} {same:>3}/{frames:<3}  {columns(0):<12} {columns(1):<11} {columns(2)}")
+
+
+if __name__ == "__main__":
+    main()
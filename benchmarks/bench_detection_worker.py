@@ -0,0 +1,98 @@
+"""
+قياس توقف خيط الواجهة أثناء تحليل صور الكاميرا
+Benchmark: main-thread frame times while detecting cards inline vs in DetectionWorker
+
+python benchmarks/bench_detection_worker.py [seconds]
+
+حلقة Kivy بـ 60 إطاراً في الثانية، وفي كل CAPTURE_EVERY ثانية صورة جديدة
+(صور مركبة من bench_detector) تُحلَّل بطريقتين:
+    inline   detect_cards داخل الإطار (كما لو كان في _capture مباشرة)
+    worker   submit إلى DetectionWorker والنتيجة عبر Clock
+ويطبع زمن الإطار (الوسيط و p95 والأقصى)، والإطارات الأطول من إطارين،
+وعدد النتائج التي وصلت والطلبات الملغاة وزمن الوصول من الالتقاط للنتيجة.
+"""
+
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_LOG_MODE', 'PYTHON')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kivy.config import Config  # noqa: E402
+Config.set('graphics', 'maxfps', '0')   # الحلقة تنتظر بنفسها حتى 60 إطاراً
+
+import numpy as np  # noqa: E402
+from kivy.base import EventLoop  # noqa: E402
+from kivy.core.window import Window  # noqa: E402
+
+from bench_detector import make_frame  # noqa: E402
+from card_detector import CardDetector  # noqa: E402
+from detection_worker import DetectionWorker  # noqa: E402
+
+FRAME_TIME = 1 / 60
+CAPTURE_EVERY = 0.1     # أسرع من التحليل على الهاتف: بعض الطلبات تُلغى
+FRAMES = 20             # صور مختلفة تتكرر
+
+
+def run(seconds, images, analyse):
+    """(أزمنة الإطارات ms، أزمنة الوصول ms)"""
+    times, latencies = [], []
+    end = time.perf_counter() + seconds
+    next_capture = 0.0
+    i = 0
+    while time.perf_counter() < end:
+        start = time.perf_counter()
+        if start >= next_capture:
+            analyse(images[i % len(images)], start, latencies)
+            next_capture = start + CAPTURE_EVERY
+            i += 1
+        EventLoop.idle()
+        elapsed = time.perf_counter() - start
+        times.append(elapsed * 1000)
+        time.sleep(max(0.0, FRAME_TIME - elapsed))
+    return times, latencies
+
+
+def report(mode, times, latencies, extra=''):
+    p95 = statistics.quantiles(times, n=20)[-1]
+    long_frames = sum(t > 2 * FRAME_TIME * 1000 for t in times)
+    latency = f"{statistics.median(latencies):.0f}" if latencies else '-'
+    print(f"{mode:<7} {statistics.median(times):>7.2f} {p95:>7.2f} {max(times):>7.1f} "
+          f"{long_frames:>6} {len(latencies):>9} {latency:>11} {extra}")
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    rng = np.random.default_rng(3)
+    images = [make_frame(rng)[0] for _ in range(FRAMES)]
+    detector = CardDetector()
+    detector.templates
+    Window.size = (400, 750)
+    EventLoop.idle()
+
+    print(f"{'mode':<7} {'p50 ms':>7} {'p95 ms':>7} {'max ms':>7} {'>2 fr':>6} "
+          f"{'delivered':>9} {'latency ms':>11}")
+
+    def inline(image, captured, latencies):
+        detector.detect_cards(image)
+        latencies.append((time.perf_counter() - captured) * 1000)
+
+    times, latencies = run(seconds, images, inline)
+    report('inline', times, latencies)
+
+    worker = DetectionWorker(detector)
+
+    def submit(image, captured, latencies):
+        worker.submit(image, lambda cards: latencies.append((time.perf_counter() - captured) * 1000))
+
+    times, latencies = run(seconds, images, submit)
+    report('worker', times, latencies, f"cancelled {worker.cancelled}")
+    worker.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+فحص تسرب الذاكرة في شاشة التدبيل عبر مئات الجولات
+Leak check: DoublingScreen widgets and bound callbacks over many rounds
+
+python benchmarks/bench_doubling.py [rounds]
+
+يدخل شاشة التدبيل rounds مرة بجولات مختلفة (ملكات وشايب عشوائية) ويختار
+بعض البطاقات في كل جولة، ثم يطبع كل 100 جولة:
+    widgets    عدد عناصر Kivy الحية في الذاكرة (gc)
+    callbacks  عدد الدوال المربوطة بخاصية state في بطاقات الشاشة
+    enter ms   الوسيط لزمن on_enter (بدون رسم الإطار)
+ويفشل (exit 1) إذا زاد أي من العددين بعد الجولة الأولى.
+"""
+
+import gc
+import os
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_LOG_MODE', 'PYTHON')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kivy.config import Config  # noqa: E402
+Config.set('graphics', 'maxfps', '0')   # بدون انتظار بين الإطارات
+
+from kivy.base import EventLoop  # noqa: E402
+from kivy.core.text import LabelBase  # noqa: E402
+from kivy.core.window import Window  # noqa: E402
+from kivy.uix.screenmanager import ScreenManager, NoTransition  # noqa: E402
+from kivy.uix.widget import Widget  # noqa: E402
+
+import modern_ui  # noqa: E402
+
+if modern_ui.ARABIC_FONT:
+    LabelBase.register(name=modern_ui.ARABIC_FONT, fn_regular=modern_ui.FONT_PATH)
+
+REPORT_EVERY = 100
+
+
+class FakeApp:
+    current_round_data = {}
+
+
+def frame():
+    EventLoop.idle()
+
+
+def live_widgets():
+    gc.collect()
+    return sum(isinstance(o, Widget) for o in gc.get_objects())
+
+
+def state_callbacks(screen):
+    """الدوال المربوطة بحالة كل بطاقات المجموعة (الظاهرة والمخفية)"""
+    cards = list(screen.opponent_cards.values()) + list(screen.my_cards.values())
+    return sum(len(card._card.get_property_observers('state')) for card in cards)
+
+
+def play_round(sm, screen, rng):
+    queens = rng.sample(modern_ui.DOUBLING_SUITS, rng.randint(0, 4))
+    sm.app.current_round_data = {'tricks': 5, 'diamonds': 4, 'queens': queens,
+                                 'has_king': rng.random() < 0.5}
+    start = time.perf_counter()
+    screen.on_enter()
+    elapsed = (time.perf_counter() - start) * 1000
+    frame()
+
+    # اختيار بعض البطاقات كما يفعل اللاعب
+    for key, card in list(screen.opponent_cards.items()) + list(screen.my_cards.items()):
+        if card.parent is not None and rng.random() < 0.3:
+            card.state = 'down'
+    expected = {k for k, c in screen.opponent_cards.items() if c.parent and c.state == 'down'}
+    assert {k for k, v in screen.opponent_doubled.items() if v} == expected
+    return elapsed
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    rng = random.Random(7)
+    Window.size = (400, 750)
+    frame()
+
+    sm = ScreenManager(transition=NoTransition())
+    sm.app = FakeApp()
+    screen = modern_ui.DoublingScreen()
+    Window.add_widget(sm)
+    frame()  # الشاشة تبني نفسها في الإطار التالي
+
+    sm.app.current_round_data = {'queens': [], 'has_king': False}
+    sm.add_widget(screen)
+    frame()
+    play_round(sm, screen, rng)
+
+    # بعد الجولة الأولى: كل العناصر موجودة في الذاكرة
+    base_widgets, base_callbacks = live_widgets(), state_callbacks(screen)
+    print(f"{'round':>6} {'widgets':>8} {'callbacks':>10} {'enter ms':>9}")
+    print(f"{1:>6} {base_widgets:>8} {base_callbacks:>10} {'':>9}")
+
+    times = []
+    widgets = callbacks = 0
+    for r in range(2, rounds + 1):
+        times.append(play_round(sm, screen, rng))
+        if r % REPORT_EVERY == 0 or r == rounds:
+            widgets, callbacks = live_widgets(), state_callbacks(screen)
+            print(f"{r:>6} {widgets:>8} {callbacks:>10} {statistics.median(times):>9.2f}")
+            times = []
+
+    if widgets > base_widgets or callbacks > base_callbacks:
+        print("FAIL: widgets or callbacks grew across rounds")
+        sys.exit(1)
+    print("OK: flat")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+قياس تكلفة البث المباشر مع 10 آلاف مشترك
+Benchmark: CPU per broadcast for the live feed, coalesced vs one frame per round
+
+python benchmarks/bench_feed.py [subscribers] [burst]
+
+المشتركون محاكون بناقل في الذاكرة (بدون مقابس) حتى يُقاس عمل الخادم فقط:
+ترميز الإطارات وكتابتها لكل مشترك.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cc_core.feed import LiveFeed, sse_frame  # noqa: E402
+from cc_core.scoring import ScoreCalculator  # noqa: E402
+
+TABLES = 50
+
+
+class SinkTransport:
+    """ناقل يعدّ البايتات فقط"""
+
+    def __init__(self):
+        self.bytes = 0
+        self.frames = 0
+
+    def write(self, data):
+        self.bytes += len(data)
+        self.frames += 1
+
+    def is_closing(self):
+        return False
+
+    def get_write_buffer_size(self):
+        return 0
+
+
+class SinkWriter:
+    def __init__(self):
+        self.transport = SinkTransport()
+
+    def close(self):
+        pass
+
+
+def burst_results(burst):
+    """نتائج جولات موزعة على الطاولات بنفس شكل finalize_round"""
+    calcs = [ScoreCalculator() for _ in range(TABLES)]
+    results = []
+    for i in range(burst):
+        calc = calcs[i % TABLES]
+        calc.start_new_round()
+        results.append((f"t{i % TABLES}", calc.finalize_round(-200 - i % 90)))
+    return results
+
+
+def naive(subscribers, results):
+    """بدون تجميع: إطار لكل جولة لكل مشترك (الإطار يُرمَّز مرة واحدة)"""
+    for table_id, result in results:
+        frame = sse_frame('round', {'table': table_id, **result})
+        for writer in subscribers:
+            writer.transport.write(frame)
+
+
+def coalesced(feed, results):
+    for table_id, result in results:
+        feed.publish(table_id, result)
+    feed.flush()
+
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    burst = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    results = burst_results(burst)
+
+    print(f"{count:,} subscribers, burst of {burst} rounds over {TABLES} tables")
+    print(f"{'mode':<12} {'CPU ms':>9} {'us/subscriber':>14} {'frames/sub':>11} {'KB/sub':>8}")
+
+    for mode in ('naive', 'coalesced'):
+        writers = [SinkWriter() for _ in range(count)]
+        feed = LiveFeed(tick=3600)
+        for writer in writers:
+            feed.subscribe(writer)
+
+        start = time.process_time()
+        if mode == 'naive':
+            naive(writers, results)
+        else:
+            coalesced(feed, results)
+        cpu = time.process_time() - start
+
+        sample = writers[0].transport
+        print(f"{mode:<12} {cpu * 1000:>9.1f} {cpu / count * 1e6:>14.2f} "
+              f"{sample.frames:>11} {sample.bytes / 1024:>8.1f}")
+
+    # حالة هادئة: جولة واحدة لمشتركي كل الطاولات
+    feed = LiveFeed(tick=3600)
+    for _ in range(count):
+        feed.subscribe(SinkWriter())
+    start = time.process_time()
+    coalesced(feed, results[:1])
+    cpu = time.process_time() - start
+    print(f"{'single':<12} {cpu * 1000:>9.1f} {cpu / count * 1e6:>14.2f} {1:>11}")
+
+    # إطار المشترك يبقى JSON صالحاً
+    frame = sse_frame('delta', {'tables': {'t0': LiveFeed.delta([results[0][1]])}})
+    json.loads(frame.split(b'data: ', 1)[1])
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
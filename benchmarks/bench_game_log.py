@@ -0,0 +1,64 @@
+"""
+قياس زمن الإضافة والاستئناف في سجل الأحداث
+Benchmark: GameLog append cost and resume time vs game length and archive size
+
+python benchmarks/bench_game_log.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cc_core.game_log import GameLog  # noqa: E402
+
+GAME_LENGTHS = [10, 100, 500]
+ARCHIVE_SIZES = [10, 1000, 3000]
+
+
+def play(log, rounds):
+    log.start_game("فريقنا", "الخصم")
+    for n in range(1, rounds + 1):
+        team1 = -200 - n % 150
+        log.round_finalized({'round': n, 'team1': team1, 'team2': -500 - team1})
+
+
+def time_resume(root, repeat=20):
+    best = float('inf')
+    for _ in range(repeat):
+        log = GameLog(root, fsync=False)
+        start = time.perf_counter()
+        log.resume()
+        best = min(best, time.perf_counter() - start)
+        log.close()
+    return best
+
+
+def main():
+    print(f"{'archive games':>14} {'rounds':>8} {'append us':>10} {'resume ms':>10}")
+    for games in ARCHIVE_SIZES:
+        with tempfile.TemporaryDirectory() as root:
+            log = GameLog(root, fsync=False)
+            for _ in range(games - 1):
+                play(log, 20)
+            for rounds in GAME_LENGTHS:
+                start = time.perf_counter()
+                play(log, rounds)
+                append = (time.perf_counter() - start) / (rounds + 1)
+                log.close()
+                print(f"{games:>14,} {rounds:>8} {append * 1e6:>10.1f} "
+                      f"{time_resume(root) * 1e3:>10.3f}")
+
+    # الإضافة مع fsync (الإعداد الافتراضي في التطبيق)
+    with tempfile.TemporaryDirectory() as root:
+        log = GameLog(root)
+        start = time.perf_counter()
+        play(log, 100)
+        log.close()
+        print(f"append with fsync: {(time.perf_counter() - start) / 101 * 1e6:.1f} us/event")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+قياس زمن on_enter لشاشة اللعبة
+Benchmark: GameScreen.on_enter cost, diff-based refresh vs clear-and-rebuild
+
+python benchmarks/bench_game_screen.py [visits]
+
+يدخل شاشة اللعبة visits مرة في حالتين:
+    revisit    لا شيء تغير (رجوع من السجل أو الإعدادات)
+    new round  جولة جديدة سُجلت قبل الدخول
+ويطبع لكل طريقة الوسيط لزمن on_enter وحده وللانتقال كله مع رسم الإطار،
+وعدد العناصر المنشأة وعدد النصوص العربية المشكّلة لكل دخول.
+    rebuild  الطريقة السابقة: حذف المحتوى وإنشاء صندوق آخر جولة من جديد
+    diff     تحديث النصوص التي تغيرت فقط
+"""
+
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_LOG_MODE', 'PYTHON')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kivy.config import Config  # noqa: E402
+Config.set('graphics', 'maxfps', '0')   # بدون انتظار بين الإطارات
+
+from kivy.base import EventLoop  # noqa: E402
+from kivy.core.text import LabelBase  # noqa: E402
+from kivy.core.window import Window  # noqa: E402
+from kivy.graphics import Color, RoundedRectangle  # noqa: E402
+from kivy.metrics import dp  # noqa: E402
+from kivy.uix.boxlayout import BoxLayout  # noqa: E402
+from kivy.uix.screenmanager import ScreenManager, Screen, NoTransition  # noqa: E402
+from kivy.uix.widget import Widget  # noqa: E402
+
+import modern_ui  # noqa: E402
+from arabic_text import shaping_cache  # noqa: E402
+from modern_ui import COLORS, ArabicLabel  # noqa: E402
+
+if modern_ui.ARABIC_FONT:
+    LabelBase.register(name=modern_ui.ARABIC_FONT, fn_regular=modern_ui.FONT_PATH)
+
+
+class RebuildGameScreen(modern_ui.GameScreen):
+    """_refresh السابق للمقارنة"""
+
+    def _refresh(self):
+        app = self.manager.app
+
+        self.team1_box.set_name(app.team1_name)
+        self.team1_box.set_score(app.team1_total)
+        self.team2_box.set_name(app.team2_name)
+        self.team2_box.set_score(app.team2_total)
+
+        self.round_lbl.set_text(f"الجولة: {app.round_number}")
+
+        self.content.clear_widgets()
+
+        if app.history:
+            last = app.history[-1]
+
+            box = BoxLayout(orientation='vertical', size_hint_y=None, height=dp(100), padding=dp(10))
+            with box.canvas.before:
+                Color(*COLORS['card'])
+                RoundedRectangle(pos=box.pos, size=box.size, radius=[dp(10)])
+
+            box.add_widget(ArabicLabel(
+                text=f"نتيجة الجولة {last['round']}",
+                font_size=dp(14),
+                color=COLORS['text_secondary']
+            ))
+
+            row = BoxLayout()
+            t1_color = COLORS['success'] if last['team1'] > last['team2'] else COLORS['text']
+            row.add_widget(ArabicLabel(text=f"{app.team1_name}: {last['team1']}", color=t1_color))
+            t2_color = COLORS['success'] if last['team2'] > last['team1'] else COLORS['text']
+            row.add_widget(ArabicLabel(text=f"{app.team2_name}: {last['team2']}", color=t2_color))
+            box.add_widget(row)
+
+            self.content.add_widget(box)
+        else:
+            self.content.add_widget(ArabicLabel(
+                text="اضغط لبدء جولة جديدة",
+                color=COLORS['text_secondary'],
+                size_hint_y=None,
+                height=dp(80)
+            ))
+
+
+class FakeApp:
+    def __init__(self):
+        self.team1_name, self.team2_name = "فريقنا", "الخصم"
+        self.round_number = 0
+        self.history = []
+        self.team1_total = self.team2_total = 0
+
+    def record_round(self):
+        self.round_number += 1
+        team1 = -200 - self.round_number % 90
+        self.history.append({'round': self.round_number, 'team1': team1, 'team2': -500 - team1})
+        self.team1_total += team1
+        self.team2_total += -500 - team1
+
+
+def frame():
+    EventLoop.idle()
+
+
+created = 0
+_widget_init = Widget.__init__
+
+
+def counting_init(self, **kwargs):
+    global created
+    created += 1
+    _widget_init(self, **kwargs)
+
+
+Widget.__init__ = counting_init
+
+
+def visit(sm, screen, new_round, visits):
+    """(on_enter ms، الانتقال مع الإطار ms، عناصر منشأة، نصوص مشكّلة) لكل دخول"""
+    global created
+    enters, totals = [], []
+    on_enter = screen.on_enter
+
+    def timed_on_enter():
+        start = time.perf_counter()
+        on_enter()
+        enters.append((time.perf_counter() - start) * 1000)
+
+    screen.on_enter = timed_on_enter
+    created = 0
+    shaped = shaping_cache.hits + shaping_cache.misses
+    for _ in range(visits):
+        sm.current = 'blank'
+        frame()
+        if new_round:
+            sm.app.record_round()
+        start = time.perf_counter()
+        sm.current = 'game'
+        frame()
+        totals.append((time.perf_counter() - start) * 1000)
+    shaped = shaping_cache.hits + shaping_cache.misses - shaped
+    screen.on_enter = on_enter
+    return statistics.median(enters), statistics.median(totals), created / visits, shaped / visits
+
+
+def main():
+    visits = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    Window.size = (400, 750)
+    frame()
+
+    print(f"{'mode':<8} {'case':<10} {'on_enter ms':>12} {'switch ms':>10} {'widgets':>8} {'shaped':>7}")
+    for mode, cls in (('rebuild', RebuildGameScreen), ('diff', modern_ui.GameScreen)):
+        sm = ScreenManager(transition=NoTransition())
+        sm.app = FakeApp()
+        sm.add_widget(Screen(name='blank'))
+        screen = cls()
+        sm.add_widget(screen)
+        Window.add_widget(sm)
+        frame()  # الشاشة تبني نفسها في الإطار التالي
+        sm.app.record_round()
+        sm.current = 'game'
+        frame()
+
+        for case, new_round in (('revisit', False), ('new round', True)):
+            enter, total, widgets, shaped = visit(sm, screen, new_round, visits)
+            print(f"{mode:<8} {case:<10} {enter:>12.3f} {total:>10.2f} {widgets:>8.1f} {shaped:>7.1f}")
+        Window.remove_widget(sm)
+
+
+if __name__ == "__main__":
+    main()
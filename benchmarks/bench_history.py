@@ -0,0 +1,144 @@
+"""
+قياس شاشة السجل مع آلاف الجولات
+Benchmark: HistoryScreen enter / re-enter / scroll frame time (RecycleView)
+
+python benchmarks/bench_history.py [rounds] [old_rounds]
+
+يبني HistoryScreen في نافذة Kivy حقيقية ويقيس:
+    - أول دخول (كل الصفوف) ودخول بعد إضافة جولة (الجديدة فقط)
+    - عدد صفوف HistoryRow الموجودة فعلاً
+    - زمن الإطار أثناء تمرير سريع من الأعلى
+وللمقارنة الطريقة السابقة (BoxLayout فيه كل الصفوف) بعدد أقل من الجولات.
+الأرقام هنا على معالج الحاسوب مع رسم برمجي؛ الهاتف أبطأ في الإنشاء لكن
+العمل لكل إطار في القائمة المعاد استخدامها لا يزيد بزيادة الجولات.
+"""
+
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_LOG_MODE', 'PYTHON')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kivy.config import Config  # noqa: E402
+Config.set('graphics', 'maxfps', '0')   # بدون انتظار بين الإطارات
+
+from kivy.base import EventLoop  # noqa: E402
+from kivy.core.text import LabelBase  # noqa: E402
+from kivy.core.window import Window  # noqa: E402
+from kivy.metrics import dp  # noqa: E402
+from kivy.uix.boxlayout import BoxLayout  # noqa: E402
+from kivy.uix.label import Label  # noqa: E402
+from kivy.uix.screenmanager import ScreenManager, NoTransition  # noqa: E402
+from kivy.uix.scrollview import ScrollView  # noqa: E402
+
+import modern_ui  # noqa: E402
+from cc_core.totals import RoundTotals  # noqa: E402
+
+if modern_ui.ARABIC_FONT:
+    LabelBase.register(name=modern_ui.ARABIC_FONT, fn_regular=modern_ui.FONT_PATH)
+
+SCROLL_FRAMES = 120
+SCROLL_STEP = dp(25)         # بكسل لكل إطار (~1500 بكسل/ثانية عند 60 إطاراً)
+
+
+class FakeApp:
+    def __init__(self, rounds):
+        self.team1_name, self.team2_name = "فريقنا", "الخصم"
+        self.history = [{'round': r, 'team1': -205 - r % 90, 'team2': -295 + r % 90}
+                        for r in range(1, rounds + 1)]
+        self.totals = RoundTotals.from_history(self.history)
+        self.team1_total, self.team2_total = self.totals.team1_total, self.totals.team2_total
+
+    def record_round(self, entry):
+        self.totals.add(entry['round'], entry['team1'], entry['team2'])
+        self.history.append(entry)
+        self.team1_total, self.team2_total = self.totals.team1_total, self.totals.team2_total
+
+
+def frame():
+    EventLoop.idle()
+
+
+def ms(fn):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def scroll_frames(scroll):
+    """زمن كل إطار أثناء تمرير ثابت السرعة (SCROLL_STEP لكل إطار) من الأعلى"""
+    _, step = scroll.convert_distance_to_scroll(0, SCROLL_STEP)
+    times = []
+    for i in range(SCROLL_FRAMES + 1):
+        start = time.perf_counter()
+        scroll.scroll_y = max(0, 1 - i * step)
+        frame()
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def old_enter(table, app):
+    """on_enter السابق: صف BoxLayout بثلاث Labels لكل جولة"""
+    table.clear_widgets()
+    for entry in app.history:
+        row = modern_ui.BoxLayout(size_hint_y=None, height=dp(40))
+        row.add_widget(Label(text=str(entry['round']), size_hint_x=0.15))
+        row.add_widget(Label(text=str(entry['team1']), size_hint_x=0.425, font_size=dp(16)))
+        row.add_widget(Label(text=str(entry['team2']), size_hint_x=0.425, font_size=dp(16)))
+        table.add_widget(row)
+
+
+def report(label, enter_ms, reenter_ms, rows, times):
+    print(f"{label:<22} {enter_ms:>9.1f} {reenter_ms:>10.1f} {rows:>7} "
+          f"{statistics.median(times):>8.2f} {statistics.quantiles(times, n=20)[-1]:>8.2f}")
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    old_rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000
+    Window.size = (400, 750)
+    frame()
+
+    print(f"{'list':<22} {'enter ms':>9} {'re-enter':>10} {'rows':>7} {'frame p50':>8} {'p95':>8}")
+
+    # الطريقة الجديدة
+    app = FakeApp(rounds)
+    sm = ScreenManager(transition=NoTransition())
+    sm.app = app
+    screen = modern_ui.HistoryScreen()
+    Window.add_widget(sm)
+    frame()  # الشاشة تبني نفسها في الإطار التالي
+
+    enter = ms(lambda: (sm.add_widget(screen), frame()))
+    assert len(screen.table.data) == rounds
+    app.record_round({'round': rounds + 1, 'team1': -205, 'team2': -295})
+    reenter = ms(lambda: (screen.on_enter(), frame()))
+    assert len(screen.table.data) == rounds + 1
+    assert screen.prefix[rounds] == (app.team1_total, app.team2_total)
+    times = scroll_frames(screen.table)
+    rows = len(screen.table.layout.children)
+    report(f"RecycleView {rounds:,}", enter, reenter, rows, times)
+    Window.remove_widget(sm)
+
+    # الطريقة السابقة
+    app = FakeApp(old_rounds)
+    scroll = ScrollView(size_hint=(1, 1))
+    table = BoxLayout(orientation='vertical', spacing=dp(3), size_hint_y=None)
+    table.bind(minimum_height=table.setter('height'))
+    scroll.add_widget(table)
+    Window.add_widget(scroll)
+    frame()
+    enter = ms(lambda: (old_enter(table, app), frame()))
+    app.record_round({'round': old_rounds + 1, 'team1': -205, 'team2': -295})
+    reenter = ms(lambda: (old_enter(table, app), frame()))
+    times = scroll_frames(scroll)
+    report(f"BoxLayout {old_rounds:,}", enter, reenter, len(table.children), times)
+    Window.remove_widget(scroll)
+
+
+if __name__ == "__main__":
+    main()
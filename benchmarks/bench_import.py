@@ -0,0 +1,92 @@
+"""
+قياس زمن استيراد النواة والذاكرة التي تضيفها
+Benchmark: import time and RSS of the headless core vs the full UI stack
+
+python benchmarks/bench_import.py            # يفشل إذا تجاوزت النواة الحدود
+python benchmarks/bench_import.py --no-check # قياس فقط
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# حدود النواة فوق مفسر Python الفارغ
+MAX_IMPORT_MS = 50
+MAX_RSS_MB = 5
+
+# وحدات لا يجوز أن تسحبها النواة
+FORBIDDEN = ('kivy', 'arabic_reshaper', 'bidi', 'numpy', 'cv2', 'modern_ui')
+
+PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+{imports}
+elapsed = time.perf_counter() - start
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if sys.platform == 'darwin':
+    rss //= 1024
+print(json.dumps({{'ms': elapsed * 1000, 'rss_kb': rss, 'modules': sorted(sys.modules)}}))
+"""
+
+CASES = [
+    ("python (empty)", "pass"),
+    ("cc_core", "import cc_core"),
+    ("cc_core + score", "import cc_core; cc_core.ScoreCalculator().calculate_round_score()"),
+    ("modern_ui (kivy)", "import modern_ui"),
+]
+
+
+def probe(imports, repeat=5):
+    """أفضل نتيجة من عدة عمليات Python مستقلة"""
+    env = dict(os.environ, KIVY_NO_ARGS='1', KIVY_NO_CONSOLELOG='1')
+    best = None
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, '-c', PROBE.format(imports=imports)],
+            cwd=ROOT, env=env, capture_output=True, text=True
+        )
+        if out.returncode != 0:
+            return None
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        if best is None or result['ms'] < best['ms']:
+            best = result
+    return best
+
+
+def main():
+    check = '--no-check' not in sys.argv
+    results = {name: probe(imports) for name, imports in CASES}
+    base = results["python (empty)"]
+
+    print(f"{'case':<20} {'import ms':>10} {'RSS MB':>8} {'+RSS MB':>8}")
+    for name, result in results.items():
+        if result is None:
+            print(f"{name:<20} {'n/a':>10}")
+            continue
+        rss = result['rss_kb'] / 1024
+        print(f"{name:<20} {result['ms']:>10.1f} {rss:>8.1f} {rss - base['rss_kb'] / 1024:>8.1f}")
+
+    if not check:
+        return
+
+    core = results["cc_core"]
+    errors = []
+    pulled = [m for m in core['modules'] if m.split('.')[0] in FORBIDDEN]
+    if pulled:
+        errors.append(f"cc_core imports GUI/optional modules: {', '.join(pulled)}")
+    if core['ms'] > MAX_IMPORT_MS:
+        errors.append(f"cc_core import {core['ms']:.1f} ms > {MAX_IMPORT_MS} ms")
+    extra_mb = (core['rss_kb'] - base['rss_kb']) / 1024
+    if extra_mb > MAX_RSS_MB:
+        errors.append(f"cc_core adds {extra_mb:.1f} MB RSS > {MAX_RSS_MB} MB")
+
+    for error in errors:
+        print(f"FAIL: {error}")
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main()
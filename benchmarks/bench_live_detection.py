@@ -0,0 +1,150 @@
+"""
+قياس الوضع المباشر للكاميرا: التتبع بين التصنيفات الكاملة
+Benchmark: live detection (CardTracker) vs full detection on every frame
+
+python benchmarks/bench_live_detection.py [frames]
+
+فيديو مركب 640x480: أربع بطاقات تنزلق وتدور ذهاباً وإياباً مع اهتزاز اليد، وفي
+منتصفه تُستبدل بطاقة بأخرى في مكانها. كل إطار يمر بنفس منطق CameraScreen._live_tick
+(تصنيف كامل عند needs_detection، وإلا أماكن البطاقات فقط على صورة رمادية
+بعرض LOCATE_WIDTH) ويطبع لكل طريقة:
+    full ms    الوسيط لزمن التصنيف الكامل
+    locate ms  الوسيط لزمن تحديد الأماكن
+    cpu        نسبة وقت المعالج عند LIVE_FPS إطاراً في الثانية
+    stable     الإطار الذي ثبتت فيه كل البطاقات (بعد البداية وبعد التبديل)
+    wrong      بطاقات ثابتة برمز خاطئ في آخر إطار
+    flips      مرات تغير قائمة البنات/الشيخ المعروضة
+    every      التصنيف الكامل لكل إطار وإظهار نتيجته مباشرة (بدون تتبع)
+القياس على معالج الحاسوب بخيط واحد؛ الهاتف أبطأ بـ 3-5 مرات تقريباً.
+"""
+
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_LOG_MODE', 'PYTHON')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2  # noqa: E402
+import numpy as np  # noqa: E402
+
+from bench_detector import render_card, FRAME_SIZE, CARD_PIXELS  # noqa: E402
+from card_detector import CardDetector  # noqa: E402
+from card_tracker import CardTracker  # noqa: E402
+from modern_ui import LIVE_FPS, LOCATE_WIDTH, detected_summary  # noqa: E402
+
+SCENE = [   # (الرمز، المركز، مدى الانزلاق بالبكسل، الزاوية)
+    ('QH', (110, 130), (20, 10), 0.3),
+    ('KH', (320, 120), (-10, 15), -0.5),
+    ('QS', (530, 140), (-15, 10), 1.2),
+    ('7D', (300, 350), (20, -10), 2.0),
+]
+SWAP = ('7D', 'QC')     # في منتصف الفيديو
+PERIOD = 90             # إطارات لدورة انزلاق كاملة
+
+
+def cards_at(frame_index, frames):
+    cards = []
+    phase = np.sin(2 * np.pi * frame_index / PERIOD)
+    for code, (x, y), (dx, dy), angle in SCENE:
+        if frame_index >= frames // 2 and code == SWAP[0]:
+            code = SWAP[1]
+        cards.append((code, x + dx * phase, y + dy * phase, angle + 0.15 * phase))
+    return cards
+
+
+def render(frame_index, frames, rng, sprites):
+    fw, fh = FRAME_SIZE
+    frame = np.full((fh, fw, 3), (55, 120, 40), np.float32)
+    cw, ch = CARD_PIXELS
+    scale = 170 / ch
+    shake = rng.normal(0, 1.5, 2)
+    for code, cx, cy, angle in cards_at(frame_index, frames):
+        card, mask = sprites[code]
+        src = np.float32([[0, 0], [cw, 0], [cw, ch], [0, ch]])
+        local = (src - [cw / 2, ch / 2]) * scale
+        rot = np.float32([[np.cos(angle), -np.sin(angle)], [np.sin(angle), np.cos(angle)]])
+        dst = (local @ rot.T + [cx, cy] + shake).astype(np.float32)
+        matrix = cv2.getPerspectiveTransform(src, dst)
+        warped = cv2.warpPerspective(card, matrix, (fw, fh)).astype(np.float32)
+        alpha = cv2.warpPerspective(mask, matrix, (fw, fh)).astype(np.float32)[..., None] / 255
+        frame = frame * (1 - alpha) + warped * alpha
+    frame += rng.normal(0, 6, frame.shape)
+    # ضبابية حركة خفيفة في بعض الإطارات: التصنيف يفشل أحياناً
+    blur = 5 if rng.random() < 0.2 else 3
+    return cv2.GaussianBlur(np.clip(frame, 0, 255).astype(np.uint8), (blur, blur), 0)
+
+
+def truth_summary(frame_index, frames):
+    return detected_summary([card[0] for card in cards_at(frame_index, frames)])
+
+
+def run(video, frames, detector, live):
+    full_ms, locate_ms = [], []
+    tracker = CardTracker()
+    shown = ([], False)
+    flips, stable_at, wrong = 0, [], 0
+    waiting = True
+    for i, frame in enumerate(video):
+        if i == frames // 2:
+            waiting = True
+        if not live or tracker.needs_detection:
+            start = time.perf_counter()
+            cards = detector.detect_cards(frame)
+            full_ms.append((time.perf_counter() - start) * 1000)
+            if live:
+                tracker.observe(cards)
+                codes = [t.code for t in tracker.stable_cards()]
+            else:
+                codes = [c.card_code for c in cards]
+        else:
+            start = time.perf_counter()
+            gray = cv2.cvtColor(cv2.resize(frame, (LOCATE_WIDTH, LOCATE_WIDTH * 3 // 4),
+                                           interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+            quads = detector.locate_cards(gray, scale=frame.shape[1] / LOCATE_WIDTH)
+            locate_ms.append((time.perf_counter() - start) * 1000)
+            tracker.follow(quads)
+            codes = [t.code for t in tracker.stable_cards()]
+
+        summary = detected_summary(codes)
+        if summary != shown:
+            flips += 1
+            shown = summary
+        if waiting and summary == truth_summary(i, frames):
+            stable_at.append(i - (frames // 2 if i >= frames // 2 else 0))
+            waiting = False
+
+    if live:
+        truth = {card[0] for card in cards_at(frames - 1, frames)}
+        wrong = sum(t.code not in truth for t in tracker.stable_cards())
+    cpu = (sum(full_ms) + sum(locate_ms)) / (frames * 1000 / LIVE_FPS)
+    return full_ms, locate_ms, cpu, stable_at, wrong, flips
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 240
+    cv2.setNumThreads(1)
+    rng = np.random.default_rng(17)
+    sprites = {}
+    for code, *_ in SCENE + [(SWAP[1],)]:
+        sprites[code] = render_card(code[:-1], code[-1])
+    video = [render(i, frames, rng, sprites) for i in range(frames)]
+    detector = CardDetector()
+    detector.templates
+
+    print(f"frames {frames} at {LIVE_FPS} fps")
+    print(f"{'mode':<6} {'full':>5} {'full ms':>8} {'locate ms':>10} {'cpu':>6} "
+          f"{'stable':>10} {'wrong':>6} {'flips':>6}")
+    for mode, live in (('every', False), ('live', True)):
+        full_ms, locate_ms, cpu, stable_at, wrong, flips = run(video, frames, detector, live)
+        locate = f"{statistics.median(locate_ms):.2f}" if locate_ms else '-'
+        stable = '/'.join(str(s) for s in stable_at) or '-'
+        print(f"{mode:<6} {len(full_ms):>5} {statistics.median(full_ms):>8.2f} {locate:>10} "
+              f"{cpu:>6.0%} {stable:>10} {wrong if live else '-':>6} {flips:>6}")
+
+
+if __name__ == "__main__":
+    main()
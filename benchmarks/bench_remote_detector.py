@@ -0,0 +1,161 @@
+"""
+قياس الكشف البعيد عبر خادم الإعادة المحلي
+Benchmark: RemoteDetector (keep-alive pool + adaptive JPEG) vs per-request uploads
+
+python benchmarks/bench_remote_detector.py [requests]
+
+صور مركبة (bench_detector) بأحجام كاميرا الهاتف، وردود Roboflow مسجلة من
+مواقع البطاقات الحقيقية يعيدها ReplayServer مع محاكاة شبكة الهاتف: مصافحة
+TCP/TLS لكل اتصال جديد، وزمن ثابت لكل طلب (ذهاب وعودة + النموذج)، وسرعة رفع.
+    naive     مثل analyzeImage: الصورة كاملة JPEG 80 واتصال جديد لكل طلب
+    pooled    RemoteDetector بالصورة كاملة (الاتصالات المفتوحة فقط)
+    adaptive  RemoteDetector بإعداداته: اتصالات مفتوحة + تصغير تحت MAX_UPLOAD
+ويطبع الوسيط و p95 لزمن الطلب، والـ KB لكل طلب، والاتصالات المفتوحة، وهل
+عادت البطاقات بأماكنها في الصورة الأصلية. ثم سيناريوهات الفشل: انقطاع الاتصال
+ثم 503 (يُعادان)، ومفتاح خاطئ 401 (لا يُعاد، والكشف المحلي بدله).
+"""
+
+import base64
+import http.client
+import os
+import statistics
+import sys
+import time
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2  # noqa: E402
+import numpy as np  # noqa: E402
+
+from bench_detector import make_frame  # noqa: E402
+from card_detector import CardDetector  # noqa: E402
+from remote_detector import MAX_UPLOAD, RemoteDetector, ReplayServer  # noqa: E402
+
+SIZES = ((640, 480), (1280, 720), (1920, 1080))
+HANDSHAKE = 0.15        # مصافحة TCP + TLS عبر شبكة الهاتف (ثلاث رحلات تقريباً)
+LATENCY = 0.08          # رحلة ذهاب وعودة + زمن النموذج
+UPLINK = 250_000        # بايت/ثانية (2 ميغابت)
+CARD_BOX = (0.14, 0.28)  # أبعاد البطاقة المسجلة كنسبة من عرض وارتفاع الصورة
+
+
+def one_deck(truth):
+    """الصور المركبة قد تكرر بطاقة؛ في الورق الحقيقي كل بطاقة مرة واحدة"""
+    return list({code: (code, center) for code, center in reversed(truth)}.values())[::-1]
+
+
+def recorded(truth, size, scale):
+    """رد Roboflow كما لو سُجّل من هذه الصورة"""
+    w, h = size
+    predictions = [{
+        'x': cx * scale, 'y': cy * scale, 'width': CARD_BOX[0] * w, 'height': CARD_BOX[1] * h,
+        'confidence': 0.9, 'class': code,
+    } for code, (cx, cy) in truth]
+    return {'image': {'width': w, 'height': h}, 'predictions': predictions}
+
+
+def naive(url, api_key, image):
+    """analyzeImage بـ Python: JPEG 80 للصورة كاملة واتصال جديد"""
+    parts = urlsplit(url)
+    ok, jpeg = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, 80])
+    body = base64.b64encode(jpeg)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=15)
+    conn.request('POST', f"{parts.path}?api_key={api_key}", body,
+                 {'Content-Type': 'application/x-www-form-urlencoded', 'Connection': 'close'})
+    response = conn.getresponse()
+    response.read()
+    conn.close()
+    return len(body)
+
+
+def correct(cards, truth, scale, width):
+    """كل البطاقات برموزها ومراكزها في الصورة الأصلية (خطأ أقل من 1% من العرض)"""
+    left = [(c.card_code, c.center) for c in cards]
+    for code, (cx, cy) in truth:
+        near = [item for item in left if item[0] == code
+                and abs(item[1][0] - cx * scale) <= width / 100
+                and abs(item[1][1] - cy * scale) <= width / 100]
+        if not near:
+            return False
+        left.remove(near[0])
+    return not left
+
+
+def run(method, server, frames, size):
+    times, sizes, ok = [], [], 0
+    remote = None
+    if method == 'pooled':
+        remote = RemoteDetector('bench', server.url, budget=10 ** 9, max_width=10 ** 5)
+    elif method == 'adaptive':
+        remote = RemoteDetector('bench', server.url)
+    connections = server.connections
+    for image, truth, scale in frames:
+        start = time.perf_counter()
+        if remote is None:
+            sizes.append(naive(server.url, 'bench', image))
+            ok += 1     # الرد نفسه؛ الأماكن لا تُحوَّل في analyzeImage
+        else:
+            cards = remote.detect(image)
+            sizes.append(remote.last_upload[2])
+            ok += correct(cards, truth, scale, size[0])
+        times.append((time.perf_counter() - start) * 1000)
+    upload = f"{remote.last_upload[0]}px q{remote.last_upload[1]}" if remote else 'full q80'
+    if remote:
+        remote.close()
+    return times, sizes, server.connections - connections, ok, upload
+
+
+def failures(frames):
+    """انقطاع ثم 503 يُعادان بنجاح، و 401 يسقط للكشف المحلي"""
+    image, truth, scale = frames[0]
+    responses = [recorded(truth, image.shape[1::-1], scale)]
+
+    server = ReplayServer(responses, failures=['drop', 503])
+    server.start()
+    remote = RemoteDetector('bench', server.url, backoff=0.05)
+    cards = remote.detect(image)
+    print(f"drop, 503 then 200: {len(cards)} cards, stats {remote.stats()}")
+    remote.close()
+    server.stop()
+
+    server = ReplayServer(responses, failures=[401])
+    server.start()
+    detector = CardDetector('wrong-key', remote_url=server.url)
+    cards = detector.detect_cards(image)
+    print(f"401: {server.requests} request, local fallback {len(cards)} cards, "
+          f"last_error {detector.last_error!r}")
+    detector.close()
+    server.stop()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    cv2.setNumThreads(1)
+    rng = np.random.default_rng(24)
+    base = [make_frame(rng) for _ in range(count)]
+
+    print(f"requests {count}  handshake {HANDSHAKE * 1000:.0f} ms  latency {LATENCY * 1000:.0f} ms  "
+          f"uplink {UPLINK * 8 / 1e6:.0f} Mbit/s  budget {MAX_UPLOAD // 1024} KB")
+    print(f"{'size':<10} {'method':<9} {'p50 ms':>7} {'p95 ms':>7} {'KB':>6} {'conns':>6} "
+          f"{'correct':>8}  upload")
+    for size in SIZES:
+        scale = size[0] / base[0][0].shape[1]
+        frames = [(cv2.resize(image, size, interpolation=cv2.INTER_LINEAR), one_deck(truth), scale)
+                  for image, truth in base]
+        responses = [recorded(truth, size, scale) for _, truth, _ in frames]
+        for method in ('naive', 'pooled', 'adaptive'):
+            server = ReplayServer(responses, latency=LATENCY, handshake=HANDSHAKE, bandwidth=UPLINK)
+            server.start()
+            times, sizes, conns, ok, upload = run(method, server, frames, size)
+            server.stop()
+            p95 = sorted(times)[int(len(times) * 0.95) - 1]
+            print(f"{f'{size[0]}x{size[1]}':<10} {method:<9} {statistics.median(times):>7.0f} "
+                  f"{p95:>7.0f} {statistics.mean(sizes) / 1024:>6.0f} {conns:>6} "
+                  f"{ok:>4}/{len(frames):<3}  {upload}")
+
+    print()
+    failures([(image, one_deck(truth), 1.0) for image, truth in base])
+
+
+if __name__ == "__main__":
+    main()
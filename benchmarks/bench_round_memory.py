@@ -0,0 +1,74 @@
+"""
+قياس الذاكرة لكل جولة في كل تمثيل
+Benchmark: memory per round for RoundData, history dicts and compact records
+
+python benchmarks/bench_round_memory.py
+"""
+
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cc_core.scoring import KING_HEART_BIT, encode_state, score_table  # noqa: E402
+from cc_core.records import CompactHistory, CompactRound, pack_round  # noqa: E402
+
+ROUNDS = 100_000
+
+
+def random_states(n, seed=0):
+    rng = random.Random(seed)
+    states = []
+    for _ in range(n):
+        present = rng.randrange(32)
+        states.append(encode_state(
+            rng.randrange(14), rng.randrange(14),
+            present & 0b1111, present >> KING_HEART_BIT & 1,
+            doubled=rng.randrange(32) & present,
+            doubled_to_opponent=rng.randrange(32) & ~present & 0b11111
+        ))
+    return states
+
+
+def measure(build):
+    """الذاكرة المحجوزة لكل جولة (بايت)"""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    keep = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del keep
+    return size / ROUNDS
+
+
+def main():
+    states = random_states(ROUNDS)
+    score_table()
+    records = [pack_round(i % 10_000 + 1, s) for i, s in enumerate(states)]
+    history = [CompactRound(r).to_history() for r in records]
+
+    results = [
+        ("RoundData + SpecialCard", lambda: [CompactRound(r).to_round_data() for r in records]),
+        ("history dict", lambda: [dict(entry) for entry in history]),
+        ("list[CompactRound]", lambda: [CompactRound(r) for r in records]),
+        ("CompactHistory (array 'I')", lambda: CompactHistory(records)),
+    ]
+
+    print(f"{'representation':<28} {'bytes/round':>12}")
+    for name, build in results:
+        print(f"{name:<28} {measure(build):>12.1f}")
+
+    # التحقق من أن التحويل بلا فقدان
+    compact = CompactHistory.from_history(history)
+    assert compact.to_history() == history
+    for r in records[:1000]:
+        assert CompactRound.from_round_data(
+            CompactRound(r).to_round_data(), CompactRound(r).round_number
+        ).record == r
+
+
+if __name__ == "__main__":
+    main()
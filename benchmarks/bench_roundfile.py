@@ -0,0 +1,120 @@
+"""
+قياس ملف الجولات المربوط بالذاكرة عند عشرات الملايين من الجولات
+Benchmark: RoundFile open / slice / aggregate at tens of millions of rounds
+
+python benchmarks/bench_roundfile.py [rounds]
+
+الملف الكبير يُكتب دفعة واحدة بنفس التنسيق (الكتابة عبر RoundFileWriter
+تُقاس على جزء صغير)، ثم يُفتح ويُقاس زمن قص لعبة ونطاق زمني وتجميع عمود
+كامل، مع ذاكرة العملية قبل الفتح وبعده.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cc_core.roundfile import (  # noqa: E402
+    HEADER, MAGIC, VERSION, RECORD_SIZE, RoundFile, RoundFileWriter, round_dtype,
+)
+
+ROUNDS_PER_GAME = 12
+START = 1_600_000_000
+
+
+def rss_mb():
+    """الذاكرة المقيمة للعملية (Linux فقط)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (OSError, ValueError):
+        return 0.0
+
+
+def write_bulk(path, rounds):
+    """كتابة ملف كبير مباشرة بالتنسيق نفسه (ألعاب بـ 12 جولة، لعبة كل دقيقة)"""
+    rng = np.random.default_rng(1)
+    chunk = 1_000_000
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, RECORD_SIZE))
+        for lo in range(0, rounds, chunk):
+            index = np.arange(lo, min(rounds, lo + chunk))
+            records = np.zeros(len(index), round_dtype())
+            records['game'] = index // ROUNDS_PER_GAME
+            records['round'] = index % ROUNDS_PER_GAME + 1
+            records['created'] = START + records['game'] * 60 + records['round'] * 4
+            records['state'] = rng.integers(0, 1 << 18, len(index))
+            records['team1'] = rng.integers(-500, 1, len(index))
+            records['team2'] = -500 - records['team1']
+            f.write(records.tobytes())
+
+
+def timed(label, fn, repeat=1000):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    us = (time.perf_counter() - start) / repeat * 1e6
+    print(f"{label:<28} {us:>10.1f} us  {len(result) if hasattr(result, '__len__') else result:>12,}")
+    return result
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000_000
+    games = -(-rounds // ROUNDS_PER_GAME)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # الكتابة عبر الواجهة
+        small = os.path.join(tmp, 'small.ccr')
+        history = [{'round': r, 'team1': -205, 'team2': -295, 'state': 69685}
+                   for r in range(1, ROUNDS_PER_GAME + 1)]
+        start = time.perf_counter()
+        with RoundFileWriter(small) as writer:
+            for g in range(10_000):
+                writer.add_game(f"g{g}", "A", "B", history, START + g * 60)
+        elapsed = time.perf_counter() - start
+        print(f"RoundFileWriter: {10_000 * ROUNDS_PER_GAME / elapsed:,.0f} rounds/s")
+
+        path = os.path.join(tmp, 'rounds.ccr')
+        write_bulk(path, rounds)
+        size = os.path.getsize(path)
+        print(f"{rounds:,} rounds / {games:,} games: {size / 2**20:,.0f} MB "
+              f"({RECORD_SIZE} bytes/round)")
+
+        before = rss_mb()
+        start = time.perf_counter()
+        rf = RoundFile(path)
+        print(f"open:                {(time.perf_counter() - start) * 1000:.2f} ms, "
+              f"RSS +{rss_mb() - before:.1f} MB")
+
+        print(f"{'operation':<28} {'time':>13}  {'rounds':>12}")
+        view = timed("slice one game", lambda: rf.game(games // 2))
+        assert np.shares_memory(view, rf.records) and view['round'][0] == 1
+        hour = START + (games // 2) * 60
+        view = timed("slice one hour", lambda: rf.between(hour, hour + 3600))
+        assert np.shares_memory(view, rf.records)
+        day = START + (games // 3) * 60
+
+        def week_sum():
+            week = rf.between(day, day + 7 * 86400)
+            week['team1'].sum(dtype=np.int64)
+            return week
+
+        view = timed("team1 sum, one week", week_sum, repeat=100)
+        del view
+
+        start = time.perf_counter()
+        totals = np.bincount(rf.records['game'], weights=rf.records['team1'], minlength=games)
+        elapsed = time.perf_counter() - start
+        print(f"{'team1 total of every game':<28} {elapsed * 1000:>10.1f} ms  {rounds:>12,}")
+        print(f"RSS after full scan: +{rss_mb() - before:.1f} MB (mapped file pages)")
+        assert totals.shape == (games,)
+        del totals
+        rf.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+قياس سرعة الحساب الجماعي للجولات
+Benchmark: ScoreCalculator.score_batch vs the per-round path
+
+python benchmarks/bench_score_batch.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cc_core.scoring import (  # noqa: E402
+    ScoreCalculator, CardRank, CardSuit, QUEEN_BITS, KING_HEART_BIT
+)
+
+SIZES = [10_000, 1_000_000, 10_000_000]
+
+
+def random_rounds(n, seed=0):
+    """توليد أعمدة جولات عشوائية صحيحة (التدبيل للخصم على البطاقات الناقصة فقط)"""
+    rng = np.random.default_rng(seed)
+    tricks = rng.integers(0, 14, n, dtype=np.uint8)
+    diamonds = rng.integers(0, 14, n, dtype=np.uint8)
+    queens = rng.integers(0, 16, n, dtype=np.uint8)
+    king = rng.integers(0, 2, n, dtype=np.uint8)
+    present = queens | (king << KING_HEART_BIT)
+    doubled = rng.integers(0, 32, n, dtype=np.uint8) & present
+    doubled_to = rng.integers(0, 32, n, dtype=np.uint8) & ~present & 0b11111
+    return tricks, diamonds, queens, king, doubled, doubled_to
+
+
+def score_one(calc, t, d, q, k, dbl, dto):
+    """حساب جولة واحدة عبر المسار الأصلي"""
+    calc.reset_round()
+    queens = [
+        {"suit": suit, "is_doubled": bool(dbl >> bit & 1)}
+        for suit, bit in QUEEN_BITS.items() if q >> bit & 1
+    ]
+    calc.set_cards_data(int(t) * calc.CARDS_PER_TRICK, int(d), queens, bool(k))
+    if k and dbl >> KING_HEART_BIT & 1:
+        calc.set_doubled_card(calc.round_data.king_heart, True)
+    for suit, bit in QUEEN_BITS.items():
+        if dto >> bit & 1:
+            calc.add_doubled_to_opponent(CardRank.QUEEN, suit)
+    if dto >> KING_HEART_BIT & 1:
+        calc.add_doubled_to_opponent(CardRank.KING, CardSuit.HEART)
+    return calc.calculate_round_score()["total"]
+
+
+def bench_scalar(n):
+    cols = random_rounds(n)
+    calc = ScoreCalculator()
+    start = time.perf_counter()
+    totals = [score_one(calc, *row) for row in zip(*(c.tolist() for c in cols))]
+    elapsed = time.perf_counter() - start
+    return np.array(totals, dtype=np.int32), elapsed
+
+
+def bench_batch(n):
+    cols = random_rounds(n)
+    start = time.perf_counter()
+    result = ScoreCalculator.score_batch(*cols)
+    elapsed = time.perf_counter() - start
+    return result, elapsed
+
+
+def main():
+    scalar_totals, scalar_time = bench_scalar(SIZES[0])
+    batch_result, _ = bench_batch(SIZES[0])
+    assert np.array_equal(scalar_totals, batch_result["team1"]), "batch totals differ"
+    assert np.all(batch_result["team1"] + batch_result["team2"] == ScoreCalculator.ROUND_TOTAL)
+
+    print(f"{'rounds':>12} {'path':>8} {'seconds':>10} {'rounds/s':>14}")
+    print(f"{SIZES[0]:>12,} {'scalar':>8} {scalar_time:>10.4f} {SIZES[0] / scalar_time:>14,.0f}")
+    for n in SIZES:
+        _, elapsed = bench_batch(n)
+        print(f"{n:>12,} {'batch':>8} {elapsed:>10.4f} {n / elapsed:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+مولد حمل لخادم عدّ البطولات
+Load generator: submit latency (p50/p99) for many concurrent tables
+
+python benchmarks/bench_server.py [tables] [rate] [seconds]
+
+يشغل الخادم في عملية منفصلة على localhost ثم يفتح اتصالاً (keep-alive)
+لكل طاولة. كل طاولة ترسل جولاتها على فترات عشوائية بحيث يكون مجموع
+الطلبات rate طلب/ثانية (حمل مفتوح كما في البطولة)، ثم تُقاس الاستجابة.
+الحالة الأسوأ (كل الطاولات ترسل بلا توقف) بـ rate = 0.
+"""
+
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HOST, PORT = '127.0.0.1', 8799
+
+SUITS = ('spade', 'heart', 'diamond', 'club')
+
+
+def random_round(rng):
+    return {
+        'total_cards': 4 * rng.randrange(14),
+        'diamond_count': rng.randrange(14),
+        'queens': [{'suit': s, 'is_doubled': rng.random() < 0.2}
+                   for s in rng.sample(SUITS, rng.randrange(5))],
+        'has_king_heart': rng.random() < 0.5,
+    }
+
+
+async def request(reader, writer, method, path, payload=None):
+    body = json.dumps(payload).encode() if payload is not None else b''
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: {HOST}\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    head = await reader.readuntil(b'\r\n\r\n')
+    status = int(head.split(b' ', 2)[1])
+    length = 0
+    for line in head.split(b'\r\n'):
+        if line.lower().startswith(b'content-length:'):
+            length = int(line.split(b':')[1])
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def play_table(table, interval, deadline, latencies, start_gate):
+    rng = random.Random(table)
+    reader, writer = await asyncio.open_connection(HOST, PORT)
+    await start_gate.wait()
+    expected = submitted = 0
+    while time.perf_counter() < deadline:
+        if interval:
+            delay = rng.expovariate(1 / interval)
+            await asyncio.sleep(min(delay, max(0, deadline - time.perf_counter())))
+            if time.perf_counter() >= deadline:
+                break
+        payload = random_round(rng)
+        start = time.perf_counter()
+        status, result = await request(reader, writer, 'POST', f'/tables/t{table}/rounds', payload)
+        latencies.append(time.perf_counter() - start)
+        assert status == 201, (status, result)
+        expected += result['team1_round_score']
+        submitted += 1
+    if submitted:
+        status, standing = await request(reader, writer, 'GET', f'/tables/t{table}/standings')
+        assert status == 200 and standing['team1_total'] == expected and standing['is_valid']
+    writer.close()
+
+
+async def run_load(tables, rate, seconds):
+    latencies = []
+    gate = asyncio.Event()
+    interval = tables / rate if rate else 0
+    deadline = time.perf_counter() + 1 + seconds  # بعد ثانية الاتصال
+    tasks = [
+        asyncio.create_task(play_table(t, interval, deadline, latencies, gate))
+        for t in range(tables)
+    ]
+    await asyncio.sleep(1)  # فتح كل الاتصالات قبل القياس
+    start = time.perf_counter()
+    gate.set()
+    await asyncio.gather(*tasks)
+    return latencies, time.perf_counter() - start
+
+
+def cpu_seconds(pid):
+    """زمن المعالج الذي استهلكته عملية الخادم (Linux فقط)"""
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def main():
+    tables = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    rate = float(sys.argv[2]) if len(sys.argv) > 2 else 500
+    seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 10
+
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'cc_core.server', '--port', str(PORT)],
+        cwd=ROOT, stdout=subprocess.PIPE
+    )
+    try:
+        server.stdout.readline()  # انتظار بدء الخادم
+        cpu_before = cpu_seconds(server.pid)
+        latencies, elapsed = asyncio.run(run_load(tables, rate, seconds))
+        cpu_after = cpu_seconds(server.pid)
+    finally:
+        server.terminate()
+        server.wait()
+
+    ms = [x * 1000 for x in latencies]
+    print(f"{tables:,} tables, {len(ms):,} submits in {elapsed:.2f} s "
+          f"({len(ms) / elapsed:,.0f} req/s, target {rate or 'max'})")
+    print(f"submit latency ms: p50 {percentile(ms, 0.50):.2f}  p90 {percentile(ms, 0.90):.2f}  "
+          f"p99 {percentile(ms, 0.99):.2f}  max {max(ms):.2f}")
+    if cpu_before is not None and cpu_after is not None:
+        # المولد والخادم يتقاسمان الأنوية، فهذا حد الخادم وحده
+        server_cpu = cpu_after - cpu_before
+        print(f"server CPU: {server_cpu:.2f} s ({server_cpu / len(ms) * 1e6:.0f} us/request, "
+              f"~{len(ms) / server_cpu:,.0f} req/s per core)")
+
+
+if __name__ == "__main__":
+    main()
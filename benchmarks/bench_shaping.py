@@ -0,0 +1,144 @@
+"""
+قياس زمن بناء الشاشات مع ذاكرة تشكيل النص العربي وبدونها
+Benchmark: screen build + on_enter time with and without the shaping cache
+
+python benchmarks/bench_shaping.py [visits]
+
+يبني شاشات modern_ui بدون تشغيل التطبيق (بناء ثم on_enter) بتطبيق وهمي
+فيه 30 جولة في السجل، ويقارن:
+ويطبع الزمن الكلي لكل زيارة والزمن داخل arabic() منه:
+
+    off        بدون ذاكرة (التشكيل في كل مرة كما كان)
+    cold       ذاكرة فارغة في أول زيارة
+    warm       زيارات لاحقة في نفس التشغيل
+    persisted  تشغيل جديد بعد تحميل ملف الذاكرة المحفوظ
+"""
+
+import gc
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_LOG_MODE', 'PYTHON')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import arabic_text  # noqa: E402
+import modern_ui  # noqa: E402
+from arabic_text import shaping_cache  # noqa: E402
+from cc_core.totals import RoundTotals  # noqa: E402
+from kivy.core.text import LabelBase  # noqa: E402
+from kivy.uix.screenmanager import ScreenManager  # noqa: E402
+
+if modern_ui.ARABIC_FONT:
+    LabelBase.register(name=modern_ui.ARABIC_FONT, fn_regular=modern_ui.FONT_PATH)
+
+SCREENS = ('WelcomeScreen', 'GameScreen', 'CountingScreen', 'DoublingScreen',
+           'HistoryScreen', 'SettingsScreen')
+
+
+class FakeApp:
+    """بيانات اللعبة التي تقرأها الشاشات"""
+
+    def __init__(self, rounds=30):
+        self.team1_name, self.team2_name = "فريقنا", "الخصم"
+        self.round_number = rounds
+        self.history = [{'round': r, 'team1': -205 - r, 'team2': -295 + r}
+                        for r in range(1, rounds + 1)]
+        self.totals = RoundTotals.from_history(self.history)
+        self.team1_total, self.team2_total = self.totals.team1_total, self.totals.team2_total
+        self.current_round_data = {'tricks': 5, 'diamonds': 4, 'queens': ['spade', 'heart'],
+                                   'has_king': True}
+        self.api_key = ''
+
+    def get_expected_total(self):
+        return len(self.totals) * -500
+
+
+def build_screens(app):
+    """بناء كل الشاشات ثم الدخول إليها"""
+    sm = ScreenManager()
+    sm.app = app
+    for name in SCREENS:
+        screen = getattr(modern_ui, name)()
+        sm.add_widget(screen)
+        screen._build()
+        screen.on_enter()
+
+
+# الزمن داخل arabic() وحدها، لأن بناء الشاشة يتضمن إنشاء الأنسجة وغيرها
+_arabic = modern_ui.arabic
+shaping_time = 0.0
+
+
+def timed_arabic(text):
+    global shaping_time
+    start = time.perf_counter()
+    result = _arabic(text)
+    shaping_time += time.perf_counter() - start
+    return result
+
+
+modern_ui.arabic = timed_arabic
+
+
+def visit(app, visits):
+    """الوسيط لكل زيارة: (زمن البناء، زمن التشكيل) بالملي ثانية"""
+    global shaping_time
+    builds, shapes = [], []
+    for _ in range(visits):
+        gc.collect()
+        shaping_time = 0.0
+        start = time.perf_counter()
+        build_screens(app)
+        builds.append((time.perf_counter() - start) * 1000)
+        shapes.append(shaping_time * 1000)
+    return statistics.median(builds), statistics.median(shapes)
+
+
+def shape_cost(count=2000):
+    text = "نتيجة الجولة"
+    start = time.perf_counter()
+    for _ in range(count):
+        arabic_text.shape(text)
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def main():
+    visits = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    app = FakeApp()
+    build_screens(app)  # تحميل الخطوط والصور قبل القياس
+
+    print(f"shape() of one short label: {shape_cost():.1f} us")
+    print(f"{'mode':<11} {'build ms':>9} {'shaping ms':>11} {'hits':>7} {'misses':>7} {'hit rate':>9}")
+
+    def report(mode, times):
+        stats = shaping_cache.stats()
+        print(f"{mode:<11} {times[0]:>9.2f} {times[1]:>11.2f} {stats['hits']:>7} "
+              f"{stats['misses']:>7} {stats['hit_rate']:>8.0%}")
+
+    shaping_cache.maxsize = 0
+    shaping_cache.clear()
+    report('off', visit(app, visits))
+
+    shaping_cache.maxsize = arabic_text.CACHE_SIZE
+    shaping_cache.clear()
+    report('cold', visit(app, 1))
+
+    shaping_cache.hits = shaping_cache.misses = 0
+    report('warm', visit(app, visits))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'shaping_cache.json')
+        shaping_cache.save(path)
+        shaping_cache.clear()
+        loaded = shaping_cache.load(path)
+        report('persisted', visit(app, 1))
+        print(f"persisted entries: {loaded} ({os.path.getsize(path) / 1024:.1f} KB)")
+
+
+if __name__ == "__main__":
+    main()
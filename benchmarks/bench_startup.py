@@ -0,0 +1,90 @@
+"""
+قياس زمن التشغيل حتى ظهور شاشة الترحيب جاهزة للمس
+Benchmark: cold start to the first interactive WelcomeScreen, eager vs lazy screens
+
+python benchmarks/bench_startup.py [runs]
+
+كل تشغيل عملية جديدة تشغّل التطبيق الحقيقي وتتوقف عند أول إطار يُعرض بعد
+بناء شاشة الترحيب. الزمن من بداية العملية (قبل استيراد Kivy).
+    eager  كل الشاشات تُبنى عند التشغيل (كما كان قبل LazyScreenManager)
+    lazy   شاشة الترحيب فقط، والباقي عند أول انتقال أو في أوقات الفراغ
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import time
+START = time.perf_counter()
+import json, os, sys
+os.environ['KIVY_NO_ARGS'] = '1'
+sys.path.insert(0, {root!r})
+import main
+from kivy.clock import Clock
+from kivy.core.window import Window
+
+EAGER = {eager}
+marks = {{}}
+
+
+class Probe(main.CCCounterApp):
+    prebuild_screens = False
+
+    def build(self):
+        sm = super().build()
+        if EAGER:
+            for name in sm.pending:
+                sm.build_screen(name)
+        marks['build'] = time.perf_counter() - START
+        Window.bind(on_flip=self._flipped)
+        return sm
+
+    def _flipped(self, *args):
+        welcome = self.sm.get_screen('welcome')
+        if welcome.children and 'interactive' not in marks:
+            marks['interactive'] = time.perf_counter() - START
+            marks['screens'] = len(self.sm.screens)
+            Clock.schedule_once(lambda dt: self.stop(), 0)
+
+
+Probe().run()
+print('RESULT ' + json.dumps(marks))
+"""
+
+
+def run(eager):
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, HOME=tmp, XDG_CONFIG_HOME=tmp, KIVY_HOME=os.path.join(tmp, 'kivy'))
+        probe = os.path.join(tmp, 'probe.py')  # Kivy يبحث عن ملف kv بجانب ملف التطبيق
+        with open(probe, 'w', encoding='utf-8') as f:
+            f.write(PROBE.format(root=ROOT, eager=eager))
+        out = subprocess.run(
+            [sys.executable, probe],
+            cwd=ROOT, env=env, capture_output=True, text=True, timeout=120
+        )
+    for line in out.stdout.splitlines():
+        if line.startswith('RESULT '):
+            return json.loads(line[7:])
+    raise RuntimeError(out.stderr[-2000:])
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    run(False)  # تسخين ذاكرة نظام الملفات
+
+    print(f"{'mode':<6} {'build ms':>9} {'interactive ms':>15} {'screens':>8}")
+    for mode, eager in (('eager', True), ('lazy', False)):
+        results = [run(eager) for _ in range(runs)]
+        build = statistics.median(r['build'] for r in results) * 1000
+        interactive = statistics.median(r['interactive'] for r in results) * 1000
+        print(f"{mode:<6} {build:>9.0f} {interactive:>15.0f} {results[0]['screens']:>8}")
+
+
+if __name__ == "__main__":
+    main()
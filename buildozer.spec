@@ -18,7 +18,7 @@ source.dir = .
 version = 1.0.0
 
 # المتطلبات - مهم جداً
-requirements = python3,kivy,pillow,arabic-reshaper,python-bidi
+requirements = python3,kivy,pillow,arabic-reshaper,python-bidi,numpy,opencv,sqlite3
 
 # الملفات المضمنة
 source.include_exts = py,png,jpg,kv,atlas,ttf,txt
@@ -26,6 +26,9 @@ source.include_exts = py,png,jpg,kv,atlas,ttf,txt
 # مجلدات مضمنة
 source.include_patterns = fonts/*
 
+# مجلدات مستثناة (أدوات القياس لا تدخل في التطبيق)
+source.exclude_dirs = benchmarks
+
 # الأيقونة
 #icon.filename = %(source.dir)s/data/icon.png
 
@@ -0,0 +1,86 @@
+"""
+نسخ إطار الكاميرا من صورة Kivy إلى مصفوفة NumPy
+Camera frame grab - Kivy texture to NumPy without encoding
+
+صورة الكاميرا تُربط بـ Fbo وتُقرأ بـ glReadPixels مرة واحدة، والمصفوفة
+الناتجة عرض (np.frombuffer) فوق البايتات المقروءة بدون أي نسخ آخر:
+    - بدون تصغير لا يوجد رسم أصلاً، القراءة من صورة الكاميرا نفسها
+    - مع التصغير (width) تُرسم الصورة أولاً إلى Fbo أصغر، فالـ GPU يصغّر
+      والبيانات المنقولة أقل
+    - الصف الأول في صورة OpenGL هو الأسفل، والقلب عرض بخطوة سالبة ([::-1])
+      إلا إذا كانت صورة الكاميرا مقلوبة أصلاً (flip_vertical في بعض المزودات)
+
+الإطار بترتيب RGBA كما في Kivy (CardDetector(rgba=True) يقبله مباشرة)،
+وهو مصفوفة جديدة في كل مرة (للقراءة فقط) يمكن إرسالها لخيط آخر كما هي.
+التحويل الاختياري للرمادي يكتب في مصفوفة محجوزة مسبقاً يُعاد استخدامها في
+كل إطار، فيجب نسخها قبل الاحتفاظ بها أو إرسالها لخيط آخر.
+
+grab يُستدعى من خيط الواجهة فقط (سياق OpenGL).
+"""
+
+from typing import Optional, Tuple
+
+from kivy.graphics import Color, Fbo, Rectangle
+
+
+class FrameGrabber:
+    """قراءة إطارات صورة الكاميرا كمصفوفات RGBA أو رمادية"""
+
+    def __init__(self, width: Optional[int] = None, gray: bool = False):
+        """
+        Args:
+            width: عرض الإطار الناتج (الارتفاع بنفس النسبة)، None = حجم الكاميرا
+            gray: إطار رمادي (قناة واحدة) بدل RGBA
+        """
+        self.width = width
+        self.gray = gray
+        self.frames = 0
+        self._fbo = None
+        self._source = None     # الصورة المربوطة بالـ Fbo (بدون تصغير) أو المرسومة فيه
+        self._rect = None
+        self._top_down = False
+        self._gray = None
+
+    def frame_size(self, texture_size) -> Tuple[int, int]:
+        tw, th = texture_size
+        if not self.width or self.width >= tw:
+            return int(tw), int(th)
+        return int(self.width), max(1, int(round(th * self.width / tw)))
+
+    def grab(self, texture) -> 'numpy.ndarray':
+        """الإطار الحالي: (h, w, 4) RGBA، أو (h, w) رمادي في مصفوفة يُعاد استخدامها"""
+        import numpy as np
+
+        w, h = self.frame_size(texture.size)
+        if self._source is not texture or tuple(self._fbo.size) != (w, h):
+            self._setup(texture, w, h)
+        if self._rect is not None:
+            self._fbo.draw()
+        raw = np.frombuffer(self._fbo.pixels, np.uint8).reshape(h, w, 4)
+        self.frames += 1
+        if self.gray:
+            import cv2
+            raw = cv2.cvtColor(raw, cv2.COLOR_RGBA2GRAY, dst=self._gray)
+        return raw if self._top_down else raw[::-1]
+
+    def _setup(self, texture, w, h):
+        import numpy as np
+
+        self._source = texture
+        if (w, h) == tuple(texture.size):
+            # القراءة من صورة الكاميرا نفسها (مثل texture.pixels لكن بدون Fbo جديد لكل إطار)
+            self._fbo = Fbo(size=(w, h), texture=texture, with_stencilbuffer=False)
+            self._rect = None
+            # tex_coords مقلوبة = الصف الأول في الذاكرة هو أعلى الصورة
+            self._top_down = texture.tex_coords[1] > texture.tex_coords[7]
+        else:
+            self._fbo = Fbo(size=(w, h), with_stencilbuffer=False)
+            with self._fbo:
+                Color(1, 1, 1, 1)
+                self._rect = Rectangle(pos=(0, 0), size=(w, h), texture=texture)
+            self._top_down = False
+        self._gray = np.empty((h, w), np.uint8) if self.gray else None
+
+    def release(self):
+        """تحرير الـ Fbo (عند إيقاف الكاميرا)"""
+        self._fbo = self._source = self._rect = self._gray = None
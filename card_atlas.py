@@ -0,0 +1,115 @@
+"""
+أطلس صور البطاقات المرسومة مسبقاً
+Card texture atlas - each card look is drawn once into a shared texture
+
+رسم البطاقة (خلفية مستديرة وإطار وشكل النوع من مثلثات ودوائر) يتم مرة
+واحدة لكل شكل (النوع، الحالة، الحجم بالبكسل) داخل صفحة Fbo مشتركة،
+وبعدها تعرض البطاقة مستطيلاً واحداً بجزء من تلك الصفحة. تحريك البطاقة
+لا يعيد الرسم، وتبديل حالتها يغير الجزء المعروض فقط.
+
+كل حجم جديد للبطاقات (تدوير الشاشة أو تغيير حجم النافذة) يرسم أشكالاً
+جديدة، لذلك عدد الصفحات محدود بـ MAX_PAGES: عند الحاجة لصفحة بعدها تُحذف
+الصفحة الأقدم استخداماً مع أجزائها (البطاقة المعروضة منها تبقى صحيحة حتى
+تعيد رسمها، ثم تتحرر ذاكرة الصفحة).
+
+الصفحات تحتفظ بتعليمات الرسم في canvas الـ Fbo، فإذا فُقد سياق OpenGL
+(عند إيقاف التطبيق مؤقتاً في أندرويد) يعيد Kivy رسمها تلقائياً.
+"""
+
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Tuple
+
+from kivy.graphics import ClearBuffers, ClearColor, Fbo, PopMatrix, PushMatrix, Translate
+
+PAGE_SIZE = 1024    # حجم صفحة الأطلس بالبكسل
+PADDING = 2         # فراغ بين البطاقات حتى لا يتسرب لون بطاقة لجارتها
+MAX_PAGES = 4       # أقصى عدد صفحات (4 ميغابايت لكل صفحة RGBA)
+
+
+class CardAtlas:
+    """صفحات Fbo مع تعبئة بالصفوف (shelf packing) وذاكرة للأجزاء المرسومة"""
+
+    def __init__(self, page_size: int = PAGE_SIZE, max_pages: int = MAX_PAGES):
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self._regions: Dict[Hashable, Tuple[object, Fbo]] = {}     # key -> (الجزء، صفحته)
+        self._pages: OrderedDict = OrderedDict()    # الصفحة -> مفاتيح أجزائها (الأقدم استخداماً أولاً)
+        self._shelf_page = None     # الصفحة التي تُعبأ صفوفها الآن
+        self._shelf = (0, 0, 0)     # x, y، وارتفاع الصف الحالي فيها
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._regions)
+
+    def texture(self, key: Hashable, size: Tuple[float, float],
+                paint: Callable[[int, int], None]):
+        """الجزء المرسوم لـ key، ويُرسم بـ paint(w, h) من (0, 0) عند أول طلب"""
+        entry = self._regions.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._pages.move_to_end(entry[1])
+            return entry[0]
+
+        self.misses += 1
+        w, h = max(1, int(round(size[0]))), max(1, int(round(size[1])))
+        fbo, x, y = self._allocate(w, h)
+        with fbo:
+            PushMatrix()
+            Translate(x, y)
+            paint(w, h)
+            PopMatrix()
+        fbo.draw()
+        region = fbo.texture.get_region(x, y, w, h)
+        self._regions[key] = (region, fbo)
+        self._pages[fbo].append(key)
+        return region
+
+    def _new_page(self, w: int, h: int) -> Fbo:
+        while len(self._pages) >= self.max_pages:
+            old, keys = self._pages.popitem(last=False)
+            for key in keys:
+                del self._regions[key]
+            if old is self._shelf_page:
+                self._shelf_page = None
+        fbo = Fbo(size=(w, h), with_stencilbuffer=False)
+        with fbo:
+            ClearColor(0, 0, 0, 0)
+            ClearBuffers()
+        self._pages[fbo] = []
+        return fbo
+
+    def _allocate(self, w: int, h: int):
+        size = self.page_size
+        if w > size or h > size:
+            return self._new_page(w, h), 0, 0   # بطاقة أكبر من الصفحة: صفحة خاصة بها
+
+        x, y, row = self._shelf
+        if x + w > size:
+            x, y, row = 0, y + row + PADDING, 0
+        if self._shelf_page is None or y + h > size:
+            self._shelf_page = self._new_page(size, size)
+            x, y, row = 0, 0, 0
+        self._shelf = (x + w + PADDING, y, max(row, h))
+        return self._shelf_page, x, y
+
+    def clear(self):
+        self._regions.clear()
+        self._pages.clear()
+        self._shelf_page = None
+        self._shelf = (0, 0, 0)
+        self.hits = self.misses = 0
+
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            'cards': len(self._regions),
+            'pages': len(self._pages),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+
+# أطلس واحد للتطبيق
+card_atlas = CardAtlas()
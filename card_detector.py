@@ -1,31 +1,497 @@
 """
-كاشف البطاقات - نسخة بسيطة
+كاشف البطاقات على الجهاز (بدون إنترنت)
+Local card detector - classical computer vision with OpenCV + NumPy
+
+الخطوات لكل صورة:
+1. صورة رمادية مصغرة (DETECT_WIDTH) ثم عتبة Otsu: البطاقات أفتح من الطاولة
+2. الحدود الخارجية التي تُقرّب لرباعي محدب بنسبة أبعاد بطاقة = بطاقة
+3. تصحيح المنظور من الصورة الأصلية إلى بطاقة قائمة بحجم CARD_SIZE
+4. قص زاوية المؤشر (الرتبة فوق النوع) وفصل الحبر فيها إلى سطرين
+5. مطابقة كل رمز مع قوالب الرموز (ارتباط طبيعي) ولون النوع (أحمر/أسود)
+   يحصر المطابقة في نوعين فقط
+
+القوالب تُرسم عند أول استخدام (أرقام وحروف بخطوط OpenCV وأشكال الأنواع)،
+ويمكن إضافة قوالب مقصوصة من بطاقات حقيقية في مجلد templates_dir بأسماء
+مثل rank_Q.png و rank_Q-2.png و suit_H.png (رمز داكن على خلفية فاتحة).
+
+البطاقات المتراكبة (مروحة) لا تعطي رباعياً منفصلاً ولا تُكتشف هنا.
+مع cache=DetectionCache تعود الصورة شبه المطابقة لصورة سابقة بنتيجتها فوراً.
+مع api_key يصنّف نموذج Roboflow الصورة (remote_detector)، والكشف المحلي
+احتياطي عند فشل الشبكة.
+OpenCV و NumPy يُستوردان عند الحاجة فقط.
 """
 
-# هذا الملف للتوافق فقط - الميزة غير مفعلة حالياً
+import glob
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+ROBOFLOW_API_KEY = ''   # يُضبط من شاشة الإعدادات (الكشف البعيد)
+
+RANKS = ['A', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K']
+SUITS = ['S', 'H', 'D', 'C']
+RED_SUITS = ('H', 'D')
+
+DETECT_WIDTH = 640          # عرض الصورة عند البحث عن حدود البطاقات
+CARD_SIZE = (200, 300)      # البطاقة بعد تصحيح المنظور (عرض، ارتفاع)
+CORNER_BOX = (3, 4, 40, 104)  # زاوية المؤشر في البطاقة المصححة (x0, y0, x1, y1)
+RANK_SIZE = (24, 36)        # حجم قالب الرتبة
+SUIT_SIZE = (24, 24)        # حجم قالب النوع
+GLYPH_PIXELS = (16, 10)     # ارتفاعات الرمز في الصورة التي تُحاكى بها القوالب
+
+MIN_CARD_AREA = 0.004       # أصغر بطاقة كنسبة من مساحة الصورة
+MAX_CARD_AREA = 0.6
+CARD_ASPECT = (1.2, 1.8)    # نسبة الطول للعرض (البطاقة القياسية 1.4)
+MIN_CONFIDENCE = 0.5
+
 
 class DetectedCard:
-    def __init__(self, code='', rank='', suit=''):
+    def __init__(self, code='', rank='', suit='', confidence=1.0, corners=None,
+                 rank_confidence=None, suit_confidence=None):
         self.card_code = code
         self.rank = rank
         self.suit = suit
-        self.confidence = 1.0
-    
+        self.confidence = confidence
+        self.rank_confidence = confidence if rank_confidence is None else rank_confidence
+        self.suit_confidence = confidence if suit_confidence is None else suit_confidence
+        self.corners = corners or []    # أركان البطاقة في الصورة [(x, y)] باتجاه عقارب الساعة
+
+    def __repr__(self):
+        return f"DetectedCard({self.card_code!r}, confidence={self.confidence:.2f})"
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'DetectedCard':
+        return cls(data['code'], data['rank'], data['suit'], data['confidence'],
+                   [tuple(p) for p in data['corners']],
+                   data['rank_confidence'], data['suit_confidence'])
+
+    def to_dict(self) -> Dict:
+        return {
+            'code': self.card_code, 'rank': self.rank, 'suit': self.suit,
+            'confidence': self.confidence, 'corners': [list(p) for p in self.corners],
+            'rank_confidence': self.rank_confidence, 'suit_confidence': self.suit_confidence,
+        }
+
+    @property
+    def center(self) -> Tuple[float, float]:
+        if not self.corners:
+            return (0.0, 0.0)
+        xs, ys = zip(*self.corners)
+        return (sum(xs) / len(xs), sum(ys) / len(ys))
+
     def is_diamond(self):
         return self.suit == 'D'
-    
+
     def is_queen(self):
         return self.rank == 'Q'
-    
+
     def is_king_of_hearts(self):
         return self.rank == 'K' and self.suit == 'H'
 
 
+# ==================== القوالب ====================
+
+def _ink_glyph(mask, size):
+    """قص الحبر (قيم > 0) وتحجيمه إلى size كمتجه float32"""
+    import cv2
+    import numpy as np
+
+    ys, xs = np.nonzero(mask)
+    if len(xs) == 0:
+        return None
+    glyph = mask[ys.min():ys.max() + 1, xs.min():xs.max() + 1]
+    return cv2.resize(glyph, size, interpolation=cv2.INTER_AREA).astype(np.float32).ravel()
+
+
+def _template_variants(mask, size):
+    """القالب بدقته الكاملة وبدقة منخفضة كما يظهر رمز صغير في صورة الكاميرا"""
+    import cv2
+    import numpy as np
+
+    ys, xs = np.nonzero(mask)
+    glyph = mask[ys.min():ys.max() + 1, xs.min():xs.max() + 1]
+    variants = [_ink_glyph(glyph, size)]
+    for height in GLYPH_PIXELS:
+        scale = height / glyph.shape[0]
+        small = cv2.resize(glyph, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        variants.append(_ink_glyph(small, size))
+    return variants
+
+
+def _normalize(vectors):
+    """طرح المتوسط والقسمة على الطول: الضرب النقطي = الارتباط الطبيعي"""
+    import numpy as np
+
+    vectors = vectors - vectors.mean(axis=-1, keepdims=True)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-6)
+
+
+def _draw_suit(canvas, suit):
+    """رسم شكل النوع في مربع 200x200 (نفس أشكال CardWidget)"""
+    import cv2
+    import numpy as np
+
+    cx, cy, size = 100, 100, 90
+    if suit == 'H':
+        r = int(size * 0.45)
+        cv2.circle(canvas, (cx - int(size * 0.42), cy - r // 2), r, 255, -1)
+        cv2.circle(canvas, (cx + int(size * 0.42), cy - r // 2), r, 255, -1)
+        pts = [(cx - size * 0.87, cy - r * 0.3), (cx + size * 0.87, cy - r * 0.3), (cx, cy + size)]
+    elif suit == 'D':
+        pts = [(cx, cy - size), (cx + size * 0.62, cy), (cx, cy + size), (cx - size * 0.62, cy)]
+    elif suit == 'S':
+        r = int(size * 0.42)
+        cv2.circle(canvas, (cx - int(size * 0.42), cy + r // 3), r, 255, -1)
+        cv2.circle(canvas, (cx + int(size * 0.42), cy + r // 3), r, 255, -1)
+        cv2.fillPoly(canvas, [np.int32([(cx - size * 0.84, cy + r * 0.2), (cx + size * 0.84, cy + r * 0.2),
+                                        (cx, cy - size)])], 255)
+        pts = [(cx - size * 0.3, cy + size), (cx + size * 0.3, cy + size), (cx, cy + size * 0.2)]
+    else:
+        r = int(size * 0.36)
+        cv2.circle(canvas, (cx, cy - int(size * 0.48)), r, 255, -1)
+        cv2.circle(canvas, (cx - int(size * 0.45), cy + int(size * 0.12)), r, 255, -1)
+        cv2.circle(canvas, (cx + int(size * 0.45), cy + int(size * 0.12)), r, 255, -1)
+        pts = [(cx - size * 0.3, cy + size), (cx + size * 0.3, cy + size), (cx, cy - size * 0.1)]
+    cv2.fillPoly(canvas, [np.int32(pts)], 255)
+
+
+def build_templates(templates_dir: Optional[str] = None) -> Dict[str, tuple]:
+    """{'rank': (الأسماء، المصفوفة المطبّعة)، 'suit': (...)}"""
+    import cv2
+    import numpy as np
+
+    ranks, rank_vecs = [], []
+    for rank in RANKS:
+        for font in (cv2.FONT_HERSHEY_SIMPLEX, cv2.FONT_HERSHEY_DUPLEX):
+            for thickness in (6, 10):
+                canvas = np.zeros((160, 220), np.uint8)
+                cv2.putText(canvas, rank, (10, 130), font, 4, 255, thickness, cv2.LINE_AA)
+                for vec in _template_variants(canvas, RANK_SIZE):
+                    ranks.append(rank)
+                    rank_vecs.append(vec)
+
+    suits, suit_vecs = [], []
+    for suit in SUITS:
+        canvas = np.zeros((200, 200), np.uint8)
+        _draw_suit(canvas, suit)
+        for vec in _template_variants(canvas, SUIT_SIZE):
+            suits.append(suit)
+            suit_vecs.append(vec)
+
+    # قوالب مقصوصة من بطاقات حقيقية
+    if templates_dir:
+        for path in sorted(glob.glob(os.path.join(templates_dir, '*.png'))):
+            stem = os.path.splitext(os.path.basename(path))[0]
+            kind, _, name = stem.partition('_')
+            name = name.split('-')[0]
+            image = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+            if image is None:
+                continue
+            _, mask = cv2.threshold(image, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+            if kind == 'rank' and name in RANKS:
+                ranks.append(name)
+                rank_vecs.append(_ink_glyph(mask, RANK_SIZE))
+            elif kind == 'suit' and name in SUITS:
+                suits.append(name)
+                suit_vecs.append(_ink_glyph(mask, SUIT_SIZE))
+
+    return {
+        'rank': (ranks, _normalize(np.stack(rank_vecs))),
+        'suit': (suits, _normalize(np.stack(suit_vecs))),
+    }
+
+
+def _best_match(templates, glyph, allowed=None):
+    """(الاسم، الثقة) لأفضل قالب، والثقة = الارتباط بين 0 و 1"""
+    names, matrix = templates
+    scores = matrix @ _normalize(glyph)
+    best_name, best_score = '', -1.0
+    for name, score in zip(names, scores.tolist()):
+        if (allowed is None or name in allowed) and score > best_score:
+            best_name, best_score = name, score
+    return best_name, max(0.0, min(1.0, best_score))
+
+
+# ==================== الهندسة ====================
+
+def order_corners(points):
+    """ترتيب أركان الرباعي باتجاه عقارب الساعة بحيث يبدأ بضلع قصير (أعلى البطاقة)"""
+    import numpy as np
+
+    points = np.asarray(points, np.float32).reshape(4, 2)
+    center = points.mean(axis=0)
+    angles = np.arctan2(points[:, 1] - center[1], points[:, 0] - center[0])
+    points = points[np.argsort(angles)]     # محور y للأسفل: تصاعدي = عقارب الساعة
+    top = np.linalg.norm(points[0] - points[1])
+    side = np.linalg.norm(points[1] - points[2])
+    if top > side:
+        points = np.roll(points, -1, axis=0)
+    return points
+
+
+def find_card_quads(gray):
+    """أركان البطاقات في صورة رمادية (بإحداثياتها)"""
+    import cv2
+    import numpy as np
+
+    blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+    _, mask = cv2.threshold(blurred, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+    area = gray.shape[0] * gray.shape[1]
+    quads = []
+    for contour in contours:
+        contour_area = cv2.contourArea(contour)
+        if not MIN_CARD_AREA * area <= contour_area <= MAX_CARD_AREA * area:
+            continue
+        hull = cv2.convexHull(contour)
+        approx = cv2.approxPolyDP(hull, 0.03 * cv2.arcLength(hull, True), True)
+        if len(approx) != 4:
+            # الزوايا المستديرة قد تعطي أكثر من 4 نقاط: أصغر مستطيل محيط
+            if contour_area < 0.9 * cv2.contourArea(hull):
+                continue
+            approx = cv2.boxPoints(cv2.minAreaRect(hull))
+        corners = order_corners(approx)
+        width = np.linalg.norm(corners[0] - corners[1])
+        height = np.linalg.norm(corners[1] - corners[2])
+        if width > 0 and CARD_ASPECT[0] <= height / width <= CARD_ASPECT[1]:
+            quads.append(corners)
+    return quads
+
+
+def warp_card(image, corners):
+    """البطاقة قائمة بحجم CARD_SIZE"""
+    import cv2
+    import numpy as np
+
+    w, h = CARD_SIZE
+    target = np.float32([[0, 0], [w - 1, 0], [w - 1, h - 1], [0, h - 1]])
+    matrix = cv2.getPerspectiveTransform(np.float32(corners), target)
+    return cv2.warpPerspective(image, matrix, (w, h))
+
+
+def split_corner(corner):
+    """(حبر الرتبة، حبر النوع، النوع أحمر؟) من زاوية المؤشر، أو None"""
+    import cv2
+    import numpy as np
+
+    gray = cv2.cvtColor(corner, cv2.COLOR_BGR2GRAY)
+    if int(gray.max()) - int(gray.min()) < 40:
+        return None     # زاوية فارغة
+    _, ink = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+    count, labels, stats, _ = cv2.connectedComponentsWithStats(ink, connectivity=8)
+
+    # الأجزاء الملامسة لحافة البطاقة (يسار/أعلى) ظلال أو خلفية
+    parts = [i for i in range(1, count)
+             if stats[i, cv2.CC_STAT_AREA] >= 12
+             and stats[i, cv2.CC_STAT_LEFT] > 0 and stats[i, cv2.CC_STAT_TOP] > 0]
+    if len(parts) < 2:
+        return None
+
+    # تجميع الأجزاء في سطور (الـ 10 جزءان في سطر واحد)
+    parts.sort(key=lambda i: stats[i, cv2.CC_STAT_TOP])
+    lines = []
+    for i in parts:
+        top = stats[i, cv2.CC_STAT_TOP]
+        bottom = top + stats[i, cv2.CC_STAT_HEIGHT]
+        if lines and top <= lines[-1][1] + 2:
+            lines[-1][1] = max(lines[-1][1], bottom)
+            lines[-1][2].append(i)
+        else:
+            lines.append([top, bottom, [i]])
+    if len(lines) < 2:
+        return None
+
+    # الحبر بدرجاته (مع حواف الرمز الناعمة) داخل أجزاء كل سطر فقط
+    soft = 255 - gray
+    kernel = np.ones((3, 3), np.uint8)
+
+    def line_ink(line):
+        mask = np.isin(labels, line[2]).astype(np.uint8)
+        return soft * cv2.dilate(mask, kernel)
+
+    suit_ink = line_ink(lines[1])
+    # لون النوع من متوسط بكسلاته (BGR)
+    b, g, r = corner[np.isin(labels, lines[1][2])].astype(np.int32).mean(axis=0)
+    red = r - (g + b) / 2 > 40
+    return line_ink(lines[0]), suit_ink, red
+
+
+# ==================== الكاشف ====================
+
 class CardDetector:
-    def __init__(self, api_key=None):
-        self.api_key = api_key
-        self.is_ready = False
+    def __init__(self, api_key=None, templates_dir=None, min_confidence=MIN_CONFIDENCE,
+                 rgba=False, cache=None, remote_url=None):
+        self.api_key = api_key or None
+        self.remote_url = remote_url    # بدل ROBOFLOW_URL (مثلاً ReplayServer)
+        self.templates_dir = templates_dir
+        self.min_confidence = min_confidence
+        self.rgba = rgba    # الصور ذات الأربع قنوات RGBA (صورة Kivy) لا BGRA
+        self.cache = cache  # DetectionCache: صورة شبه مطابقة لسابقة تعود بنتيجتها
+        self.frames = 0
+        self.detect_ms = 0.0    # مجموع زمن الكشف الفعلي (بدون الإصابات)
         self.last_error = None
-    
-    def detect_cards(self, image):
-        return []
+        self._templates = None
+        self._remote = None
+        try:
+            import cv2  # noqa: F401
+            import numpy  # noqa: F401
+            self.is_ready = True
+        except ImportError as e:
+            self.is_ready = False
+            self.last_error = str(e)
+
+    @property
+    def templates(self):
+        if self._templates is None:
+            self._templates = build_templates(self.templates_dir)
+        return self._templates
+
+    @property
+    def remote(self):
+        """RemoteDetector عند وجود مفتاح API (يُنشأ عند أول استخدام)"""
+        if self._remote is None and self.api_key:
+            from remote_detector import RemoteDetector, ROBOFLOW_URL
+            self._remote = RemoteDetector(self.api_key, self.remote_url or ROBOFLOW_URL,
+                                          min_confidence=self.min_confidence)
+        return self._remote
+
+    def set_api_key(self, api_key):
+        """مفتاح جديد من الإعدادات: الاتصالات القديمة تُغلق"""
+        api_key = api_key or None
+        if api_key != self.api_key:
+            self.close()
+            self.api_key = api_key
+
+    def close(self):
+        if self._remote is not None:
+            self._remote.close()
+            self._remote = None
+
+    def detect_cards(self, image, remote: bool = True) -> List[DetectedCard]:
+        """
+        البطاقات في صورة BGR أو BGRA أو رمادية (مصفوفة NumPy أو مسار ملف)
+
+        remote=False: الكشف المحلي حتى مع وجود مفتاح (الوضع المباشر)
+        """
+        if not self.is_ready:
+            return []
+        try:
+            image = self._load(image)
+            self.frames += 1
+            remote = remote and self.api_key is not None
+            # الذاكرة تحفظ نتائج الطريقة الأدق فقط: الكشف المحلي مع وجود مفتاح لا يُحفظ
+            cache = self.cache if remote or self.api_key is None else None
+            key = None
+            if cache is not None:
+                from detection_cache import frame_signature
+                key = frame_signature(image)
+                cached = cache.get(key)
+                if cached is not None:
+                    return [DetectedCard.from_dict(card) for card in cached]
+
+            start = time.perf_counter()
+            cards = self._detect_remote(image) if remote else None
+            failed = remote and cards is None
+            if cards is None:
+                cards = self._detect(image)
+            elapsed = (time.perf_counter() - start) * 1000
+            self.detect_ms += elapsed
+            # بعد فشل الشبكة لا تُحفظ النتيجة المحلية: الالتقاط التالي يحاول مرة أخرى
+            if key is not None and not failed:
+                cache.put(key, [card.to_dict() for card in cards], elapsed)
+            return cards
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"Card detector error: {e}")
+            return []
+
+    def stats(self) -> Dict:
+        """الصور، وزمن الكشف الفعلي، وإصابات الذاكرة والوقت الذي وفرته"""
+        detected = self.frames - (self.cache.hits if self.cache is not None else 0)
+        stats = {
+            'frames': self.frames,
+            'detect_ms': self.detect_ms,
+            'mean_detect_ms': self.detect_ms / detected if detected else 0.0,
+        }
+        if self.cache is not None:
+            stats.update({f'cache_{k}': v for k, v in self.cache.stats().items()})
+        if self._remote is not None:
+            stats.update({f'remote_{k}': v for k, v in self._remote.stats().items()})
+        return stats
+
+    def locate_cards(self, gray, scale: float = 1.0) -> List[list]:
+        """أركان البطاقات بدون تصنيف، من صورة رمادية مصغرة (scale = الأصل / المصغرة)"""
+        if not self.is_ready:
+            return []
+        try:
+            return [(corners * scale).tolist() for corners in find_card_quads(gray)]
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"Card detector error: {e}")
+            return []
+
+    def _load(self, image):
+        """صورة BGR من أي مدخل يقبله detect_cards"""
+        import cv2
+
+        if isinstance(image, str):
+            image = cv2.imread(image, cv2.IMREAD_COLOR)
+            if image is None:
+                raise ValueError("تعذر قراءة الصورة")
+        if image.ndim == 2:
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        elif image.shape[2] == 4:
+            image = cv2.cvtColor(image, cv2.COLOR_RGBA2BGR if self.rgba else cv2.COLOR_BGRA2BGR)
+        return image
+
+    def _detect_remote(self, image) -> Optional[List[DetectedCard]]:
+        """نتيجة Roboflow، أو None بعد فشل كل المحاولات (الكشف المحلي بدلها)"""
+        from remote_detector import RemoteError
+
+        try:
+            return self.remote.detect(image)
+        except RemoteError as e:
+            self.last_error = str(e)
+            print(f"Remote detector error: {e}")
+            return None
+
+    def _detect(self, image):
+        import cv2
+
+        # البحث عن الحدود في صورة مصغرة، والقص من الأصلية
+        scale = min(1.0, DETECT_WIDTH / image.shape[1])
+        small = image if scale == 1.0 else cv2.resize(
+            image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+        cards = []
+        for corners in find_card_quads(gray):
+            corners = corners / scale
+            card = self.classify(warp_card(image, corners))
+            if card is not None and card.confidence >= self.min_confidence:
+                card.corners = [(float(x), float(y)) for x, y in corners]
+                cards.append(card)
+        cards.sort(key=lambda c: c.confidence, reverse=True)
+        return cards
+
+    def classify(self, card_image) -> Optional[DetectedCard]:
+        """رتبة ونوع بطاقة مصححة المنظور (CARD_SIZE)؛ الزاويتان المتقابلتان تُجرّبان"""
+        import cv2
+
+        x0, y0, x1, y1 = CORNER_BOX
+        best = None
+        for flipped in (card_image, cv2.rotate(card_image, cv2.ROTATE_180)):
+            split = split_corner(flipped[y0:y1, x0:x1])
+            if split is None:
+                continue
+            rank_ink, suit_ink, red = split
+            rank, rank_conf = _best_match(self.templates['rank'], _ink_glyph(rank_ink, RANK_SIZE))
+            allowed = RED_SUITS if red else tuple(s for s in SUITS if s not in RED_SUITS)
+            suit, suit_conf = _best_match(self.templates['suit'], _ink_glyph(suit_ink, SUIT_SIZE), allowed)
+            confidence = min(rank_conf, suit_conf)
+            if best is None or confidence > best.confidence:
+                best = DetectedCard(rank + suit, rank, suit, confidence,
+                                    rank_confidence=rank_conf, suit_confidence=suit_conf)
+        return best
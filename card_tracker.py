@@ -0,0 +1,182 @@
+"""
+تتبع البطاقات بين إطارات الكاميرا
+Card tracker - IoU/centroid matching across frames with accumulated votes
+
+الوضع المباشر لا يصنّف كل إطار: التصنيف الكامل (detect_cards) كل
+DETECT_EVERY إطار، وبينها تحديد أماكن البطاقات فقط (find_card_quads على
+صورة رمادية مصغرة، أرخص بكثير). كل بطاقة مسار (Track) يُربط بالإطار التالي
+بأكبر تداخل (IoU) للمستطيل المحيط، أو بأقرب مركز إذا تحركت البطاقة بسرعة.
+
+كل تصنيف كامل يضيف ثقته صوتاً للرمز في مسار البطاقة (والأصوات السابقة
+تضعف بنسبة VOTE_DECAY)، والرمز الثابت هو صاحب أكثر الأصوات بعد أن يتجاوز
+مجموعها MIN_SCORE ونسبتها STABLE_SHARE.
+بطاقة جديدة أو مسار مفقود يطلب تصنيفاً كاملاً في الإطار التالي.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+TRACK_IOU = 0.3         # أقل تداخل لربط بطاقة بمسار
+CENTER_DISTANCE = 0.5   # أو مركز أقرب من هذه النسبة من قطر المسار
+MAX_MISSES = 4          # إطارات بدون البطاقة قبل حذف مسارها
+DETECT_EVERY = 6        # تصنيف كامل كل هذا العدد من الإطارات على الأقل
+LOST_RETRY = 2          # وبسبب بطاقة جديدة أو مفقودة: ليس أكثر من مرة كل إطارين
+MIN_SCORE = 1.5         # مجموع ثقة الرمز (تصنيفان جيدان تقريباً)
+STABLE_SHARE = 0.6      # نسبة أصوات الرمز من كل أصوات المسار
+VOTE_DECAY = 0.8        # الأصوات القديمة تضعف مع كل تصنيف (بطاقة استُبدلت في مكانها)
+
+Box = Tuple[float, float, float, float]
+
+
+def bounding_box(corners) -> Box:
+    xs = [float(p[0]) for p in corners]
+    ys = [float(p[1]) for p in corners]
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+def iou(a: Box, b: Box) -> float:
+    w = min(a[2], b[2]) - max(a[0], b[0])
+    h = min(a[3], b[3]) - max(a[1], b[1])
+    if w <= 0 or h <= 0:
+        return 0.0
+    inter = w * h
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+class Track:
+    """بطاقة واحدة عبر الإطارات"""
+
+    __slots__ = ('id', 'box', 'votes', 'hits', 'misses')
+
+    def __init__(self, track_id: int, box: Box):
+        self.id = track_id
+        self.box = box
+        self.votes: Dict[str, float] = {}
+        self.hits = 0       # عدد التصنيفات الكاملة التي رأتها
+        self.misses = 0     # إطارات متتالية بدون البطاقة
+
+    def __repr__(self):
+        return f"Track({self.id}, {self.code!r}, score={self.score:.2f})"
+
+    @property
+    def center(self) -> Tuple[float, float]:
+        return ((self.box[0] + self.box[2]) / 2, (self.box[1] + self.box[3]) / 2)
+
+    @property
+    def code(self) -> str:
+        return max(self.votes, key=self.votes.get) if self.votes else ''
+
+    @property
+    def score(self) -> float:
+        return self.votes[self.code] if self.votes else 0.0
+
+    @property
+    def stable(self) -> bool:
+        if not self.votes:
+            return False
+        score = self.score
+        return score >= MIN_SCORE and score >= STABLE_SHARE * sum(self.votes.values())
+
+    def vote(self, code: str, confidence: float):
+        for key in self.votes:
+            self.votes[key] *= VOTE_DECAY
+        self.votes[code] = self.votes.get(code, 0.0) + confidence
+        self.hits += 1
+
+
+class CardTracker:
+    """مسارات البطاقات: observe للتصنيف الكامل و follow لتحديد الأماكن فقط"""
+
+    def __init__(self, detect_every: int = DETECT_EVERY, max_misses: int = MAX_MISSES):
+        self.detect_every = detect_every
+        self.max_misses = max_misses
+        self.tracks: List[Track] = []
+        self._next_id = 1
+        self._since_detect = detect_every   # أول إطار تصنيف كامل
+        self._lost = False
+
+    def clear(self):
+        self.tracks.clear()
+        self._since_detect = self.detect_every
+        self._lost = False
+
+    @property
+    def needs_detection(self) -> bool:
+        """التصنيف الكامل في الإطار القادم؟"""
+        # شيء مستطيل لا يُصنَّف أبداً لا يجعل كل الإطارات تصنيفاً كاملاً
+        if self._lost and self._since_detect >= LOST_RETRY:
+            return True
+        return self._since_detect >= self.detect_every
+
+    def observe(self, cards: Sequence) -> List[Track]:
+        """نتيجة detect_cards (DetectedCard مع corners): تصويت وإنشاء مسارات"""
+        boxes = [bounding_box(card.corners) for card in cards]
+        matches, unmatched = self._match(boxes)
+        for track, index in matches:
+            track.box = boxes[index]
+            track.vote(cards[index].card_code, cards[index].confidence)
+        for index in unmatched:
+            track = Track(self._next_id, boxes[index])
+            self._next_id += 1
+            track.vote(cards[index].card_code, cards[index].confidence)
+            self.tracks.append(track)
+        self._since_detect = 0
+        self._lost = False
+        return self.tracks
+
+    def follow(self, quads: Sequence) -> List[Track]:
+        """أماكن البطاقات فقط (أركان): تحريك المسارات بدون تصويت"""
+        boxes = [bounding_box(corners) for corners in quads]
+        matches, unmatched = self._match(boxes)
+        for track, index in matches:
+            track.box = boxes[index]
+        self._since_detect += 1
+        # بطاقة جديدة أو مسار لم يجد بطاقته: تصنيف كامل في الإطار القادم
+        if unmatched or len(matches) < len(self.tracks):
+            self._lost = True
+        return self.tracks
+
+    def stable_cards(self) -> List[Track]:
+        return [t for t in self.tracks if t.stable]
+
+    def _match(self, boxes: List[Box]):
+        """([(المسار، رقم المستطيل)]، أرقام المستطيلات بدون مسار)، وتحديث misses"""
+        pairs = []
+        for track in self.tracks:
+            for index, box in enumerate(boxes):
+                overlap = iou(track.box, box)
+                if overlap >= TRACK_IOU:
+                    pairs.append((overlap, track.id, track, index))
+        pairs.sort(key=lambda p: (-p[0], p[1]))
+
+        matched_tracks, matched_boxes, matches = set(), set(), []
+        for _, track_id, track, index in pairs:
+            if track_id not in matched_tracks and index not in matched_boxes:
+                matched_tracks.add(track_id)
+                matched_boxes.add(index)
+                matches.append((track, index))
+
+        # حركة سريعة بدون تداخل كافٍ: أقرب مركز
+        for track in self.tracks:
+            if track.id in matched_tracks:
+                continue
+            best: Optional[int] = None
+            cx, cy = track.center
+            diagonal = ((track.box[2] - track.box[0]) ** 2 + (track.box[3] - track.box[1]) ** 2) ** 0.5
+            best_distance = CENTER_DISTANCE * diagonal
+            for index, box in enumerate(boxes):
+                if index in matched_boxes:
+                    continue
+                distance = (((box[0] + box[2]) / 2 - cx) ** 2 + ((box[1] + box[3]) / 2 - cy) ** 2) ** 0.5
+                if distance < best_distance:
+                    best, best_distance = index, distance
+            if best is not None:
+                matched_tracks.add(track.id)
+                matched_boxes.add(best)
+                matches.append((track, best))
+
+        for track in self.tracks:
+            track.misses = 0 if track.id in matched_tracks else track.misses + 1
+        self.tracks = [t for t in self.tracks if t.misses <= self.max_misses]
+        unmatched = [i for i in range(len(boxes)) if i not in matched_boxes]
+        return matches, unmatched
@@ -0,0 +1,29 @@
+"""
+نواة العدّ بدون واجهة
+CC Counter headless core - scoring without Kivy
+
+لا تستورد Kivy أو مكتبات النص العربي أو NumPy عند الاستيراد،
+لذلك تستخدمها الواجهة والأدوات الخلفية (الحساب الجماعي، الخادم) معاً.
+
+    rules      محرك القواعد وجداول النتائج
+    scoring    نموذج الجولة وحاسبة النقاط
+    records    تخزين مضغوط للجولات
+    totals     مجاميع تراكمية مع تعديل وحذف
+    game_log   سجل أحداث اللعبة
+    report     تنسيق تقرير الجولة
+    batch      حساب ملفات الجولات (JSONL) على كل الأنوية
+    server     خادم عدّ البطولات (asyncio + HTTP/JSON)
+    feed       بث النتائج المباشر للمشاهدين (SSE)
+    archive    أرشيف الألعاب والجولات في SQLite
+    roundfile  ملف جولات ثابت العرض للتحليل (mmap + NumPy)
+"""
+
+from .rules import (
+    POINTS, RULE_VARIANTS, DEFAULT_RULES, CompiledRules,
+    active, compile_rules, use_rules, use_variant, encode_state, mask_from_keys,
+)
+from .scoring import CardSuit, CardRank, SpecialCard, RoundData, ScoreCalculator
+from .records import CompactRound, CompactHistory, pack_round
+from .totals import FenwickTree, RoundTotals, PrefixTotals
+from .game_log import GameLog, GameState
+from .report import format_score_report
@@ -0,0 +1,66 @@
+"""
+مثال على استخدام النواة
+python -m cc_core
+"""
+
+from .scoring import ScoreCalculator, CardSuit
+from .report import format_score_report
+
+calc = ScoreCalculator()
+
+# === الجولة الأولى ===
+calc.start_new_round()
+print(f"\n🎮 الجولة رقم {calc.round_number}")
+
+# محاكاة بيانات من معالجة الصور
+calc.set_cards_data(
+    total_cards=20,  # 5 أكلات
+    diamond_count=3,
+    queens=[
+        {"suit": CardSuit.HEART, "is_doubled": False},
+        {"suit": CardSuit.DIAMOND, "is_doubled": False},
+        {"suit": CardSuit.SPADE, "is_doubled": False},
+    ],
+    has_king_heart=True
+)
+
+# تعيين التدبيل للبنات (من اختيار المستخدم)
+calc.round_data.queens[0].is_doubled = True  # بنت القبة مدبلة
+calc.round_data.queens[1].is_doubled = True  # بنت الديناري مدبلة
+
+# حساب النقاط
+score_details = calc.calculate_round_score()
+team1_score = score_details['total']
+
+# إنهاء الجولة وحساب نقاط الفريق الثاني
+round_result = calc.finalize_round(team1_score)
+
+print(format_score_report(score_details, round_result))
+
+# === الجولة الثانية ===
+calc.start_new_round()
+print(f"\n🎮 الجولة رقم {calc.round_number}")
+
+calc.set_cards_data(
+    total_cards=16,  # 4 أكلات
+    diamond_count=2,
+    queens=[
+        {"suit": CardSuit.CLUB, "is_doubled": False},
+    ],
+    has_king_heart=False
+)
+
+score_details2 = calc.calculate_round_score()
+team1_score2 = score_details2['total']
+round_result2 = calc.finalize_round(team1_score2)
+
+print(format_score_report(score_details2, round_result2))
+
+# === ملخص اللعبة ===
+print("\n" + "═" * 40)
+print("📊 ملخص اللعبة بعد جولتين:")
+print(f"   فريقك: {calc.team1_total}")
+print(f"   الخصم: {calc.team2_total}")
+print(f"   المجموع الكلي: {calc.team1_total + calc.team2_total}")
+print(f"   المتوقع: {calc.get_expected_total()}")
+print("═" * 40)
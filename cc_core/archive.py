@@ -0,0 +1,312 @@
+"""
+أرشيف الألعاب والجولات في SQLite
+Game Archive - SQLite (WAL) with batched background writes
+
+الكتابة تمر عبر طابور إلى خيط خلفي يجمع ما تراكم في معاملة واحدة، لذلك
+استدعاء add_round من خيط الواجهة لا ينتظر القرص. القراءة من أي خيط عبر
+اتصال خاص به، ووضع WAL يسمح بالقراءة أثناء الكتابة.
+
+الفهارس: اسم الفريق + التاريخ، التاريخ، ومعرّف اللعبة (المفتاح الأساسي
+للجولات)، فالاستعلام عن صفحة ألعاب أو جولات لعبة لا يمر على كل الأرشيف.
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id          TEXT PRIMARY KEY,
+    team1_name  TEXT NOT NULL,
+    team2_name  TEXT NOT NULL,
+    started_at  REAL NOT NULL,
+    finished_at REAL,
+    rounds      INTEGER NOT NULL DEFAULT 0,
+    team1_total INTEGER NOT NULL DEFAULT 0,
+    team2_total INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_games_started ON games (started_at);
+CREATE INDEX IF NOT EXISTS idx_games_team1 ON games (team1_name, started_at);
+CREATE INDEX IF NOT EXISTS idx_games_team2 ON games (team2_name, started_at);
+
+CREATE TABLE IF NOT EXISTS rounds (
+    game_id     TEXT NOT NULL,
+    round       INTEGER NOT NULL,
+    team1       INTEGER NOT NULL,
+    team2       INTEGER NOT NULL,
+    state       INTEGER,
+    created_at  REAL NOT NULL,
+    PRIMARY KEY (game_id, round)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_rounds_created ON rounds (created_at);
+"""
+
+# عمليات الكتابة (تُنفذ في خيط الكتابة)
+_SQL = {
+    'start_game': (
+        "INSERT OR IGNORE INTO games (id, team1_name, team2_name, started_at) VALUES (?, ?, ?, ?)"
+    ),
+    'finish_game': "UPDATE games SET finished_at = ? WHERE id = ?",
+    # إعادة إضافة جولة موجودة تحدّث نقاطها وتبقي created_at
+    'add_round': (
+        "INSERT INTO rounds (game_id, round, team1, team2, state, created_at) "
+        "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (game_id, round) DO UPDATE SET "
+        "team1 = excluded.team1, team2 = excluded.team2, state = excluded.state"
+    ),
+    'edit_round': "UPDATE rounds SET team1 = ?, team2 = ?, state = ? WHERE game_id = ? AND round = ?",
+    'delete_round': "DELETE FROM rounds WHERE game_id = ? AND round = ?",
+}
+
+# إعادة حساب مجاميع لعبة من جولاتها (نطاق واحد على المفتاح الأساسي)
+_REFRESH_TOTALS = """
+UPDATE games SET
+    rounds = (SELECT COUNT(*) FROM rounds WHERE game_id = :id),
+    team1_total = (SELECT COALESCE(SUM(team1), 0) FROM rounds WHERE game_id = :id),
+    team2_total = (SELECT COALESCE(SUM(team2), 0) FROM rounds WHERE game_id = :id)
+WHERE id = :id
+"""
+
+GAME_COLUMNS = ('id', 'team1_name', 'team2_name', 'started_at', 'finished_at',
+                'rounds', 'team1_total', 'team2_total')
+
+_STOP = object()
+
+
+def connect(path: str, **kwargs) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, **kwargs)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")   # مع WAL: انقطاع الكهرباء قد يضيع آخر معاملة فقط
+    return conn
+
+
+class GameArchive:
+    """أرشيف دائم للألعاب والجولات"""
+
+    BATCH_SIZE = 1000       # أقصى عدد عمليات في المعاملة الواحدة
+
+    def __init__(self, path: str):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = connect(path)
+        conn.executescript(SCHEMA)
+        conn.close()
+
+        self._local = threading.local()
+        self._readers: List[sqlite3.Connection] = []    # اتصالات القراءة لكل الخيوط
+        self._readers_lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name='GameArchive', daemon=True)
+        self._writer.start()
+
+    # ==================== الكتابة (بدون انتظار) ====================
+
+    def start_game(self, game_id: str, team1_name: str, team2_name: str,
+                   started_at: float = None):
+        self._queue.put(('start_game', (game_id, team1_name, team2_name, started_at or time.time())))
+
+    def finish_game(self, game_id: str, finished_at: float = None):
+        self._queue.put(('finish_game', (finished_at or time.time(), game_id)))
+
+    def add_round(self, game_id: str, round_number: int, team1: int, team2: int,
+                  state: int = None, created_at: float = None):
+        self._queue.put(('add_round', (
+            game_id, round_number, team1, team2, state, created_at or time.time()
+        )))
+
+    def add_entry(self, game_id: str, entry: Dict):
+        """إضافة قيد بشكل app.history"""
+        self.add_round(game_id, entry['round'], entry['team1'], entry['team2'], entry.get('state'))
+
+    def edit_round(self, game_id: str, round_number: int, team1: int, team2: int,
+                   state: int = None):
+        self._queue.put(('edit_round', (team1, team2, state, game_id, round_number)))
+
+    def delete_round(self, game_id: str, round_number: int):
+        self._queue.put(('delete_round', (game_id, round_number)))
+
+    def flush(self):
+        """انتظار كتابة كل ما في الطابور"""
+        self._queue.join()
+
+    def close(self):
+        self._queue.put((_STOP, None))
+        self._writer.join()
+        with self._readers_lock:
+            readers, self._readers = self._readers, []
+        for conn in readers:
+            conn.close()
+        self._local = threading.local()
+
+    def import_rounds(self, rows: Iterable[Tuple]):
+        """
+        استيراد كميات كبيرة مباشرة (بدون الطابور) في معاملات كبيرة
+
+        Args:
+            rows: (game_id, round, team1, team2, state, created_at)
+        """
+        self.flush()
+        conn = self._conn()
+        batch = []
+        games = set()
+        with conn:
+            for row in rows:
+                batch.append(row)
+                games.add(row[0])
+                if len(batch) >= 50_000:
+                    conn.executemany(_SQL['add_round'], batch)
+                    batch = []
+            if batch:
+                conn.executemany(_SQL['add_round'], batch)
+            conn.executemany(_REFRESH_TOTALS, ({'id': g} for g in games))
+
+    # ==================== خيط الكتابة ====================
+
+    def _write_loop(self):
+        conn = connect(self.path)
+        stop = False
+        while not stop:
+            ops = [self._queue.get()]
+            # كل ما تراكم أثناء المعاملة السابقة يدخل في معاملة واحدة
+            while len(ops) < self.BATCH_SIZE:
+                try:
+                    ops.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = any(kind is _STOP for kind, _ in ops)
+            ops = [op for op in ops if op[0] is not _STOP]
+            try:
+                self._apply(conn, ops)
+            except sqlite3.Error as e:
+                # إعادة العمليات واحدة واحدة: تضيع العملية الفاشلة فقط لا الدفعة كلها
+                print(f"Archive error: {e}")
+                for op in ops:
+                    try:
+                        self._apply(conn, [op])
+                    except sqlite3.Error as e:
+                        print(f"Archive error: {op[0]} {op[1]}: {e}")
+            finally:
+                for _ in range(len(ops) + stop):
+                    self._queue.task_done()
+        conn.close()
+
+    @staticmethod
+    def _apply(conn: sqlite3.Connection, ops: List[Tuple]):
+        """العمليات ومجاميع ألعابها في معاملة واحدة"""
+        changed = set()
+        with conn:
+            for kind, params in ops:
+                conn.execute(_SQL[kind], params)
+                if kind == 'add_round' or kind == 'delete_round':
+                    changed.add(params[0])
+                elif kind == 'edit_round':
+                    changed.add(params[3])
+            conn.executemany(_REFRESH_TOTALS, ({'id': g} for g in changed))
+
+    # ==================== القراءة ====================
+
+    def _conn(self) -> sqlite3.Connection:
+        """اتصال قراءة لكل خيط"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # check_same_thread=False: close() يغلقه من خيط آخر
+            conn = self._local.conn = connect(self.path, check_same_thread=False)
+            with self._readers_lock:
+                self._readers.append(conn)
+        return conn
+
+    def list_games(self, team: str = None, since: float = None, until: float = None,
+                   limit: int = 50, before: Tuple[float, str] = None) -> List[Dict]:
+        """
+        صفحة من الألعاب الأحدث أولاً
+
+        Args:
+            team: اسم فريق (في أي من الجهتين)
+            since, until: نطاق تاريخ البدء
+            before: (started_at, id) لآخر لعبة في الصفحة السابقة
+        """
+        where, params = [], []
+        if since is not None:
+            where.append("started_at >= ?")
+            params.append(since)
+        if until is not None:
+            where.append("started_at < ?")
+            params.append(until)
+        if before is not None:
+            where.append("(started_at < ? OR (started_at = ? AND id < ?))")
+            params.extend((before[0], before[0], before[1]))
+
+        columns = ', '.join(GAME_COLUMNS)
+        condition = ' AND '.join(where) or '1'
+        if team is None:
+            sql = f"SELECT {columns} FROM games WHERE {condition}"
+        else:
+            # كل جهة تستخدم فهرسها ثم تُدمج النتيجتان
+            sql = (f"SELECT {columns} FROM games WHERE team1_name = ? AND {condition} "
+                   f"UNION ALL "
+                   f"SELECT {columns} FROM games WHERE team2_name = ? AND team1_name != ? "
+                   f"AND {condition}")
+            params = [team] + params + [team, team] + params
+        sql += " ORDER BY started_at DESC, id DESC LIMIT ?"
+        params.append(limit)
+
+        return [dict(zip(GAME_COLUMNS, row)) for row in self._conn().execute(sql, params)]
+
+    def game(self, game_id: str) -> Optional[Dict]:
+        row = self._conn().execute(
+            f"SELECT {', '.join(GAME_COLUMNS)} FROM games WHERE id = ?", (game_id,)
+        ).fetchone()
+        return dict(zip(GAME_COLUMNS, row)) if row else None
+
+    def rounds(self, game_id: str) -> List[Dict]:
+        """جولات لعبة بشكل app.history"""
+        history = []
+        for round_number, team1, team2, state in self._conn().execute(
+            "SELECT round, team1, team2, state FROM rounds WHERE game_id = ? ORDER BY round",
+            (game_id,)
+        ):
+            entry = {'round': round_number, 'team1': team1, 'team2': team2}
+            if state is not None:
+                entry['state'] = state
+            history.append(entry)
+        return history
+
+    def rounds_between(self, since: float, until: float, limit: int = 1000) -> List[Tuple]:
+        """الجولات المسجلة في نطاق زمني: (game_id, round, team1, team2, created_at)"""
+        return self._conn().execute(
+            "SELECT game_id, round, team1, team2, created_at FROM rounds "
+            "WHERE created_at >= ? AND created_at < ? ORDER BY created_at LIMIT ?",
+            (since, until, limit)
+        ).fetchall()
+
+    def team_stats(self, team: str, since: float = None, until: float = None) -> Dict:
+        """عدد ألعاب الفريق وانتصاراته ومجموع نقاطه"""
+        where, params = "", []
+        if since is not None:
+            where += " AND started_at >= ?"
+            params.append(since)
+        if until is not None:
+            where += " AND started_at < ?"
+            params.append(until)
+        games = wins = points = 0
+        # لعبة الفريق مع نفسه تُعد مرة واحدة (من جهة team1) كما في list_games
+        for column, mine, theirs, other in (
+                ('team1_name', 'team1_total', 'team2_total', ''),
+                ('team2_name', 'team2_total', 'team1_total', ' AND team1_name != ?')):
+            g, w, p = self._conn().execute(
+                f"SELECT COUNT(*), COALESCE(SUM({mine} > {theirs}), 0), COALESCE(SUM({mine}), 0) "
+                f"FROM games WHERE {column} = ?{other}{where}",
+                [team] + [team] * bool(other) + params
+            ).fetchone()
+            games, wins, points = games + g, wins + w, points + p
+        return {'team': team, 'games': games, 'wins': wins, 'points': points}
+
+    def count(self) -> Tuple[int, int]:
+        """(عدد الألعاب، عدد الجولات)"""
+        conn = self._conn()
+        return (conn.execute("SELECT COUNT(*) FROM games").fetchone()[0],
+                conn.execute("SELECT COUNT(*) FROM rounds").fetchone()[0])
@@ -0,0 +1,277 @@
+"""
+حساب جماعي لملفات الجولات (JSONL) على كل الأنوية
+Streaming JSONL batch scorer
+
+كل سطر في الملف جولة بنفس شكل معاملات set_cards_data:
+
+    {"game": "g1", "round": 3, "total_cards": 20, "diamond_count": 3,
+     "queens": [{"suit": "heart", "is_doubled": true}], "has_king_heart": true,
+     "king_heart_doubled": false,
+     "doubled_to_opponent": [{"rank": "Q", "suit": "club"}]}
+
+الملف يُقسم إلى مقاطع بالبايت (على حدود الأسطر) وكل عملية تقرأ مقطعها بنفسها،
+فلا يمر نص الإدخال عبر العملية الرئيسية. عدد المقاطع قيد التنفيذ محدود
+لذلك تبقى الذاكرة ثابتة مهما كبر الملف، والنتائج تُكتب بنفس ترتيب الإدخال.
+
+    python -m cc_core.batch rounds.jsonl -o scores.jsonl
+    python -m cc_core.batch rounds.jsonl -o scores.csv --format csv --workers 8
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .rules import (
+    DEFAULT_RULES, RULE_VARIANTS, KING_HEART_FLAG, QUEENS_MASK, FIELD_MAX,
+    active as active_rules, encode_state, use_variant,
+)
+from .scoring import CardRank, CardSuit, QUEEN_BITS, ScoreCalculator
+
+ROUND_FIELDS = ('game', 'round', 'team1', 'team2', 'state')
+TOTAL_FIELDS = ('game', 'rounds', 'team1_total', 'team2_total')
+
+CHUNK_BYTES = 8 << 20       # حجم المقطع الذي تعالجه العملية في كل مرة
+
+# أسماء الأنواع المقبولة في الملف ("heart" أو "HEART" أو "قبة")
+SUITS = {
+    key: suit for suit in CardSuit for key in (suit.name.lower(), suit.name, suit.value)
+}
+
+
+def _suit(name) -> CardSuit:
+    try:
+        return SUITS[name]
+    except KeyError:
+        raise ValueError(f"نوع ورق غير معروف: {name}") from None
+
+
+def encode_row(row: Dict) -> Optional[int]:
+    """
+    ترميز سطر جولة مباشرة (نفس encode_round_data بدون إنشاء RoundData)
+
+    Returns:
+        الترميز، أو None إذا كانت الجولة لا يمثلها جدول النتائج
+    """
+    tricks = row.get('total_cards', 0) // ScoreCalculator.CARDS_PER_TRICK
+    diamonds = row.get('diamond_count', 0)
+    if not (0 <= tricks <= FIELD_MAX and 0 <= diamonds <= FIELD_MAX):
+        return None
+
+    present = doubled = doubled_to = 0
+    for queen in row.get('queens', ()):
+        flag = 1 << QUEEN_BITS[_suit(queen.get('suit'))]
+        if present & flag:
+            return None
+        present |= flag
+        if queen.get('is_doubled'):
+            doubled |= flag
+
+    has_king = bool(row.get('has_king_heart'))
+    if has_king:
+        present |= KING_HEART_FLAG
+        if row.get('king_heart_doubled'):
+            doubled |= KING_HEART_FLAG
+
+    for card in row.get('doubled_to_opponent', ()):
+        if card.get('rank', 'Q') == CardRank.KING.value:
+            flag = KING_HEART_FLAG
+        else:
+            flag = 1 << QUEEN_BITS[_suit(card.get('suit'))]
+        if (present | doubled_to) & flag:
+            return None
+        doubled_to |= flag
+
+    return encode_state(tricks, diamonds, present & QUEENS_MASK, has_king, doubled, doubled_to)
+
+
+def score_row_slow(row: Dict) -> int:
+    """حساب جولة خارج جدول النتائج عبر ScoreCalculator"""
+    calc = ScoreCalculator()
+    calc.set_cards_data(
+        row.get('total_cards', 0),
+        row.get('diamond_count', 0),
+        [{'suit': _suit(q.get('suit')), 'is_doubled': q.get('is_doubled', False)}
+         for q in row.get('queens', ())],
+        bool(row.get('has_king_heart'))
+    )
+    if calc.round_data.king_heart and row.get('king_heart_doubled'):
+        calc.round_data.king_heart.is_doubled = True
+    for card in row.get('doubled_to_opponent', ()):
+        if card.get('rank', 'Q') == CardRank.KING.value:
+            calc.add_doubled_to_opponent(CardRank.KING, CardSuit.HEART)
+        else:
+            calc.add_doubled_to_opponent(CardRank.QUEEN, _suit(card.get('suit')))
+    return calc.calculate_round_score()['total']
+
+
+# ==================== العمليات ====================
+
+def _init_worker(rules: str):
+    use_variant(rules)
+
+
+def score_chunk(path: str, start: int, end: int, fmt: str) -> Tuple[str, Dict, List]:
+    """
+    حساب مقطع من الملف [start, end)
+
+    Returns:
+        (النتائج منسقة، مجاميع كل لعبة في المقطع، الأخطاء [(الموقع، الرسالة)])
+    """
+    rules = active_rules()
+    table, round_total = rules.table, rules.round_total
+    out = io.StringIO()
+    writer = csv.writer(out) if fmt == 'csv' else None
+    games: Dict[str, List[int]] = {}
+    errors = []
+    loads, dumps = json.loads, json.JSONEncoder(ensure_ascii=False).encode
+
+    with open(path, 'rb') as f:
+        f.seek(start)
+        offset = start
+        for line in f.read(end - start).splitlines(keepends=True):
+            position, offset = offset, offset + len(line)
+            if not line.strip():
+                continue
+            try:
+                row = loads(line)
+                code = encode_row(row)
+                team1 = table[code] if code is not None else score_row_slow(row)
+            except (ValueError, TypeError, KeyError, AttributeError) as e:
+                errors.append((position, str(e)))
+                continue
+
+            game = str(row.get('game', ''))
+            round_number = row.get('round')
+            if writer:
+                writer.writerow((game, round_number, team1, round_total - team1, code))
+            else:
+                # نفس ROUND_FIELDS بدون بناء قاموس لكل سطر
+                out.write(f'{{"game": {dumps(game)}, "round": {dumps(round_number)}, '
+                          f'"team1": {team1}, "team2": {round_total - team1}, '
+                          f'"state": {dumps(code)}}}\n')
+
+            totals = games.get(game)
+            if totals is None:
+                totals = games[game] = [0, 0, 0]
+            totals[0] += 1
+            totals[1] += team1
+            totals[2] += round_total - team1
+
+    return out.getvalue(), games, errors
+
+
+def split_chunks(path: str, chunk_bytes: int = CHUNK_BYTES) -> Iterator[Tuple[int, int]]:
+    """تقسيم الملف إلى مقاطع تنتهي عند نهاية سطر"""
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        start = 0
+        while start < size:
+            f.seek(min(start + chunk_bytes, size))
+            f.readline()
+            end = min(f.tell(), size)
+            yield start, end
+            start = end
+
+
+def run(path: str, out, fmt: str = 'jsonl', workers: int = None,
+        chunk_bytes: int = CHUNK_BYTES, rules: str = DEFAULT_RULES) -> Tuple[Dict, List]:
+    """
+    حساب كل جولات الملف وكتابة النتائج إلى out بالترتيب
+
+    Returns:
+        (مجاميع كل لعبة {game: [rounds, team1, team2]}، الأخطاء)
+    """
+    workers = workers or os.cpu_count() or 1
+    games: Dict[str, List[int]] = {}
+    errors = []
+    if fmt == 'csv':
+        csv.writer(out).writerow(ROUND_FIELDS)
+
+    def collect(future):
+        text, chunk_games, chunk_errors = future.result()
+        out.write(text)
+        for game, (rounds, team1, team2) in chunk_games.items():
+            totals = games.setdefault(game, [0, 0, 0])
+            totals[0] += rounds
+            totals[1] += team1
+            totals[2] += team2
+        errors.extend(chunk_errors)
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(rules,)) as pool:
+        # نافذة محدودة من المقاطع قيد التنفيذ للحفاظ على الترتيب والذاكرة
+        pending = deque()
+        for start, end in split_chunks(path, chunk_bytes):
+            pending.append(pool.submit(score_chunk, path, start, end, fmt))
+            if len(pending) >= workers * 2:
+                collect(pending.popleft())
+        while pending:
+            collect(pending.popleft())
+
+    return games, errors
+
+
+def write_totals(games: Dict, out, fmt: str = 'jsonl'):
+    """كتابة مجموع كل لعبة"""
+    writer = csv.writer(out) if fmt == 'csv' else None
+    if writer:
+        writer.writerow(TOTAL_FIELDS)
+    for game, (rounds, team1, team2) in games.items():
+        if writer:
+            writer.writerow((game, rounds, team1, team2))
+        else:
+            out.write(json.dumps(dict(zip(TOTAL_FIELDS, (game, rounds, team1, team2))),
+                                 ensure_ascii=False) + '\n')
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m cc_core.batch',
+        description="حساب نقاط ملف جولات JSONL على كل الأنوية"
+    )
+    parser.add_argument('input', help="ملف الجولات (JSONL)")
+    parser.add_argument('-o', '--output', help="ملف نتائج الجولات (الافتراضي: الإخراج القياسي)")
+    parser.add_argument('--totals', help="ملف مجاميع الألعاب (الافتراضي: <output>.totals.<format>)")
+    parser.add_argument('--format', choices=('jsonl', 'csv'), default=None,
+                        help="صيغة الإخراج (الافتراضي حسب امتداد ملف الإخراج)")
+    parser.add_argument('--workers', type=int, default=None, help="عدد العمليات (الافتراضي: كل الأنوية)")
+    parser.add_argument('--chunk-mb', type=float, default=CHUNK_BYTES / (1 << 20),
+                        help="حجم المقطع لكل عملية بالميغابايت")
+    parser.add_argument('--rules', default=DEFAULT_RULES, choices=list(RULE_VARIANTS),
+                        help="نوع القواعد")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ('csv' if (args.output or '').endswith('.csv') else 'jsonl')
+    totals_path = args.totals
+    if totals_path is None and args.output:
+        totals_path = f"{os.path.splitext(args.output)[0]}.totals.{fmt}"
+
+    out = open(args.output, 'w', encoding='utf-8', newline='') if args.output else sys.stdout
+    try:
+        games, errors = run(
+            args.input, out, fmt, args.workers, int(args.chunk_mb * (1 << 20)), args.rules
+        )
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    if totals_path:
+        with open(totals_path, 'w', encoding='utf-8', newline='') as f:
+            write_totals(games, f, fmt)
+    else:
+        write_totals(games, sys.stderr, fmt)
+
+    for position, message in errors[:20]:
+        print(f"byte {position}: {message}", file=sys.stderr)
+    if errors:
+        print(f"{len(errors)} invalid rounds skipped", file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""
+بث النتائج المباشر للمشاهدين (Server-Sent Events)
+Live scoreboard feed with per-tick broadcast coalescing
+
+الطاولات تنشر نتيجة كل جولة (نفس حقول finalize_round) لكن البث لا يحدث
+فوراً: التحديثات تُجمع حتى نهاية النبضة (tick) ثم يُبنى إطار واحد لكل
+طاولة ويُرمَّز مرة واحدة ويُكتب كما هو لكل المشتركين. دفعة من N جولات
+تعطي إطاراً واحداً لكل مشترك بدل N.
+
+    GET /feed               كل الطاولات: {"tables": {"<id>": delta, ...}}
+    GET /tables/<id>/feed   طاولة واحدة: delta
+
+المشترك البطيء الذي يتجاوز مخزن الكتابة الخاص به الحد يُفصل.
+"""
+
+import asyncio
+import json
+from typing import Dict, List, Optional, Set
+
+TICK = 0.1                  # ثواني بين كل بث والذي يليه
+MAX_BUFFER = 256 * 1024     # أقصى حجم غير مرسل لكل مشترك قبل فصله
+
+# حقول الجولة نفسها (الباقي مجاميع تؤخذ من آخر نتيجة)
+ROUND_FIELDS = ('round_number', 'team1_round_score', 'team2_round_score')
+
+SSE_HEADERS = (
+    b"HTTP/1.1 200 OK\r\n"
+    b"Content-Type: text/event-stream; charset=utf-8\r\n"
+    b"Cache-Control: no-cache\r\n"
+    b"Connection: keep-alive\r\n"
+    b"\r\n"
+)
+
+
+def sse_frame(event: str, data) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode('utf-8')
+
+
+class LiveFeed:
+    """مشتركو البث والتحديثات المنتظرة حتى النبضة التالية"""
+
+    def __init__(self, tick: float = TICK, max_buffer: int = MAX_BUFFER):
+        self.tick = tick
+        self.max_buffer = max_buffer
+        self.everything: Set = set()                # مشتركو كل الطاولات
+        self.by_table: Dict[str, Set] = {}          # مشتركو طاولة واحدة
+        self._pending: Dict[str, List[Dict]] = {}   # نتائج لم تُبث بعد
+        self._timer = None
+        self.frames = 0                             # عدد الإطارات المكتوبة
+        self.dropped = 0                            # مشتركون فُصلوا لبطئهم
+
+    def __len__(self) -> int:
+        return len(self.everything) + sum(len(s) for s in self.by_table.values())
+
+    # ==================== الاشتراك ====================
+
+    def subscribe(self, writer, table_id: Optional[str] = None):
+        if table_id is None:
+            self.everything.add(writer)
+        else:
+            self.by_table.setdefault(table_id, set()).add(writer)
+
+    def unsubscribe(self, writer, table_id: Optional[str] = None):
+        if table_id is None:
+            self.everything.discard(writer)
+        else:
+            subscribers = self.by_table.get(table_id)
+            if subscribers is not None:
+                subscribers.discard(writer)
+                if not subscribers:
+                    del self.by_table[table_id]
+
+    # ==================== النشر ====================
+
+    def publish(self, table_id: str, result: Dict):
+        """تسجيل نتيجة جولة أو تعديل؛ البث في نهاية النبضة"""
+        self._pending.setdefault(table_id, []).append(result)
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.tick, self.flush)
+
+    @staticmethod
+    def delta(results: List[Dict]) -> Dict:
+        """دمج نتائج النبضة لطاولة: المجاميع من آخر نتيجة + قائمة الجولات"""
+        delta = dict(results[-1])
+        delta.pop('deleted_round', None)
+        delta.pop('edited_round', None)
+        rounds = delta['rounds'] = []
+        for r in results:
+            if 'deleted_round' in r:
+                rounds.append({'round_number': r['deleted_round'], 'deleted': True})
+            elif 'edited_round' in r:
+                # الجولة موجودة عند المشترك: يستبدل صفها بدل إضافة صف جديد
+                rounds.append({**{key: r[key] for key in ROUND_FIELDS}, 'edited': True})
+            else:
+                rounds.append({key: r[key] for key in ROUND_FIELDS})
+        return delta
+
+    def flush(self):
+        """بث كل ما تجمع منذ النبضة السابقة (إطار واحد لكل مشترك)"""
+        self._timer = None
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+
+        deltas = {table_id: self.delta(results) for table_id, results in pending.items()}
+
+        if self.everything:
+            self._send(self.everything, sse_frame('delta', {'tables': deltas}))
+        for table_id, delta in deltas.items():
+            subscribers = self.by_table.get(table_id)
+            if subscribers:
+                self._send(subscribers, sse_frame('delta', delta))
+
+    def _send(self, subscribers: Set, frame: bytes):
+        slow = []
+        for writer in subscribers:
+            transport = writer.transport
+            if transport.is_closing() or transport.get_write_buffer_size() > self.max_buffer:
+                slow.append(writer)
+                continue
+            transport.write(frame)
+        self.frames += len(subscribers) - len(slow)
+        for writer in slow:
+            subscribers.discard(writer)
+            writer.close()
+            self.dropped += 1
+
+    def close(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for writer in list(self.everything):
+            writer.close()
+        for subscribers in self.by_table.values():
+            for writer in list(subscribers):
+                writer.close()
+        self.everything.clear()
+        self.by_table.clear()
+
+    # ==================== الاتصال ====================
+
+    async def stream(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                     table_id: Optional[str] = None, snapshot: Optional[Dict] = None):
+        """إبقاء اتصال SSE مفتوحاً حتى يغلقه المشترك"""
+        writer.write(SSE_HEADERS)
+        if snapshot is not None:
+            writer.write(sse_frame('snapshot', snapshot))
+        self.subscribe(writer, table_id)
+        try:
+            while await reader.read(1024):
+                pass  # المشترك لا يرسل شيئاً؛ انتهاء القراءة = إغلاق الاتصال
+        except ConnectionError:
+            pass
+        finally:
+            self.unsubscribe(writer, table_id)
@@ -0,0 +1,250 @@
+"""
+سجل أحداث اللعبة مع لقطات دورية للاستئناف السريع
+Event-sourced Game Log with periodic snapshots
+
+كل لعبة في مجلد خاص:
+    <root>/<game_id>/events.jsonl   أحداث تُضاف فقط (سطر JSON لكل حدث)
+    <root>/<game_id>/snapshot.json  آخر لقطة للحالة + موقعها في ملف الأحداث
+    <root>/current                   معرّف اللعبة الحالية
+
+الاستئناف يقرأ اللقطة ثم يعيد تطبيق الأحداث التي بعدها فقط،
+ولا يمر على بقية الألعاب المؤرشفة.
+"""
+
+import json
+import os
+import time
+import uuid
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional
+
+from .rules import active as active_rules
+
+# أنواع الأحداث
+GAME_RESET = 'game_reset'
+ROUND_FINALIZED = 'round_finalized'
+ROUND_EDITED = 'round_edited'
+ROUND_DELETED = 'round_deleted'
+
+EVENTS_FILE = 'events.jsonl'
+SNAPSHOT_FILE = 'snapshot.json'
+CURRENT_FILE = 'current'
+
+
+@dataclass
+class GameState:
+    """حالة اللعبة كما تُبنى من الأحداث"""
+    game_id: str = ''
+    team1_name: str = 'فريقنا'
+    team2_name: str = 'الخصم'
+    team1_total: int = 0
+    team2_total: int = 0
+    round_number: int = 0
+    history: List[Dict] = field(default_factory=list)
+
+    def apply(self, event: Dict):
+        """تطبيق حدث واحد على الحالة"""
+        kind = event['type']
+
+        if kind == GAME_RESET:
+            self.team1_name = event.get('team1_name', self.team1_name)
+            self.team2_name = event.get('team2_name', self.team2_name)
+            self.team1_total = 0
+            self.team2_total = 0
+            self.round_number = 0
+            self.history = []
+
+        elif kind == ROUND_FINALIZED:
+            entry = dict(event['entry'])
+            self.history.append(entry)
+            self.team1_total += entry['team1']
+            self.team2_total += entry['team2']
+            self.round_number = entry['round']
+
+        elif kind == ROUND_EDITED:
+            for entry in reversed(self.history):
+                if entry['round'] == event['round']:
+                    self.team1_total += event['team1'] - entry['team1']
+                    self.team2_total += event['team2'] - entry['team2']
+                    entry['team1'] = event['team1']
+                    entry['team2'] = event['team2']
+                    if 'state' in event:
+                        entry['state'] = event['state']
+                    else:
+                        entry.pop('state', None)
+                    break
+
+        elif kind == ROUND_DELETED:
+            for i in range(len(self.history) - 1, -1, -1):
+                entry = self.history[i]
+                if entry['round'] == event['round']:
+                    self.team1_total -= entry['team1']
+                    self.team2_total -= entry['team2']
+                    del self.history[i]
+                    break
+
+        else:
+            raise ValueError(f"نوع حدث غير معروف: {kind}")
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'GameState':
+        return cls(**data)
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class GameLog:
+    """سجل أحداث اللعبة الحالية مع أرشيف الألعاب السابقة"""
+
+    SNAPSHOT_EVERY = 32     # عدد الأحداث بين كل لقطتين
+
+    def __init__(self, root: str, fsync: bool = True):
+        self.root = root
+        self.fsync = fsync
+        self.state = None
+        self._file = None
+        self._since_snapshot = 0
+        os.makedirs(root, exist_ok=True)
+
+    # ==================== المسارات ====================
+
+    def _game_dir(self, game_id: str) -> str:
+        return os.path.join(self.root, game_id)
+
+    def _events_path(self, game_id: str) -> str:
+        return os.path.join(self._game_dir(game_id), EVENTS_FILE)
+
+    def _snapshot_path(self, game_id: str) -> str:
+        return os.path.join(self._game_dir(game_id), SNAPSHOT_FILE)
+
+    # ==================== بدء واستئناف ====================
+
+    def start_game(self, team1_name: str, team2_name: str) -> GameState:
+        """بدء لعبة جديدة (اللعبة السابقة تبقى في الأرشيف)"""
+        self.close()
+        game_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        os.makedirs(self._game_dir(game_id), exist_ok=True)
+
+        self.state = GameState(game_id=game_id)
+        self._open(game_id)
+        self._write_atomic(os.path.join(self.root, CURRENT_FILE), game_id)
+
+        self.append({
+            'type': GAME_RESET,
+            'team1_name': team1_name,
+            'team2_name': team2_name,
+        })
+        return self.state
+
+    def resume(self) -> Optional[GameState]:
+        """
+        استئناف اللعبة الحالية من آخر لقطة وما بعدها من أحداث
+
+        Returns:
+            حالة اللعبة، أو None إذا لم توجد لعبة محفوظة
+        """
+        self.close()
+        try:
+            with open(os.path.join(self.root, CURRENT_FILE), encoding='utf-8') as f:
+                game_id = f.read().strip()
+        except OSError:
+            return None
+        if not game_id or not os.path.exists(self._events_path(game_id)):
+            return None
+
+        state, offset = GameState(game_id=game_id), 0
+        try:
+            with open(self._snapshot_path(game_id), encoding='utf-8') as f:
+                snapshot = json.load(f)
+            state, offset = GameState.from_dict(snapshot['state']), snapshot['offset']
+        except (OSError, ValueError, KeyError, TypeError):
+            pass  # لا توجد لقطة صالحة - إعادة تطبيق كل الأحداث
+
+        # إعادة تطبيق الذيل فقط
+        replayed = 0
+        with open(self._events_path(game_id), 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # سطر مقطوع بسبب إغلاق مفاجئ
+                offset += len(line)
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    # سطر كامل تالف: يُتخطى والأحداث بعده تبقى
+                    print(f"Game log error: سطر تالف عند {offset - len(line)}")
+                    continue
+                state.apply(event)
+                replayed += 1
+
+        # حذف أي سطر مقطوع في النهاية قبل متابعة الكتابة
+        if os.path.getsize(self._events_path(game_id)) != offset:
+            with open(self._events_path(game_id), 'r+b') as f:
+                f.truncate(offset)
+
+        self.state = state
+        self._open(game_id)
+        self._since_snapshot = replayed
+        return state
+
+    # ==================== الأحداث ====================
+
+    def append(self, event: Dict):
+        """إضافة حدث إلى نهاية السجل وتطبيقه على الحالة"""
+        if self._file is None:
+            raise RuntimeError("لا توجد لعبة مفتوحة")
+        self._file.write(json.dumps(event, ensure_ascii=False).encode('utf-8') + b'\n')
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self.state.apply(event)
+
+        self._since_snapshot += 1
+        if self._since_snapshot >= self.SNAPSHOT_EVERY:
+            self.snapshot()
+
+    def round_finalized(self, entry: Dict):
+        self.append({'type': ROUND_FINALIZED, 'entry': entry})
+
+    def round_edited(self, round_number: int, team1: int, team2: int = None, state: int = None):
+        if team2 is None:
+            team2 = active_rules().round_total - team1
+        event = {'type': ROUND_EDITED, 'round': round_number, 'team1': team1, 'team2': team2}
+        if state is not None:
+            event['state'] = state
+        self.append(event)
+
+    def round_deleted(self, round_number: int):
+        self.append({'type': ROUND_DELETED, 'round': round_number})
+
+    def snapshot(self):
+        """حفظ لقطة للحالة الحالية مع موقعها في ملف الأحداث"""
+        if self._file is None:
+            return
+        self._write_atomic(self._snapshot_path(self.state.game_id), json.dumps({
+            'offset': self._file.tell(),
+            'state': self.state.to_dict(),
+        }, ensure_ascii=False))
+        self._since_snapshot = 0
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    # ==================== مساعدات ====================
+
+    def _open(self, game_id: str):
+        self._file = open(self._events_path(game_id), 'ab')
+        self._since_snapshot = 0
+
+    def _write_atomic(self, path: str, text: str):
+        """كتابة ملف كاملاً أو لا شيء (عبر ملف مؤقت)"""
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
@@ -0,0 +1,245 @@
+"""
+تخزين مضغوط للجولات
+Compact Round Records - one 32-bit integer per round
+
+بتات السجل:
+    0  - 17 : ترميز حالة الجولة (encode_state في cc_core.rules)
+    18 - 31 : رقم الجولة
+
+الجولة المعدلة يدوياً (edit_round) ليس لها ترميز: تُخزن نتيجتها بجانب
+السجل (الترميز 0) وتُعاد في to_history بدون 'state'.
+"""
+
+from array import array
+from typing import Dict, Iterable, List, Optional
+
+from .rules import (
+    active as active_rules,
+    CARD_KEYS, CARD_PRESENT, CARD_PRESENT_DOUBLED, CARD_DOUBLED_TO_OPPONENT,
+    DIAMONDS_SHIFT, CARDS_SHIFT, FIELD_MAX, KING_HEART_BIT, STATE_SPACE,
+)
+from .scoring import (
+    RoundData, SpecialCard, CardRank, CardSuit, QUEEN_BITS,
+    ScoreCalculator, encode_round_data,
+)
+
+ROUND_SHIFT = 18
+MAX_ROUND = (1 << (32 - ROUND_SHIFT)) - 1
+STATE_MASK = STATE_SPACE - 1
+
+
+def pack_round(round_number: int, state: int) -> int:
+    """دمج رقم الجولة وترميزها في عدد 32 بت"""
+    if not 0 <= round_number <= MAX_ROUND:
+        raise ValueError(f"رقم الجولة يجب أن يكون بين 0 و {MAX_ROUND}")
+    if not 0 <= state < STATE_SPACE:
+        raise ValueError("ترميز الجولة غير صالح")
+    return (round_number << ROUND_SHIFT) | state
+
+
+class CompactRound:
+    """عرض لقراءة حقول جولة مخزنة في عدد صحيح واحد"""
+
+    __slots__ = ('record', 'score')
+
+    def __init__(self, record: int, score: Optional[int] = None):
+        self.record = record
+        self.score = score      # نتيجة الفريق الأول لجولة معدلة بدون ترميز
+
+    # ==================== الحقول ====================
+
+    @property
+    def round_number(self) -> int:
+        return self.record >> ROUND_SHIFT
+
+    @property
+    def state(self) -> int:
+        """ترميز الجولة (فهرس جدول النتائج)"""
+        return self.record & STATE_MASK
+
+    @property
+    def tricks(self) -> int:
+        return self.record & FIELD_MAX
+
+    @property
+    def diamonds(self) -> int:
+        return (self.record >> DIAMONDS_SHIFT) & FIELD_MAX
+
+    def card_state(self, bit: int) -> int:
+        """حالة البطاقة الخاصة (CARD_ABSENT ... CARD_DOUBLED_TO_OPPONENT)"""
+        return (self.record >> (CARDS_SHIFT + 2 * bit)) & 3
+
+    def _keys(self, *states) -> List[str]:
+        return [key for bit, key in enumerate(CARD_KEYS) if self.card_state(bit) in states]
+
+    @property
+    def queens(self) -> List[str]:
+        """البنات الموجودة ('spade', 'heart', ...)"""
+        return [
+            key[2:] for key in self._keys(CARD_PRESENT, CARD_PRESENT_DOUBLED)
+            if key.startswith('Q_')
+        ]
+
+    @property
+    def has_king_heart(self) -> bool:
+        return self.card_state(KING_HEART_BIT) in (CARD_PRESENT, CARD_PRESENT_DOUBLED)
+
+    @property
+    def opponent_doubled(self) -> List[str]:
+        """مفاتيح البطاقات الموجودة التي دبّلها الخصم"""
+        return self._keys(CARD_PRESENT_DOUBLED)
+
+    @property
+    def my_doubled(self) -> List[str]:
+        """مفاتيح البطاقات التي دبّلها الفريق للخصم"""
+        return self._keys(CARD_DOUBLED_TO_OPPONENT)
+
+    @property
+    def team1_score(self) -> int:
+        if self.score is not None:
+            return self.score
+        return active_rules().score(self.state)
+
+    @property
+    def team2_score(self) -> int:
+        return active_rules().round_total - self.team1_score
+
+    def __int__(self) -> int:
+        return self.record
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, CompactRound) and other.record == self.record
+                and other.score == self.score)
+
+    def __hash__(self) -> int:
+        return hash((self.record, self.score))
+
+    def __repr__(self) -> str:
+        return (f"CompactRound(round={self.round_number}, tricks={self.tricks}, "
+                f"diamonds={self.diamonds}, queens={self.queens}, "
+                f"king={self.has_king_heart}, score={self.team1_score})")
+
+    # ==================== التحويلات ====================
+
+    @classmethod
+    def from_round_data(cls, data: RoundData, round_number: int = 0) -> 'CompactRound':
+        """
+        ضغط RoundData
+
+        عدد الأوراق يُخزن كعدد أكلات، لذلك يُسترجع كمضاعف لـ 4
+        """
+        state = encode_round_data(data)
+        if state is None:
+            raise ValueError("بيانات الجولة لا يمكن ضغطها")
+        return cls(pack_round(round_number, state))
+
+    def to_round_data(self) -> RoundData:
+        """استرجاع RoundData كاملة من السجل"""
+        data = RoundData(
+            total_cards=self.tricks * ScoreCalculator.CARDS_PER_TRICK,
+            diamond_count=self.diamonds
+        )
+        for suit, bit in QUEEN_BITS.items():
+            state = self.card_state(bit)
+            if state in (CARD_PRESENT, CARD_PRESENT_DOUBLED):
+                data.queens.append(SpecialCard(
+                    rank=CardRank.QUEEN,
+                    suit=suit,
+                    is_doubled=state == CARD_PRESENT_DOUBLED
+                ))
+            elif state == CARD_DOUBLED_TO_OPPONENT:
+                data.doubled_to_opponent.append(
+                    SpecialCard(rank=CardRank.QUEEN, suit=suit, is_doubled=True)
+                )
+
+        state = self.card_state(KING_HEART_BIT)
+        if state in (CARD_PRESENT, CARD_PRESENT_DOUBLED):
+            data.king_heart = SpecialCard(
+                rank=CardRank.KING,
+                suit=CardSuit.HEART,
+                is_doubled=state == CARD_PRESENT_DOUBLED
+            )
+        elif state == CARD_DOUBLED_TO_OPPONENT:
+            data.doubled_to_opponent.append(
+                SpecialCard(rank=CardRank.KING, suit=CardSuit.HEART, is_doubled=True)
+            )
+        return data
+
+    @classmethod
+    def from_history(cls, entry: Dict) -> 'CompactRound':
+        """ضغط قيد من سجل التطبيق (app.history)"""
+        if entry.get('state') is None:
+            return cls(pack_round(entry['round'], 0), entry['team1'])
+        record = cls(pack_round(entry['round'], entry['state']))
+        if record.team1_score != entry['team1']:
+            raise ValueError(f"نتيجة الجولة {entry['round']} لا تطابق ترميزها")
+        return record
+
+    def to_history(self) -> Dict:
+        """قيد بنفس شكل app.history"""
+        team1 = self.team1_score
+        entry = {
+            'round': self.round_number,
+            'team1': team1,
+            'team2': active_rules().round_total - team1,
+        }
+        if self.score is None:
+            entry['state'] = self.state
+        return entry
+
+
+class CompactHistory:
+    """سجل جولات مضغوط: 4 بايت لكل جولة (ونتائج الجولات المعدلة يدوياً)"""
+
+    def __init__(self, records: Iterable[int] = ()):
+        self.records = array('I', records)
+        self.scores: Dict[int, int] = {}    # رقم السجل -> نتيجة جولة بدون ترميز
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, index: int) -> CompactRound:
+        if index < 0:
+            index += len(self.records)
+        return CompactRound(self.records[index], self.scores.get(index))
+
+    def __iter__(self):
+        if not self.scores:
+            return map(CompactRound, self.records)
+        return (CompactRound(r, self.scores.get(i)) for i, r in enumerate(self.records))
+
+    def append(self, round_number: int, state: int, score: Optional[int] = None):
+        """score بدل state لجولة معدلة يدوياً"""
+        if score is not None:
+            self.scores[len(self.records)] = score
+            state = 0
+        self.records.append(pack_round(round_number, state))
+
+    def totals(self):
+        """مجموع نقاط الفريقين"""
+        rules = active_rules()
+        team1 = sum(rules.table[r & STATE_MASK] for r in self.records)
+        for index, score in self.scores.items():
+            team1 += score - rules.table[self.records[index] & STATE_MASK]
+        return team1, len(self.records) * rules.round_total - team1
+
+    @classmethod
+    def from_history(cls, history: Iterable[Dict]) -> 'CompactHistory':
+        compact = cls()
+        for entry in history:
+            record = CompactRound.from_history(entry)
+            compact.append(record.round_number, record.state, record.score)
+        return compact
+
+    def to_history(self) -> List[Dict]:
+        return [r.to_history() for r in self]
+
+    def tobytes(self) -> bytes:
+        """السجلات فقط: نتائج الجولات المعدلة يدوياً لا تُحفظ هنا"""
+        return self.records.tobytes()
+
+    @classmethod
+    def frombytes(cls, data: bytes) -> 'CompactHistory':
+        history = cls()
+        history.records.frombytes(data)
+        return history
@@ -0,0 +1,74 @@
+"""
+تقارير نقاط الجولة
+Score Reports - plain text formatting for the console and batch jobs
+"""
+
+from typing import Dict
+
+from .rules import active as active_rules
+
+
+def format_score_report(score_details: Dict, round_result: Dict = None) -> str:
+    """
+    تنسيق تقرير النقاط للعرض
+    
+    Args:
+        score_details: تفاصيل النقاط من calculate_round_score
+        round_result: نتيجة الجولة من finalize_round (اختياري)
+    
+    Returns:
+        نص منسق للعرض
+    """
+    lines = [
+        "═" * 40,
+        "📊 تقرير نقاط الجولة",
+        "═" * 40,
+        "",
+        f"🃏 الأكلات: {score_details['tricks']['count']} أكلة",
+        f"   النقاط: {score_details['tricks']['points']}",
+        "",
+        f"♦️ الديناري: {score_details['diamonds']['count']} ورقة",
+        f"   النقاط: {score_details['diamonds']['points']}",
+        "",
+        f"👸 البنات: {', '.join(score_details['queens']['cards']) or 'لا يوجد'}",
+        f"   النقاط: {score_details['queens']['points']}",
+        "",
+    ]
+    
+    if score_details['king_heart']['exists']:
+        doubled_text = " (مدبل)" if score_details['king_heart']['doubled'] else ""
+        lines.extend([
+            f"👑 شيخ القبة: موجود{doubled_text}",
+            f"   النقاط: {score_details['king_heart']['points']}",
+            "",
+        ])
+    
+    if score_details['doubled_bonus']['points'] > 0:
+        lines.extend([
+            f"✨ مكافأة التدبيل للخصم:",
+            f"   البطاقات: {', '.join(score_details['doubled_bonus']['cards'])}",
+            f"   النقاط: +{score_details['doubled_bonus']['points']}",
+            "",
+        ])
+    
+    lines.extend([
+        "─" * 40,
+        f"📌 نقاط فريقك: {score_details['total']}",
+    ])
+    
+    # إضافة نقاط الفريق الثاني إذا توفرت
+    if round_result:
+        lines.extend([
+            f"📌 نقاط الخصم: {round_result['team2_round_score']}",
+            f"   (المجموع = {active_rules().round_total})",
+            "",
+            "═" * 40,
+            f"🏆 الجولة رقم: {round_result['round_number']}",
+            f"📊 مجموعك الكلي: {round_result['team1_total']}",
+            f"📊 مجموع الخصم: {round_result['team2_total']}",
+            f"📊 المجموع المتوقع: {round_result['expected_total']}",
+        ])
+    
+    lines.append("═" * 40)
+    
+    return "\n".join(lines)
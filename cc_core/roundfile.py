@@ -0,0 +1,343 @@
+"""
+ملف جولات ثابت العرض للتحليل
+Fixed-width round file - memory-mapped NumPy records
+
+الملف ترويسة من 16 بايت ثم سجلات متتالية بنفس البنية (round_dtype):
+
+    game     uint32   رقم اللعبة (ترتيبها في الملف)
+    created  uint32   وقت الجولة (ثواني يونكس)
+    state    int32    ترميز الجولة (encode_state)، أو -1 إذا لم يُحفظ
+    round    uint16   رقم الجولة
+    team1    int16    نقاط الفريق الأول
+    team2    int16    نقاط الفريق الثاني
+
+أسماء الألعاب والفرق في ملف جانبي <path>.games.json بنفس ترتيب أرقامها.
+الألعاب تُضاف بالترتيب الزمني، فعمودا game و created مرتبان ويكفي بحث
+ثنائي لقص لعبة أو نطاق زمني كعرض (view) على الذاكرة المربوطة بدون نسخ.
+
+NumPy مطلوب للقراءة والكتابة فقط ويُستورد عند الحاجة.
+
+    python -m cc_core.roundfile rounds.ccr --game-log games/ --web dump.json
+"""
+
+import argparse
+import bisect
+import json
+import mmap
+import os
+import struct
+import time
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+
+from .game_log import EVENTS_FILE, GameState
+
+MAGIC = b'CCRF'
+VERSION = 1
+HEADER = struct.Struct('<4sHH8x')     # السحر، الإصدار، حجم السجل
+HEADER_SIZE = HEADER.size
+NO_STATE = -1
+
+ROUND_FIELDS = [
+    ('game', '<u4'),
+    ('created', '<u4'),
+    ('state', '<i4'),
+    ('round', '<u2'),
+    ('team1', '<i2'),
+    ('team2', '<i2'),
+]
+RECORD_SIZE = 18
+
+# لعبة جاهزة للكتابة: (المعرّف، الفريق الأول، الفريق الثاني، السجل، وقت البدء)
+Game = Tuple[str, str, str, List[Dict], float]
+
+
+def round_dtype():
+    """بنية السجل في NumPy (بدون حشو)"""
+    import numpy as np
+    return np.dtype(ROUND_FIELDS)
+
+
+def games_path(path: str) -> str:
+    return path + '.games.json'
+
+
+def _read_header(f) -> int:
+    magic, version, itemsize = HEADER.unpack(f.read(HEADER_SIZE))
+    if magic != MAGIC or version != VERSION or itemsize != RECORD_SIZE:
+        raise ValueError(f"ليس ملف جولات صالحاً: {f.name}")
+    return itemsize
+
+
+def _load_games(path: str) -> List[Dict]:
+    try:
+        with open(games_path(path), encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return []
+
+
+# ==================== الكتابة ====================
+
+class RoundFileWriter:
+    """إضافة ألعاب كاملة إلى نهاية ملف الجولات"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.games = _load_games(path)
+        self._ids = {g['id']: i for i, g in enumerate(self.games)}
+        self._last_created = 0
+
+        if os.path.exists(path):
+            self._file = open(path, 'r+b')
+            _read_header(self._file)
+            size = self._file.seek(0, os.SEEK_END)
+            if (size - HEADER_SIZE) % RECORD_SIZE:
+                raise ValueError(f"ملف الجولات مقطوع: {path}")
+            if size > HEADER_SIZE:
+                self._file.seek(size - RECORD_SIZE + 4)
+                self._last_created = struct.unpack('<I', self._file.read(4))[0]
+                self._file.seek(size)
+        else:
+            self._file = open(path, 'wb')
+            self._file.write(HEADER.pack(MAGIC, VERSION, RECORD_SIZE))
+
+    def add_game(self, game_id: str, team1_name: str, team2_name: str,
+                 history: List[Dict], started_at: float = None) -> int:
+        """
+        إضافة لعبة بسجلها (بشكل app.history)
+
+        Returns:
+            رقم اللعبة في الملف
+        """
+        import numpy as np
+
+        if game_id in self._ids:
+            raise ValueError(f"اللعبة {game_id} موجودة في الملف")
+        started_at = int(started_at if started_at is not None else time.time())
+
+        index, last = len(self.games), self._last_created
+        rows = []
+        for entry in history:
+            created = int(entry.get('created_at', started_at))
+            if created < last:
+                raise ValueError(f"اللعبة {game_id} أقدم من آخر جولة في الملف")
+            team1, team2 = entry['team1'], entry['team2']
+            if not (-32768 <= team1 < 32768 and -32768 <= team2 < 32768):
+                raise ValueError(f"نقاط خارج المدى في الجولة {entry['round']}")
+            state = entry.get('state')
+            rows.append((index, created, NO_STATE if state is None else state,
+                         entry['round'], team1, team2))
+            last = created
+
+        records = np.array(rows, round_dtype())
+        self._file.write(records.tobytes())
+        self.games.append({'id': game_id, 'team1_name': team1_name,
+                           'team2_name': team2_name, 'started_at': started_at})
+        self._ids[game_id] = index
+        self._last_created = last
+        return index
+
+    def add_games(self, games: Iterable[Game]) -> int:
+        """إضافة ألعاب من أحد المحوّلات (بالترتيب الزمني)"""
+        count = 0
+        for game in sorted(games, key=lambda g: g[4]):
+            self.add_game(*game)
+            count += 1
+        return count
+
+    def close(self):
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        tmp = games_path(self.path) + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.games, f, ensure_ascii=False)
+        os.replace(tmp, games_path(self.path))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ==================== القراءة ====================
+
+class RoundFile:
+    """
+    قراءة ملف الجولات عبر mmap
+
+    records مصفوفة NumPy على الذاكرة المربوطة نفسها، وكل ما تعيده game و
+    between شرائح منها. يجب ترك هذه العروض قبل close.
+    """
+
+    def __init__(self, path: str):
+        import numpy as np
+
+        self.path = path
+        with open(path, 'rb') as f:
+            _read_header(f)
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        count = (len(self._mmap) - HEADER_SIZE) // RECORD_SIZE
+        self.records = np.frombuffer(self._mmap, round_dtype(), count, HEADER_SIZE)
+        self.games = _load_games(path)
+        self._ids = {g['id']: i for i, g in enumerate(self.games)}
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def game_number(self, game: Union[int, str]) -> int:
+        return game if isinstance(game, int) else self._ids[game]
+
+    def game(self, game: Union[int, str]):
+        """جولات لعبة واحدة (رقمها أو معرّفها)"""
+        number = self.game_number(game)
+        return self._slice('game', number, number + 1)
+
+    def between(self, since: float, until: float):
+        """الجولات التي since <= created < until"""
+        return self._slice('created', int(since), int(until))
+
+    def _slice(self, column: str, lo: int, hi: int):
+        # بحث ثنائي على العمود مباشرة؛ searchsorted على عمود غير متصل ينسخه كاملاً
+        values = self.records[column]
+        return self.records[bisect.bisect_left(values, lo):bisect.bisect_left(values, hi)]
+
+    def history(self, game: Union[int, str]) -> List[Dict]:
+        """جولات لعبة بشكل app.history"""
+        history = []
+        for record in self.game(game).tolist():
+            _, _, state, round_number, team1, team2 = record
+            entry = {'round': round_number, 'team1': team1, 'team2': team2}
+            if state != NO_STATE:
+                entry['state'] = state
+            history.append(entry)
+        return history
+
+    def close(self):
+        self.records = None
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ==================== المحوّلات ====================
+
+def _load_json(source):
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding='utf-8') as f:
+            return json.load(f)
+    return source
+
+
+def _started_from_id(game_id: str, default: float) -> float:
+    """وقت البدء من معرّف GameLog (YYYYmmdd-HHMMSS-xxxxxx)"""
+    try:
+        return time.mktime(time.strptime(game_id[:15], '%Y%m%d-%H%M%S'))
+    except ValueError:
+        return default
+
+
+def history_games(source, game_id: str = None, started_at: float = None) -> Iterator[Game]:
+    """
+    ألعاب من سجل JSON كما يكتبه DoublingScreen._calculate (app.history)
+
+    Args:
+        source: مسار ملف أو كائن محمّل: قائمة قيود، أو حالة GameState
+            (to_dict)، أو لقطة snapshot.json، أو قائمة من هذه الحالات
+    """
+    data = _load_json(source)
+    if started_at is None:
+        started_at = os.path.getmtime(source) if isinstance(source, str) else time.time()
+
+    if isinstance(data, dict):
+        data = [data.get('state', data)]
+    elif data and isinstance(data[0], dict) and 'round' in data[0]:
+        data = [{'history': data}]
+
+    for i, state in enumerate(data):
+        gid = state.get('game_id') or game_id or f"history-{int(started_at)}-{i}"
+        yield (gid, state.get('team1_name', 'فريقنا'), state.get('team2_name', 'الخصم'),
+               state['history'], _started_from_id(gid, started_at))
+
+
+def game_log_games(root: str) -> Iterator[Game]:
+    """كل الألعاب في مجلد GameLog (إعادة تطبيق أحداث كل لعبة)"""
+    for game_id in sorted(os.listdir(root)):
+        events = os.path.join(root, game_id, EVENTS_FILE)
+        if not os.path.isfile(events):
+            continue
+        state = GameState(game_id=game_id)
+        with open(events, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # سطر مقطوع بسبب إغلاق مفاجئ
+                state.apply(json.loads(line))
+        if state.history:
+            yield (game_id, state.team1_name, state.team2_name, state.history,
+                   _started_from_id(game_id, os.path.getmtime(events)))
+
+
+def web_games(source, game_id: str = None, started_at: float = None) -> Iterator[Game]:
+    """
+    لعبة من تفريغ localStorage['ccCounter'] في تطبيق الويب
+
+    Args:
+        source: مسار ملف، أو نص JSON، أو الكائن gameState نفسه، أو قائمة منها
+    """
+    if isinstance(source, str) and source.lstrip()[:1] in ('{', '['):
+        data = json.loads(source)
+        started_at = started_at if started_at is not None else time.time()
+    else:
+        data = _load_json(source)
+        if started_at is None:
+            started_at = os.path.getmtime(source) if isinstance(source, str) else time.time()
+
+    for i, state in enumerate(data if isinstance(data, list) else [data]):
+        if isinstance(state, str):
+            state = json.loads(state)   # القيمة كما هي في localStorage
+        history = [
+            {'round': e['round'], 'team1': e['team1'], 'team2': e['team2']}
+            for e in state.get('history', [])
+        ]
+        if history:
+            yield (game_id or f"web-{int(started_at)}-{i}",
+                   state.get('team1Name', 'فريقنا'), state.get('team2Name', 'الخصم'),
+                   history, started_at)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m cc_core.roundfile',
+                                     description="تحويل سجلات الألعاب إلى ملف جولات ثابت العرض")
+    parser.add_argument('output', help="ملف الجولات (يُنشأ أو يُضاف إليه)")
+    parser.add_argument('--history', nargs='*', default=[], help="ملفات JSON بشكل app.history")
+    parser.add_argument('--game-log', nargs='*', default=[], help="مجلدات GameLog")
+    parser.add_argument('--web', nargs='*', default=[], help="تفريغات localStorage['ccCounter']")
+    args = parser.parse_args(argv)
+
+    games = []
+    for path in args.history:
+        games.extend(history_games(path))
+    for root in args.game_log:
+        games.extend(game_log_games(root))
+    for path in args.web:
+        games.extend(web_games(path))
+
+    try:
+        with RoundFileWriter(args.output) as writer:
+            added = writer.add_games(games)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    with RoundFile(args.output) as rounds:
+        print(f"{added} games added; {len(rounds.games)} games, {len(rounds)} rounds in {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
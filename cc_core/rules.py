@@ -0,0 +1,249 @@
+"""
+محرك قواعد العدّ
+Rules Engine - compiles the point table into lookup tables once
+
+جدول النقاط (POINTS) يُحوَّل مرة واحدة إلى جدول نتائج لكل
+حالات الجولة الممكنة، فيصبح حساب أي جولة فهرسة واحدة في مصفوفة.
+تغيير القواعد يعيد البناء فقط ولا يبطئ حساب الجولات.
+"""
+
+from array import array
+from typing import Dict, Iterable, Optional, Tuple
+
+# نقاط اللعبة
+POINTS = {
+    'trick': 15,        # نقاط الأكلة
+    'diamond': 10,      # نقاط الديناري
+    'queen': 25,        # نقاط البنت
+    'king_heart': 75,   # نقاط شيخ القبة
+    'round_total': -500 # مجموع الجولة
+}
+
+# أنواع القواعد المتاحة (المحرك يعيد البناء عند التبديل فقط)
+RULE_VARIANTS = {
+    'standard': POINTS,
+}
+DEFAULT_RULES = 'standard'
+
+# ترتيب البطاقات الخاصة داخل الأقنعة الثنائية (bitmask)
+KING_HEART_BIT = 4
+KING_HEART_FLAG = 1 << KING_HEART_BIT
+QUEENS_MASK = 0b01111
+ALL_CARDS_MASK = 0b11111
+
+# مفاتيح البطاقات كما تستخدمها الواجهة ("Q_spade", "K_heart") مرتبة حسب البت
+CARD_KEYS = ('Q_spade', 'Q_diamond', 'Q_heart', 'Q_club', 'K_heart')
+
+# حالة كل بطاقة خاصة في ترميز الجولة (بتان لكل بطاقة)
+CARD_ABSENT = 0               # غير موجودة
+CARD_PRESENT = 1              # موجودة
+CARD_PRESENT_DOUBLED = 2      # موجودة ودبّلها الخصم
+CARD_DOUBLED_TO_OPPONENT = 3  # ناقصة ودبّلها الفريق للخصم
+
+# ترميز الجولة: الأكلات (4 بتات) | الديناري (4 بتات) | حالات البطاقات (10 بتات)
+DIAMONDS_SHIFT = 4
+CARDS_SHIFT = 8
+FIELD_MAX = 15
+STATE_SPACE = 1 << 18
+
+REQUIRED_POINTS = ('trick', 'diamond', 'queen', 'king_heart', 'round_total')
+
+
+def mask_from_keys(keys: Iterable[str]) -> int:
+    """تحويل مفاتيح البطاقات ("Q_heart", "K_heart") إلى قناع ثنائي"""
+    mask = 0
+    for key in keys:
+        mask |= 1 << CARD_KEYS.index(key)
+    return mask
+
+
+def encode_state(tricks: int, diamonds: int, queens: int, has_king_heart: bool,
+                 doubled: int = 0, doubled_to_opponent: int = 0) -> int:
+    """
+    ترميز حالة الجولة في عدد صحيح واحد يُستخدم فهرساً في جدول النتائج
+
+    Args:
+        tricks: عدد الأكلات (0 - 15)
+        diamonds: عدد أوراق الديناري (0 - 15)
+        queens: قناع البنات الموجودة
+        has_king_heart: هل يوجد شيخ القبة
+        doubled: قناع البطاقات الموجودة التي دبّلها الخصم
+        doubled_to_opponent: قناع البطاقات الناقصة التي دبّلها الفريق للخصم
+
+    Returns:
+        ترميز الجولة (أقل من STATE_SPACE)
+    """
+    if not (0 <= tricks <= FIELD_MAX and 0 <= diamonds <= FIELD_MAX):
+        raise ValueError(f"الأكلات والديناري يجب أن تكون بين 0 و {FIELD_MAX}")
+
+    present = (queens & QUEENS_MASK) | (KING_HEART_FLAG if has_king_heart else 0)
+    cards = 0
+    for bit in range(len(CARD_KEYS)):
+        flag = 1 << bit
+        if present & flag:
+            state = CARD_PRESENT_DOUBLED if doubled & flag else CARD_PRESENT
+        elif doubled_to_opponent & flag:
+            state = CARD_DOUBLED_TO_OPPONENT
+        else:
+            continue
+        cards |= state << (2 * bit)
+
+    return tricks | (diamonds << DIAMONDS_SHIFT) | (cards << CARDS_SHIFT)
+
+
+class CompiledRules:
+    """قواعد عدّ محوّلة إلى جداول نتائج جاهزة"""
+
+    def __init__(self, points: Dict):
+        missing = [key for key in REQUIRED_POINTS if key not in points]
+        if missing:
+            raise ValueError(f"جدول النقاط ناقص: {', '.join(missing)}")
+
+        self.points = dict(points)
+        self.trick = points['trick']
+        self.diamond = points['diamond']
+        self.queen = points['queen']
+        self.king_heart = points['king_heart']
+        self.round_total = points['round_total']
+
+        self.card_table, self.table = self._build_tables()
+
+        # حساب الجولة المرمزة = فهرسة واحدة
+        self.score = self.table.__getitem__
+
+    def _build_tables(self):
+        """بناء جدول النتائج لكل حالات الجولة الممكنة"""
+        # (البنات، شيخ القبة، مكافأة التدبيل) لكل حالة بطاقات
+        card_table = array('i')
+        card_totals = []
+        for cards in range(1 << (2 * len(CARD_KEYS))):
+            queens_points = king_points = doubled_bonus = 0
+            for bit in range(len(CARD_KEYS)):
+                state = (cards >> (2 * bit)) & 3
+                value = self.king_heart if bit == KING_HEART_BIT else self.queen
+                if state == CARD_DOUBLED_TO_OPPONENT:
+                    doubled_bonus += value
+                elif state != CARD_ABSENT:
+                    points = value * 2 if state == CARD_PRESENT_DOUBLED else value
+                    if bit == KING_HEART_BIT:
+                        king_points -= points
+                    else:
+                        queens_points -= points
+            card_table.extend((queens_points, king_points, doubled_bonus))
+            card_totals.append(queens_points + king_points + doubled_bonus)
+
+        # الجزء الثابت من الأكلات والديناري بنفس ترتيب بتات الترميز
+        base = [
+            -tricks * self.trick - diamonds * self.diamond
+            for diamonds in range(FIELD_MAX + 1)
+            for tricks in range(FIELD_MAX + 1)
+        ]
+        table = array('i')
+        for card_total in card_totals:
+            table.extend([card_total + b for b in base])
+
+        return card_table, table
+
+    def breakdown(self, code: int) -> Tuple[int, int, int, int, int]:
+        """
+        تفاصيل نقاط جولة مرمزة
+
+        Returns:
+            (الأكلات، الديناري، البنات، شيخ القبة، مكافأة التدبيل)
+        """
+        i = 3 * (code >> CARDS_SHIFT)
+        return (
+            -(code & FIELD_MAX) * self.trick,
+            -((code >> DIAMONDS_SHIFT) & FIELD_MAX) * self.diamond,
+            self.card_table[i],
+            self.card_table[i + 1],
+            self.card_table[i + 2],
+        )
+
+    def score_keys(self, tricks: int, diamonds: int, queens: Iterable[str], has_king_heart: bool,
+                   opponent_doubled: Dict = None, my_doubled: Dict = None) -> Tuple[int, int]:
+        """
+        حساب جولة من بيانات الواجهة
+
+        Args:
+            queens: البنات الموجودة ('spade', 'heart', ...)
+            opponent_doubled: {"Q_heart": True, "K_heart": False, ...}
+            my_doubled: البطاقات التي دبّلها الفريق للخصم بنفس الشكل
+
+        Returns:
+            (ترميز الجولة، نقاط الفريق)
+        """
+        code = encode_state(
+            tricks,
+            diamonds,
+            mask_from_keys(f"Q_{suit}" for suit in queens),
+            has_king_heart,
+            doubled=mask_from_keys(k for k, v in (opponent_doubled or {}).items() if v),
+            doubled_to_opponent=mask_from_keys(k for k, v in (my_doubled or {}).items() if v)
+        )
+        return code, self.table[code]
+
+    def card_value(self, key: str) -> int:
+        """القيمة الأساسية لبطاقة خاصة ("Q_..." أو "K_heart")"""
+        return self.king_heart if key == 'K_heart' else self.queen
+
+
+# ==================== القواعد الحالية ====================
+
+_compiled: Dict[Tuple, CompiledRules] = {}
+_active: Optional[CompiledRules] = None
+
+
+def compile_rules(points: Dict) -> CompiledRules:
+    """تحويل جدول نقاط إلى قواعد جاهزة (مرة واحدة لكل جدول)"""
+    key = tuple(sorted(points.items()))
+    rules = _compiled.get(key)
+    if rules is None:
+        rules = _compiled[key] = CompiledRules(points)
+    return rules
+
+
+def use_rules(points: Dict) -> CompiledRules:
+    """اعتماد جدول نقاط جديد لكل الحسابات"""
+    global _active
+    _active = compile_rules(points)
+    return _active
+
+
+def use_variant(name: str) -> CompiledRules:
+    """اعتماد أحد أنواع القواعد المعرفة في RULE_VARIANTS"""
+    if name not in RULE_VARIANTS:
+        raise KeyError(f"نوع قواعد غير معروف: {name}")
+    return use_rules(RULE_VARIANTS[name])
+
+
+def active() -> CompiledRules:
+    """القواعد المستخدمة حالياً (تُبنى عند أول استخدام)"""
+    if _active is None:
+        return use_variant(DEFAULT_RULES)
+    return _active
+
+
+# ==================== الحساب الجماعي ====================
+
+_cards_np = None
+
+
+def cards_lookup():
+    """جدول NumPy يحوّل (الموجود، المدبل، المدبل للخصم) إلى حالات البطاقات"""
+    global _cards_np
+    if _cards_np is None:
+        import numpy as np
+
+        index = np.arange(1 << 15, dtype=np.int32)
+        present, doubled, doubled_to = index & 31, (index >> 5) & 31, (index >> 10) & 31
+        cards = np.zeros_like(index)
+        for bit in range(len(CARD_KEYS)):
+            state = np.where(
+                (present >> bit) & 1,
+                CARD_PRESENT + ((doubled >> bit) & 1),
+                ((doubled_to >> bit) & 1) * CARD_DOUBLED_TO_OPPONENT,
+            )
+            cards |= state << (2 * bit)
+        _cards_np = cards
+    return _cards_np
@@ -0,0 +1,503 @@
+"""
+حاسبة نقاط لعبة الشدة كومبلكس كومبلكس
+Score Calculator for Complex Complex Card Game
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Dict, Optional, Tuple
+from enum import Enum
+
+from .rules import (
+    POINTS, active as active_rules, cards_lookup,
+    KING_HEART_BIT, KING_HEART_FLAG, QUEENS_MASK, ALL_CARDS_MASK,
+    DIAMONDS_SHIFT, CARDS_SHIFT, FIELD_MAX, encode_state,
+)
+from .totals import RoundTotals
+
+
+class CardSuit(Enum):
+    """أنواع الورق"""
+    SPADE = "بستوني"      # ♠
+    DIAMOND = "ديناري"    # ♦
+    HEART = "قبة"         # ♥
+    CLUB = "اسباتي"       # ♣
+
+
+class CardRank(Enum):
+    """رتب الورق"""
+    QUEEN = "Q"           # بنت
+    KING = "K"            # شيخ
+
+
+# ترتيب البطاقات الخاصة داخل الأقنعة الثنائية (bitmask) المستخدمة في الحساب الجماعي
+QUEEN_BITS = {
+    CardSuit.SPADE: 0,
+    CardSuit.DIAMOND: 1,
+    CardSuit.HEART: 2,
+    CardSuit.CLUB: 3,
+}
+
+
+@dataclass
+class SpecialCard:
+    """بطاقة خاصة (بنت أو شيخ القبة)"""
+    rank: CardRank
+    suit: CardSuit
+    is_doubled: bool = False  # هل تم تدبيلها
+    
+    @property
+    def base_value(self) -> int:
+        """القيمة الأساسية للبطاقة"""
+        rules = active_rules()
+        if self.rank == CardRank.QUEEN:
+            return rules.queen
+        elif self.rank == CardRank.KING and self.suit == CardSuit.HEART:
+            return rules.king_heart
+        return 0
+    
+    @property
+    def actual_value(self) -> int:
+        """القيمة الفعلية بعد التدبيل"""
+        return self.base_value * 2 if self.is_doubled else self.base_value
+    
+    def __str__(self) -> str:
+        doubled_text = " (مدبلة)" if self.is_doubled else ""
+        return f"{self.rank.value} {self.suit.value}{doubled_text}"
+
+
+@dataclass
+class RoundData:
+    """بيانات الجولة"""
+    total_cards: int = 0                          # عدد الأوراق الكلي
+    diamond_count: int = 0                        # عدد أوراق الديناري
+    queens: List[SpecialCard] = field(default_factory=list)  # البنات
+    king_heart: SpecialCard = None                # شيخ القبة
+    
+    # البطاقات التي دبّلها الفريق للخصم (يحصل على موجب)
+    doubled_to_opponent: List[SpecialCard] = field(default_factory=list)
+
+
+class ScoreCalculator:
+    """حاسبة النقاط الرئيسية"""
+    
+    # ثوابت النقاط (القواعد القياسية - الحساب نفسه يتبع active_rules())
+    POINTS_PER_TRICK = POINTS['trick']            # نقاط كل أكلة
+    CARDS_PER_TRICK = 4                           # عدد الأوراق في كل أكلة
+    POINTS_PER_DIAMOND = POINTS['diamond']        # نقاط كل ديناري
+    POINTS_PER_QUEEN = POINTS['queen']            # نقاط كل بنت
+    POINTS_KING_HEART = POINTS['king_heart']      # نقاط شيخ القبة
+    ROUND_TOTAL = POINTS['round_total']           # مجموع نقاط الفريقين في كل جولة
+    
+    def __init__(self):
+        self.round_data = RoundData()
+        self.round_number = 0           # رقم الجولة الحالية
+        self.totals = RoundTotals()     # نقاط الجولات المنتهية ومجاميعها
+    
+    @property
+    def team1_total(self) -> int:
+        """مجموع الفريق الأول"""
+        return self.totals.team1_total
+    
+    @property
+    def team2_total(self) -> int:
+        """مجموع الفريق الثاني"""
+        return self.totals.team2_total
+    
+    def reset_round(self):
+        """إعادة تعيين بيانات الجولة"""
+        self.round_data = RoundData()
+    
+    def start_new_round(self):
+        """بدء جولة جديدة"""
+        self.round_number += 1
+        self.reset_round()
+    
+    def reset_game(self):
+        """إعادة تعيين اللعبة بالكامل"""
+        self.round_number = 0
+        self.totals = RoundTotals()
+        self.reset_round()
+    
+    def calculate_team2_score(self, team1_score: int) -> int:
+        """
+        حساب نقاط الفريق الثاني تلقائياً
+        مجموع الفريقين = -500
+        
+        Args:
+            team1_score: نقاط الفريق الأول
+        
+        Returns:
+            نقاط الفريق الثاني
+        """
+        return active_rules().round_total - team1_score
+    
+    def get_expected_total(self) -> int:
+        """
+        الحصول على المجموع الكلي المتوقع لكلا الفريقين
+        = عدد الجولات (بدون المحذوفة) × -500
+        """
+        return (self.round_number - self.totals.deleted) * active_rules().round_total
+    
+    def finalize_round(self, team1_score: int) -> Dict:
+        """
+        إنهاء الجولة وحساب نقاط الفريقين
+        
+        Args:
+            team1_score: نقاط الفريق الأول (الذي قام بالعدّ)
+        
+        Returns:
+            قاموس بنقاط الفريقين والمجاميع
+        """
+        team2_score = self.calculate_team2_score(team1_score)
+        
+        if self.round_number in self.totals:
+            # إنهاء نفس الجولة مرة ثانية يصحح نتيجتها
+            self.totals.edit(self.round_number, team1_score, team2_score)
+        else:
+            self.totals.add(self.round_number, team1_score, team2_score)
+        
+        return {
+            "round_number": self.round_number,
+            "team1_round_score": team1_score,
+            "team2_round_score": team2_score,
+            **self.get_standing()
+        }
+    
+    def edit_round(self, round_number: int, team1_score: int) -> Dict:
+        """
+        تصحيح نتيجة جولة سابقة
+        
+        Args:
+            round_number: رقم الجولة
+            team1_score: نقاط الفريق الأول الصحيحة
+        
+        Returns:
+            قاموس بنقاط الجولة بعد التعديل والمجاميع
+        """
+        team2_score = self.calculate_team2_score(team1_score)
+        self.totals.edit(round_number, team1_score, team2_score)
+        return {
+            "round_number": round_number,
+            "team1_round_score": team1_score,
+            "team2_round_score": team2_score,
+            **self.get_standing()
+        }
+    
+    def delete_round(self, round_number: int) -> Dict:
+        """حذف جولة سابقة من المجاميع"""
+        self.totals.delete(round_number)
+        return self.get_standing()
+    
+    def get_cumulative_totals(self, round_number: int) -> Tuple[int, int]:
+        """مجموع الفريقين حتى جولة معينة (ضمناً)"""
+        return self.totals.cumulative(round_number)
+    
+    def get_standing(self) -> Dict:
+        """
+        المجاميع الحالية مع التحقق من أن مجموع الفريقين = عدد الجولات × -500
+        (المجاميع محفوظة تراكمياً فلا حاجة لإعادة الجمع)
+        """
+        expected_total = self.get_expected_total()
+        actual_total = self.totals.team1_total + self.totals.team2_total
+        
+        return {
+            "team1_total": self.totals.team1_total,
+            "team2_total": self.totals.team2_total,
+            "expected_total": expected_total,
+            "actual_total": actual_total,
+            "is_valid": actual_total == expected_total
+        }
+    
+    def set_cards_data(self, total_cards: int, diamond_count: int, 
+                       queens: List[Dict], has_king_heart: bool):
+        """
+        تعيين بيانات البطاقات من معالجة الصور
+        
+        Args:
+            total_cards: عدد الأوراق الكلي
+            diamond_count: عدد أوراق الديناري
+            queens: قائمة البنات [{"suit": CardSuit, "is_doubled": bool}, ...]
+            has_king_heart: هل يوجد شيخ القبة
+        """
+        self.round_data.total_cards = total_cards
+        self.round_data.diamond_count = diamond_count
+        
+        # إضافة البنات
+        self.round_data.queens = []
+        for q in queens:
+            queen = SpecialCard(
+                rank=CardRank.QUEEN,
+                suit=q.get("suit", CardSuit.SPADE),
+                is_doubled=q.get("is_doubled", False)
+            )
+            self.round_data.queens.append(queen)
+        
+        # شيخ القبة
+        if has_king_heart:
+            self.round_data.king_heart = SpecialCard(
+                rank=CardRank.KING,
+                suit=CardSuit.HEART,
+                is_doubled=False
+            )
+    
+    def set_doubled_card(self, card: SpecialCard, is_doubled: bool):
+        """تعيين حالة التدبيل لبطاقة"""
+        card.is_doubled = is_doubled
+    
+    def add_doubled_to_opponent(self, rank: CardRank, suit: CardSuit):
+        """
+        إضافة بطاقة تم تدبيلها للخصم (يحصل الفريق على موجب)
+        """
+        card = SpecialCard(rank=rank, suit=suit, is_doubled=True)
+        self.round_data.doubled_to_opponent.append(card)
+    
+    def calculate_tricks_points(self) -> int:
+        """حساب نقاط الأكلات"""
+        num_tricks = self.round_data.total_cards // self.CARDS_PER_TRICK
+        return -num_tricks * active_rules().trick
+    
+    def calculate_diamond_points(self) -> int:
+        """حساب نقاط الديناري"""
+        return -self.round_data.diamond_count * active_rules().diamond
+    
+    def calculate_queens_points(self) -> int:
+        """حساب نقاط البنات"""
+        total = 0
+        for queen in self.round_data.queens:
+            total -= queen.actual_value
+        return total
+    
+    def calculate_king_heart_points(self) -> int:
+        """حساب نقاط شيخ القبة"""
+        if self.round_data.king_heart:
+            return -self.round_data.king_heart.actual_value
+        return 0
+    
+    def calculate_doubled_to_opponent_points(self) -> int:
+        """حساب النقاط الموجبة من التدبيل للخصم"""
+        total = 0
+        for card in self.round_data.doubled_to_opponent:
+            # القيمة موجبة لأن الفريق دبّل والخصم أكل
+            total += card.base_value  # القيمة الأساسية فقط
+        return total
+    
+    def encode_round(self) -> Optional[int]:
+        """
+        ترميز بيانات الجولة الحالية في عدد صحيح (انظر encode_state)
+        
+        Returns:
+            الترميز، أو None إذا كانت البيانات لا يمثلها جدول النتائج
+        """
+        return encode_round_data(self.round_data)
+    
+    def calculate_round_score(self) -> Dict:
+        """
+        حساب نقاط الجولة الكاملة
+        
+        Returns:
+            قاموس بتفاصيل النقاط
+        """
+        code = self.encode_round()
+        if code is None:
+            # بيانات خارج جدول النتائج (مثلاً بنت مكررة) - حساب مباشر
+            tricks_points = self.calculate_tricks_points()
+            diamond_points = self.calculate_diamond_points()
+            queens_points = self.calculate_queens_points()
+            king_points = self.calculate_king_heart_points()
+            doubled_bonus = self.calculate_doubled_to_opponent_points()
+            total = tricks_points + diamond_points + queens_points + king_points + doubled_bonus
+        else:
+            rules = active_rules()
+            tricks_points, diamond_points, queens_points, king_points, doubled_bonus = \
+                rules.breakdown(code)
+            total = rules.score(code)
+        
+        return {
+            "tricks": {
+                "count": self.round_data.total_cards // self.CARDS_PER_TRICK,
+                "points": tricks_points
+            },
+            "diamonds": {
+                "count": self.round_data.diamond_count,
+                "points": diamond_points
+            },
+            "queens": {
+                "cards": [str(q) for q in self.round_data.queens],
+                "points": queens_points
+            },
+            "king_heart": {
+                "exists": self.round_data.king_heart is not None,
+                "doubled": self.round_data.king_heart.is_doubled if self.round_data.king_heart else False,
+                "points": king_points
+            },
+            "doubled_bonus": {
+                "cards": [str(c) for c in self.round_data.doubled_to_opponent],
+                "points": doubled_bonus
+            },
+            "total": total
+        }
+
+    @classmethod
+    def score_batch(cls, tricks, diamonds, queens, king_heart,
+                    doubled=None, doubled_to_opponent=None) -> Dict:
+        """
+        حساب نقاط عدد كبير من الجولات دفعة واحدة (أعمدة NumPy)
+
+        كل معامل عمود بطول عدد الجولات. الأقنعة الثنائية تتبع QUEEN_BITS
+        للبنات و KING_HEART_BIT لشيخ القبة. النقاط تُقرأ من جدول النتائج،
+        لذلك يُهمل تدبيل الخصم لبطاقة ناقصة. التدبيل للخصم لبطاقة موجودة
+        (خارج الجدول) يُضاف فوقه كما في calculate_round_score.
+
+        Args:
+            tricks: عدد الأكلات في كل جولة (0 - 15)
+            diamonds: عدد أوراق الديناري (0 - 15)
+            queens: قناع البنات الموجودة (4 بتات)
+            king_heart: هل يوجد شيخ القبة (0 أو 1)
+            doubled: قناع البطاقات الموجودة التي دبّلها الخصم (5 بتات)
+            doubled_to_opponent: قناع البطاقات التي دبّلها الفريق للخصم (5 بتات)
+
+        Returns:
+            قاموس أعمدة: نقاط كل بند ونقاط الفريقين
+        """
+        import numpy as np
+
+        tricks = np.asarray(tricks, dtype=np.int32)
+        diamonds = np.asarray(diamonds, dtype=np.int32)
+        for column in (tricks, diamonds):
+            if column.size and (column.min() < 0 or column.max() > FIELD_MAX):
+                raise ValueError(f"الأكلات والديناري يجب أن تكون بين 0 و {FIELD_MAX}")
+
+        present = (np.asarray(queens, dtype=np.int32) & QUEENS_MASK) | (
+            (np.asarray(king_heart) != 0).astype(np.int32) << KING_HEART_BIT
+        )
+        if doubled is None:
+            doubled = np.zeros_like(present)
+        if doubled_to_opponent is None:
+            doubled_to_opponent = np.zeros_like(present)
+        doubled = np.asarray(doubled, dtype=np.int32) & ALL_CARDS_MASK
+        doubled_to_opponent = np.asarray(doubled_to_opponent, dtype=np.int32) & ALL_CARDS_MASK
+
+        # ترميز كل الجولات ثم قراءة النقاط من الجداول بفهرسة واحدة
+        rules = active_rules()
+        cards = cards_lookup()[present | (doubled << 5) | (doubled_to_opponent << 10)]
+        codes = tricks | (diamonds << DIAMONDS_SHIFT) | (cards << CARDS_SHIFT)
+
+        total = np.frombuffer(rules.table, dtype=np.intc)[codes]
+        parts = np.frombuffer(rules.card_table, dtype=np.intc).reshape(-1, 3)[cards]
+
+        # مكافأة التدبيل للخصم على بطاقة موجودة لا يمثلها الترميز
+        extra = present & doubled_to_opponent
+        bonus = ((extra >> KING_HEART_BIT) & 1) * rules.king_heart
+        for bit in range(KING_HEART_BIT):
+            bonus += ((extra >> bit) & 1) * rules.queen
+        total = total + bonus
+
+        return {
+            "tricks_points": -tricks * rules.trick,
+            "diamond_points": -diamonds * rules.diamond,
+            "queens_points": parts[:, 0],
+            "king_points": parts[:, 1],
+            "doubled_bonus": parts[:, 2] + bonus,
+            "team1": total,
+            "team2": rules.round_total - total,
+        }
+
+    def get_special_cards_for_selection(self) -> Dict:
+        """
+        الحصول على البطاقات الخاصة لعرضها للمستخدم للاختيار
+        
+        Returns:
+            قاموس بالبنات وشيخ القبة الموجودين
+        """
+        result = {
+            "queens": [],
+            "king_heart": None,
+            "missing_queens": [],
+            "missing_king_heart": False
+        }
+        
+        # البنات الموجودة
+        existing_suits = set()
+        for queen in self.round_data.queens:
+            result["queens"].append({
+                "suit": queen.suit.value,
+                "suit_enum": queen.suit,
+                "is_doubled": queen.is_doubled
+            })
+            existing_suits.add(queen.suit)
+        
+        # شيخ القبة
+        if self.round_data.king_heart:
+            result["king_heart"] = {
+                "suit": CardSuit.HEART.value,
+                "is_doubled": self.round_data.king_heart.is_doubled
+            }
+        else:
+            result["missing_king_heart"] = True
+        
+        # البنات الناقصة (للسؤال عن التدبيل للخصم)
+        all_suits = [CardSuit.SPADE, CardSuit.DIAMOND, CardSuit.HEART, CardSuit.CLUB]
+        for suit in all_suits:
+            if suit not in existing_suits:
+                result["missing_queens"].append({
+                    "suit": suit.value,
+                    "suit_enum": suit
+                })
+        
+        return result
+
+
+def encode_round_data(data: RoundData) -> Optional[int]:
+    """
+    ترميز بيانات جولة (RoundData) في عدد صحيح (انظر encode_state)
+    
+    Returns:
+        الترميز، أو None إذا كانت البيانات لا يمثلها جدول النتائج
+    """
+    tricks = data.total_cards // ScoreCalculator.CARDS_PER_TRICK
+    if not (0 <= tricks <= FIELD_MAX and 0 <= data.diamond_count <= FIELD_MAX):
+        return None
+    
+    present = doubled = doubled_to = 0
+    for queen in data.queens:
+        flag = 1 << QUEEN_BITS[queen.suit]
+        if present & flag:
+            return None
+        present |= flag
+        if queen.is_doubled:
+            doubled |= flag
+    
+    if data.king_heart:
+        present |= KING_HEART_FLAG
+        if data.king_heart.is_doubled:
+            doubled |= KING_HEART_FLAG
+    
+    for card in data.doubled_to_opponent:
+        if card.rank == CardRank.QUEEN:
+            flag = 1 << QUEEN_BITS[card.suit]
+        elif card.suit == CardSuit.HEART:
+            flag = KING_HEART_FLAG
+        else:
+            return None
+        # لا يمكن التدبيل للخصم على بطاقة موجودة عندنا
+        if (present | doubled_to) & flag:
+            return None
+        doubled_to |= flag
+    
+    return encode_state(tricks, data.diamond_count, present & QUEENS_MASK,
+                        data.king_heart is not None, doubled, doubled_to)
+
+
+def score_table():
+    """جدول النتائج للقواعد الحالية: score_table()[code] = نقاط الفريق"""
+    return active_rules().table
+
+
+def score_breakdown(code: int) -> Tuple[int, int, int, int, int]:
+    """
+    تفاصيل نقاط جولة مرمزة حسب القواعد الحالية
+    
+    Returns:
+        (الأكلات، الديناري، البنات، شيخ القبة، مكافأة التدبيل)
+    """
+    return active_rules().breakdown(code)
@@ -0,0 +1,375 @@
+"""
+خادم عدّ البطولات (asyncio + HTTP/JSON)
+Tournament scoring server - one actor per table
+
+كل طاولة ممثل (actor) يملك ScoreCalculator خاصاً وطابوراً محدوداً للطلبات،
+فطلبات الطاولة تُنفذ بالترتيب والطاولات لا تنتظر بعضها. إذا امتلأ طابور
+طاولة يُرد فوراً بـ 429 بدل تراكم الطلبات في الذاكرة.
+
+    POST   /tables/<id>/rounds       تسجيل جولة: {"team1": -205} أو بيانات الأوراق
+    PUT    /tables/<id>/rounds/<n>   تعديل جولة بنفس الشكل
+    DELETE /tables/<id>/rounds/<n>   حذف جولة
+    GET    /tables/<id>/standings    المجاميع الحالية
+    GET    /feed, /tables/<id>/feed  بث مباشر للنتائج (cc_core.feed)
+
+مع --archive تُحفظ الجولات في أرشيف SQLite (cc_core.archive) ويتاح:
+
+    GET    /games?team=&since=&until=&limit=&before=<started_at>,<id>
+    GET    /games/<id>               لعبة وجولاتها (id في standings: طاولة-تاريخ-رمز)
+    GET    /teams/<name>/stats       ألعاب الفريق وانتصاراته ونقاطه
+
+بيانات الأوراق بنفس شكل أسطر cc_core.batch (total_cards, diamond_count, queens ...).
+
+    python -m cc_core.server --port 8765
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, unquote
+
+from .archive import GameArchive
+from .batch import encode_row, score_row_slow
+from .feed import LiveFeed
+from .rules import DEFAULT_RULES, RULE_VARIANTS, active as active_rules, use_variant
+from .scoring import ScoreCalculator
+
+QUEUE_SIZE = 64             # أقصى عدد طلبات منتظرة لكل طاولة
+MAX_BODY = 64 * 1024        # أقصى حجم لجسم الطلب
+MAX_HEADER = 16 * 1024
+
+REASONS = {
+    200: 'OK', 201: 'Created', 400: 'Bad Request', 404: 'Not Found',
+    405: 'Method Not Allowed', 413: 'Payload Too Large', 429: 'Too Many Requests',
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def round_score(payload: Dict) -> Tuple[int, Optional[int]]:
+    """نقاط الفريق الأول من الطلب: رقم مباشر أو بيانات أوراق"""
+    if 'team1' in payload:
+        team1 = payload['team1']
+        if not isinstance(team1, int) or isinstance(team1, bool):
+            raise HTTPError(400, "team1 يجب أن يكون عدداً صحيحاً")
+        return team1, None
+    try:
+        code = encode_row(payload)
+        if code is not None:
+            return active_rules().score(code), code
+        return score_row_slow(payload), None
+    except (ValueError, TypeError, KeyError, AttributeError) as e:
+        raise HTTPError(400, str(e))
+
+
+# ==================== الطاولات ====================
+
+class TableActor:
+    """طاولة واحدة: حالة العدّ + طابور طلبات محدود يعالجه مهمة واحدة"""
+
+    def __init__(self, table_id: str, queue_size: int = QUEUE_SIZE,
+                 publish: Optional[Callable[[str, Dict], None]] = None):
+        self.table_id = table_id
+        # لعبة جديدة في الأرشيف لكل تشغيل للطاولة (رقم الطاولة يتكرر بعد إعادة التشغيل)
+        self.game_id = f"{table_id}-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        self.publish = publish          # إشعار البث بكل تغيير في النتائج
+        self.calc = ScoreCalculator()
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self._task = asyncio.create_task(self._run())
+
+    async def call(self, op: str, *args):
+        """إرسال طلب للطاولة وانتظار نتيجته (429 إذا كان الطابور ممتلئاً)"""
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((op, args, future))
+        except asyncio.QueueFull:
+            raise HTTPError(429, f"الطاولة {self.table_id} مشغولة")
+        return await future
+
+    async def _run(self):
+        while True:
+            op, args, future = await self.queue.get()
+            if future.cancelled():
+                continue
+            try:
+                future.set_result(getattr(self, f"_{op}")(*args))
+            except Exception as e:
+                future.set_exception(e)
+
+    def close(self):
+        self._task.cancel()
+
+    # ==================== العمليات ====================
+
+    def _submit(self, payload: Dict) -> Dict:
+        team1, code = round_score(payload)
+        self.calc.start_new_round()
+        result = self.calc.finalize_round(team1)
+        result['state'] = code
+        self._changed(result)
+        return result
+
+    def _edit(self, round_number: int, payload: Dict) -> Dict:
+        team1, code = round_score(payload)
+        try:
+            result = self.calc.edit_round(round_number, team1)
+        except KeyError as e:
+            raise HTTPError(404, e.args[0])
+        result['state'] = code
+        self._changed({'edited_round': round_number, **result})
+        return result
+
+    def _delete(self, round_number: int) -> Dict:
+        try:
+            result = self.calc.delete_round(round_number)
+        except KeyError as e:
+            raise HTTPError(404, e.args[0])
+        self._changed({'deleted_round': round_number, **result})
+        return result
+
+    def _changed(self, result: Dict):
+        if self.publish is not None:
+            self.publish(self.table_id, result)
+
+    def _standings(self) -> Dict:
+        return {
+            'table': self.table_id,
+            'game': self.game_id,
+            'rounds': len(self.calc.totals),
+            'round_number': self.calc.round_number,
+            **self.calc.get_standing()
+        }
+
+
+class ScoringServer:
+    """خادم HTTP/1.1 بسيط (keep-alive) يوزع الطلبات على ممثلي الطاولات"""
+
+    def __init__(self, queue_size: int = QUEUE_SIZE, feed: LiveFeed = None,
+                 archive: GameArchive = None):
+        self.queue_size = queue_size
+        self.tables: Dict[str, TableActor] = {}
+        self.feed = feed or LiveFeed()
+        self.archive = archive
+        self._server = None
+
+    def table(self, table_id: str, create: bool = False) -> TableActor:
+        actor = self.tables.get(table_id)
+        if actor is None:
+            if not create:
+                raise HTTPError(404, f"الطاولة {table_id} غير موجودة")
+            actor = self.tables[table_id] = TableActor(
+                table_id, self.queue_size, self._changed
+            )
+            if self.archive is not None:
+                self.archive.start_game(actor.game_id, 'team1', 'team2')
+        return actor
+
+    def _changed(self, table_id: str, result: Dict):
+        """كل تغيير في طاولة يُبث ويُحفظ في الأرشيف (بدون انتظار القرص)"""
+        self.feed.publish(table_id, result)
+        if self.archive is None:
+            return
+        game_id = self.tables[table_id].game_id
+        if 'deleted_round' in result:
+            self.archive.delete_round(game_id, result['deleted_round'])
+        elif 'edited_round' in result:
+            self.archive.edit_round(game_id, result['edited_round'], result['team1_round_score'],
+                                    result['team2_round_score'], result.get('state'))
+        else:
+            self.archive.add_round(game_id, result['round_number'], result['team1_round_score'],
+                                   result['team2_round_score'], result.get('state'))
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8765):
+        self._server = await asyncio.start_server(self._handle, host, port, limit=MAX_HEADER)
+        return self._server
+
+    async def close(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+        self.feed.close()
+        for actor in self.tables.values():
+            actor.close()
+        if self.archive is not None:
+            self.archive.close()
+
+    # ==================== التوجيه ====================
+
+    async def dispatch(self, method: str, path: str, payload: Optional[Dict]) -> Tuple[int, Dict]:
+        parts = [unquote(p) for p in path.split('?', 1)[0].split('/') if p]
+        if parts and parts[0] in ('games', 'teams'):
+            if method != 'GET':
+                raise HTTPError(405, f"{method} غير مدعوم على {path}")
+            return 200, await self._query(parts, parse_qs(path.partition('?')[2]))
+        if len(parts) < 3 or parts[0] != 'tables':
+            raise HTTPError(404, "مسار غير معروف")
+        table_id, resource = parts[1], parts[2:]
+
+        if resource == ['standings'] and method == 'GET':
+            return 200, await self.table(table_id).call('standings')
+        if resource == ['rounds'] and method == 'POST':
+            return 201, await self.table(table_id, create=True).call('submit', payload or {})
+        if len(resource) == 2 and resource[0] == 'rounds':
+            try:
+                round_number = int(resource[1])
+            except ValueError:
+                raise HTTPError(404, "رقم جولة غير صالح")
+            if method == 'PUT':
+                return 200, await self.table(table_id).call('edit', round_number, payload or {})
+            if method == 'DELETE':
+                return 200, await self.table(table_id).call('delete', round_number)
+        raise HTTPError(405, f"{method} غير مدعوم على {path}")
+
+    async def _query(self, parts, query: Dict) -> Dict:
+        """استعلامات الأرشيف في خيط منفصل حتى لا تعطل الطاولات"""
+        if self.archive is None:
+            raise HTTPError(404, "الأرشيف غير مفعّل (--archive)")
+        archive = self.archive
+
+        def arg(name, convert=str, default=None):
+            try:
+                return convert(query[name][0]) if name in query else default
+            except ValueError:
+                raise HTTPError(400, f"{name} غير صالح")
+
+        if parts == ['games']:
+            before = arg('before')
+            if before is not None:
+                started_at, _, game_id = before.partition(',')
+                try:
+                    before = (float(started_at), game_id)
+                except ValueError:
+                    raise HTTPError(400, "before غير صالح")
+            limit = min(arg('limit', int, 50), 500)
+            games = await asyncio.to_thread(
+                archive.list_games, arg('team'), arg('since', float), arg('until', float),
+                limit, before
+            )
+            return {'games': games}
+        if len(parts) == 2 and parts[0] == 'games':
+            game = await asyncio.to_thread(archive.game, parts[1])
+            if game is None:
+                raise HTTPError(404, f"اللعبة {parts[1]} غير موجودة")
+            game['history'] = await asyncio.to_thread(archive.rounds, parts[1])
+            return game
+        if len(parts) == 3 and parts[0] == 'teams' and parts[2] == 'stats':
+            return await asyncio.to_thread(
+                archive.team_stats, parts[1], arg('since', float), arg('until', float)
+            )
+        raise HTTPError(404, "مسار غير معروف")
+
+    async def _feed(self, path: str, reader, writer) -> bool:
+        """فتح بث SSE إذا كان المسار مسار بث"""
+        parts = [p for p in path.split('?', 1)[0].split('/') if p]
+        if parts == ['feed']:
+            snapshot = {
+                table_id: actor._standings() for table_id, actor in self.tables.items()
+            }
+            await self.feed.stream(reader, writer, None, {'tables': snapshot})
+            return True
+        if len(parts) == 3 and parts[0] == 'tables' and parts[2] == 'feed':
+            actor = self.tables.get(parts[1])
+            snapshot = actor._standings() if actor else None
+            await self.feed.stream(reader, writer, parts[1], snapshot)
+            return True
+        return False
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+
+                lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, path, version = lines[0].split(' ', 2)
+                except ValueError:
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(':')
+                    if name:
+                        headers[name.strip().lower()] = value.strip()
+
+                if method == 'GET' and await self._feed(path, reader, writer):
+                    break
+
+                keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+                try:
+                    length = int(headers.get('content-length', 0))
+                    if length > MAX_BODY:
+                        raise HTTPError(413, "جسم الطلب كبير جداً")
+                    payload = None
+                    if length:
+                        body = await reader.readexactly(length)
+                        try:
+                            payload = json.loads(body)
+                        except ValueError:
+                            raise HTTPError(400, "JSON غير صالح")
+                        if not isinstance(payload, dict):
+                            raise HTTPError(400, "الجسم يجب أن يكون كائن JSON")
+                    status, result = await self.dispatch(method, path, payload)
+                except HTTPError as e:
+                    status, result = e.status, {'error': str(e)}
+                    if e.status == 413:
+                        keep_alive = False
+                except (ValueError, asyncio.IncompleteReadError):
+                    status, result, keep_alive = 400, {'error': "طلب غير صالح"}, False
+
+                body = json.dumps(result, ensure_ascii=False).encode('utf-8')
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+                    f"\r\n".encode('latin-1') + body
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host: str, port: int, queue_size: int = QUEUE_SIZE, archive: str = None):
+    server = ScoringServer(queue_size, archive=GameArchive(archive) if archive else None)
+    await server.start(host, port)
+    print(f"CC Counter scoring server on http://{host}:{port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m cc_core.server',
+                                     description="خادم عدّ البطولات")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--queue-size', type=int, default=QUEUE_SIZE,
+                        help="أقصى عدد طلبات منتظرة لكل طاولة")
+    parser.add_argument('--rules', default=DEFAULT_RULES, choices=list(RULE_VARIANTS),
+                        help="نوع القواعد")
+    parser.add_argument('--archive', help="ملف SQLite لحفظ الجولات والاستعلام عن الألعاب")
+    args = parser.parse_args(argv)
+
+    use_variant(args.rules)
+    try:
+        asyncio.run(serve(args.host, args.port, args.queue_size, args.archive))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
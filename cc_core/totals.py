@@ -0,0 +1,173 @@
+"""
+مجاميع الجولات التراكمية مع دعم التعديل والحذف
+Running Totals backed by Fenwick trees (binary indexed trees)
+
+تعديل أو حذف أي جولة، والمجموع التراكمي عند أي جولة: O(log n)
+
+PrefixTotals للعرض: المجموع التراكمي لكل صف محفوظ مسبقاً (O(1) للقراءة)
+وإضافة جولات جديدة لا تعيد حساب ما قبلها.
+"""
+
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class FenwickTree:
+    """شجرة فنويك لمجاميع البادئات (الفهارس تبدأ من 0)"""
+
+    def __init__(self, values: Iterable[int] = ()):
+        # بناء خطي O(n)
+        self._tree = [0] + list(values)
+        n = len(self._tree) - 1
+        for i in range(1, n + 1):
+            j = i + (i & -i)
+            if j <= n:
+                self._tree[j] += self._tree[i]
+
+    def __len__(self) -> int:
+        return len(self._tree) - 1
+
+    def append(self, value: int):
+        """إضافة عنصر في النهاية O(log n)"""
+        i = len(self._tree)
+        # العقدة الجديدة تغطي المدى (i - lowbit(i), i]
+        self._tree.append(value + self.prefix_sum(i - 1) - self.prefix_sum(i - (i & -i)))
+
+    def add(self, index: int, delta: int):
+        """إضافة delta للعنصر index"""
+        i = index + 1
+        n = len(self._tree)
+        while i < n:
+            self._tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, count: int) -> int:
+        """مجموع أول count عنصر"""
+        total = 0
+        i = count
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+
+class RoundTotals:
+    """نقاط الفريقين لكل جولة مع مجاميع تراكمية وتعديل وحذف"""
+
+    def __init__(self):
+        self._team1 = FenwickTree()
+        self._team2 = FenwickTree()
+        self._slots: Dict[int, int] = {}                    # رقم الجولة -> موقعها
+        self._scores: List[Optional[Tuple[int, int]]] = []  # None للجولة المحذوفة
+        self.team1_total = 0
+        self.team2_total = 0
+        self.deleted = 0
+
+    def __len__(self) -> int:
+        """عدد الجولات الموجودة (بدون المحذوفة)"""
+        return len(self._slots)
+
+    def __contains__(self, round_number: int) -> bool:
+        return round_number in self._slots
+
+    @classmethod
+    def from_history(cls, history: Iterable[Dict]) -> 'RoundTotals':
+        """بناء المجاميع من قيود app.history في O(n)"""
+        totals = cls()
+        team1, team2 = [], []
+        for entry in history:
+            if entry['round'] in totals._slots:
+                raise ValueError(f"الجولة {entry['round']} مكررة")
+            totals._slots[entry['round']] = len(totals._scores)
+            totals._scores.append((entry['team1'], entry['team2']))
+            team1.append(entry['team1'])
+            team2.append(entry['team2'])
+        totals._team1 = FenwickTree(team1)
+        totals._team2 = FenwickTree(team2)
+        totals.team1_total = sum(team1)
+        totals.team2_total = sum(team2)
+        return totals
+
+    def add(self, round_number: int, team1: int, team2: int):
+        """إضافة نتيجة جولة جديدة"""
+        if round_number in self._slots:
+            raise ValueError(f"الجولة {round_number} مسجلة مسبقاً")
+        self._slots[round_number] = len(self._scores)
+        self._scores.append((team1, team2))
+        self._team1.append(team1)
+        self._team2.append(team2)
+        self.team1_total += team1
+        self.team2_total += team2
+
+    def edit(self, round_number: int, team1: int, team2: int):
+        """تعديل نتيجة جولة سابقة"""
+        slot = self._slot(round_number)
+        old1, old2 = self._scores[slot]
+        self._set(slot, team1 - old1, team2 - old2)
+        self._scores[slot] = (team1, team2)
+
+    def delete(self, round_number: int):
+        """حذف جولة (يبقى موقعها فارغاً حتى لا تتغير مواقع ما بعدها)"""
+        slot = self._slot(round_number)
+        old1, old2 = self._scores[slot]
+        self._set(slot, -old1, -old2)
+        self._scores[slot] = None
+        del self._slots[round_number]
+        self.deleted += 1
+
+    def scores(self, round_number: int) -> Tuple[int, int]:
+        """نقاط الفريقين في جولة"""
+        return self._scores[self._slot(round_number)]
+
+    def cumulative(self, round_number: int) -> Tuple[int, int]:
+        """مجموع الفريقين من أول اللعبة حتى هذه الجولة (ضمناً)"""
+        count = self._slot(round_number) + 1
+        return self._team1.prefix_sum(count), self._team2.prefix_sum(count)
+
+    def _slot(self, round_number: int) -> int:
+        try:
+            return self._slots[round_number]
+        except KeyError:
+            raise KeyError(f"الجولة {round_number} غير موجودة") from None
+
+    def _set(self, slot: int, delta1: int, delta2: int):
+        self._team1.add(slot, delta1)
+        self._team2.add(slot, delta2)
+        self.team1_total += delta1
+        self.team2_total += delta2
+
+
+class PrefixTotals:
+    """المجموع التراكمي للفريقين عند كل صف من السجل (بترتيب العرض)"""
+
+    def __init__(self):
+        self._team1 = array('q')
+        self._team2 = array('q')
+
+    def __len__(self) -> int:
+        return len(self._team1)
+
+    def __getitem__(self, index: int) -> Tuple[int, int]:
+        return self._team1[index], self._team2[index]
+
+    @property
+    def totals(self) -> Tuple[int, int]:
+        return (self._team1[-1], self._team2[-1]) if self._team1 else (0, 0)
+
+    def extend(self, scores: Iterable[Tuple[int, int]]):
+        """إضافة صفوف جديدة في النهاية (تبدأ من آخر مجموع)"""
+        total1, total2 = self.totals
+        for team1, team2 in scores:
+            total1 += team1
+            total2 += team2
+            self._team1.append(total1)
+            self._team2.append(total2)
+
+    def update_from(self, index: int, scores: Iterable[Tuple[int, int]]):
+        """إعادة حساب الصفوف من index فما بعد (بعد تعديل أو حذف)"""
+        del self._team1[index:]
+        del self._team2[index:]
+        self.extend(scores)
+
+    def clear(self):
+        self.update_from(0, ())
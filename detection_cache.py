@@ -0,0 +1,209 @@
+"""
+ذاكرة نتائج كشف البطاقات بالبصمة الإدراكية للصورة
+Detection result cache - perceptual frame signature, LRU + optional SQLite tier
+
+اللاعب كثيراً ما يعيد تصوير نفس الكومة بعد محاولة فاشلة، فالصورة شبه
+مطابقة للسابقة. البصمة صورة رمادية مصغرة إلى SIGNATURE_SIZE (متوسط كل
+خلية)، وصورتان أقصى فرق بين خلاياهما لا يتجاوز MAX_DIFFERENCE تُعتبران نفس
+الصورة وتُعاد النتيجة المحفوظة مباشرة.
+
+البصمات بالبتات (dHash) لا تصلح هنا: على الطاولة المستوية تقلب ضوضاء
+الكاميرا بتات بقدر ما يقلبها تبديل بطاقة. متوسط الخلية يمحو الضوضاء
+(فرق 2-3)، وتغيير رتبة بطاقة واحدة في مكانها يتجاوز الحد. الحد صغير عن
+قصد: نتيجة خاطئة أسوأ من تحليل جديد، فتحريك الكاميرا ولو بكسلين صورة جديدة.
+
+الطبقة الأولى في الذاكرة (LRU)، والثانية اختيارية في ملف SQLite تبقى بين
+التشغيلات وتُبحث عند الإخفاق في الذاكرة. بصمات الملف تُقرأ مرة عند الفتح
+وتبقى في الذاكرة، والأقدم يُحذف دفعة كل DISK_PRUNE إضافة لا مع كل إضافة.
+آمنة للاستدعاء من أكثر من خيط.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+SIGNATURE_SIZE = (64, 48)   # خلايا البصمة (عرض، ارتفاع): 3072 بايت
+MAX_DIFFERENCE = 4          # أقصى فرق خلية (0-255) لصورتين "متطابقتين"
+CACHE_SIZE = 64             # نتائج في الذاكرة
+DISK_SIZE = 512             # نتائج في الملف
+DISK_PRUNE = 64             # إضافات فوق DISK_SIZE قبل حذف الأقدم دفعة واحدة
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    signature   BLOB PRIMARY KEY,
+    cards       TEXT NOT NULL,
+    detect_ms   REAL NOT NULL,
+    used_at     REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def frame_signature(image) -> bytes:
+    """بصمة صورة BGR أو رمادية: متوسطات الخلايا كبايتات"""
+    import cv2
+
+    gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    return cv2.resize(gray, SIGNATURE_SIZE, interpolation=cv2.INTER_AREA).tobytes()
+
+
+def closest(signature: bytes, candidates: List[bytes]) -> Tuple[int, int]:
+    """(رقم أقرب بصمة، أقصى فرق خلية عنها)"""
+    import numpy as np
+
+    target = np.frombuffer(signature, np.uint8).astype(np.int16)
+    others = np.frombuffer(b''.join(candidates), np.uint8).reshape(len(candidates), -1)
+    differences = np.abs(others - target).max(axis=1)
+    index = int(differences.argmin())
+    return index, int(differences[index])
+
+
+class DetectionCache:
+    """LRU للنتائج بالبصمة مع طبقة قرص اختيارية وعدادات الوقت الموفر"""
+
+    def __init__(self, maxsize: int = CACHE_SIZE, path: Optional[str] = None,
+                 disk_size: int = DISK_SIZE, max_difference: int = MAX_DIFFERENCE):
+        self.maxsize = maxsize
+        self.path = path
+        self.disk_size = disk_size
+        self.max_difference = max_difference
+        self._entries: OrderedDict = OrderedDict()  # البصمة -> (البطاقات كقواميس، زمن الكشف ms)
+        self._lock = threading.Lock()
+        self._conn = None
+        self._disk: Dict[bytes, float] = {}     # بصمات الملف -> آخر استخدام
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.saved_ms = 0.0     # مجموع أزمنة الكشف التي وفرتها الإصابات
+        self.lookup_ms = 0.0    # مجموع زمن البصمة والبحث (يُدفع في كل طلب)
+
+        if path:
+            if os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.executescript(SCHEMA)
+            self._disk = dict(self._conn.execute("SELECT signature, used_at FROM results"))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: bytes) -> Optional[List[Dict]]:
+        """البطاقات المحفوظة لأقرب بصمة ضمن max_difference، أو None"""
+        start = time.perf_counter()
+        with self._lock:
+            found = self._find_memory(key)
+            from_disk = found is None and self._conn is not None
+            if from_disk:
+                found = self._find_disk(key)
+            if found is None:
+                self.misses += 1
+            else:
+                cards, detect_ms = found
+                self.hits += 1
+                self.disk_hits += from_disk
+                self.saved_ms += detect_ms
+            self.lookup_ms += (time.perf_counter() - start) * 1000
+        return None if found is None else found[0]
+
+    def put(self, key: bytes, cards: List[Dict], detect_ms: float):
+        with self._lock:
+            self._remember(key, cards, detect_ms)
+            if self._conn is not None:
+                used_at = time.time()
+                try:
+                    with self._conn:
+                        self._conn.execute(
+                            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                            (key, json.dumps(cards), detect_ms, used_at))
+                        self._disk[key] = used_at
+                        if len(self._disk) > self.disk_size + DISK_PRUNE:
+                            self._prune()
+                except sqlite3.Error as e:
+                    print(f"Detection cache error: {e}")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._disk.clear()
+            self.hits = self.disk_hits = self.misses = 0
+            self.saved_ms = self.lookup_ms = 0.0
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute("DELETE FROM results")
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'saved_ms': self.saved_ms,
+            'lookup_ms': self.lookup_ms,
+        }
+
+    # ==================== البحث ====================
+
+    def _remember(self, key, cards, detect_ms):
+        self._entries[key] = (cards, detect_ms)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _find_memory(self, key) -> Optional[Tuple]:
+        if key not in self._entries:
+            if not self._entries:
+                return None
+            keys = list(self._entries)
+            index, difference = closest(key, keys)
+            if difference > self.max_difference:
+                return None
+            key = keys[index]
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    def _prune(self):
+        """حذف الأقدم استخداماً حتى يبقى disk_size (داخل معاملة put)"""
+        old = sorted(self._disk, key=self._disk.get)[:len(self._disk) - self.disk_size]
+        self._conn.executemany("DELETE FROM results WHERE signature = ?",
+                               ((signature,) for signature in old))
+        for signature in old:
+            del self._disk[signature]
+
+    def _find_disk(self, key) -> Optional[Tuple]:
+        if not self._disk:
+            return None
+        signatures = list(self._disk)
+        index, difference = closest(key, signatures)
+        if difference > self.max_difference:
+            return None
+        signature = signatures[index]
+        try:
+            row = self._conn.execute(
+                "SELECT cards, detect_ms FROM results WHERE signature = ?", (signature,)
+            ).fetchone()
+            if row is None:
+                del self._disk[signature]
+                return None
+            cards, detect_ms = row
+            used_at = time.time()
+            with self._conn:
+                self._conn.execute("UPDATE results SET used_at = ? WHERE signature = ?",
+                                   (used_at, signature))
+            self._disk[signature] = used_at
+        except sqlite3.Error as e:
+            print(f"Detection cache error: {e}")
+            return None
+        cards = json.loads(cards)
+        self._remember(signature, cards, detect_ms)
+        return cards, detect_ms
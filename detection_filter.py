@@ -0,0 +1,144 @@
+"""
+تنقية نتائج الكشف بـ NumPy
+Detection post-processing - confidence filter, per-class NMS, duplicate merge
+
+نموذج Roboflow يكشف زاوية المؤشر لا البطاقة كاملة، ولكل بطاقة زاويتان:
+البطاقة الواحدة تأتي غالباً مرتين (وكل زاوية أحياناً بعدة مستطيلات
+متداخلة). processDetections في docs/app.js يعدّ كل نتيجة بطاقة فتتضخم
+الديناري وتقدير الأكلات. هنا على مصفوفات المستطيلات دفعة واحدة:
+1. حذف الثقة الأقل من min_confidence
+2. NMS لكل صنف: المستطيل الأقل ثقة الذي يتداخل (IoU > iou_threshold) مع
+   أقوى منه من نفس الصنف يُحذف
+3. دمج زوايا البطاقة الواحدة: مستطيلان من نفس الصنف بين مركزيهما أقل من
+   merge_distance ضعف أكبر ضلع فيهما بطاقة واحدة (الاتحاد والثقة الأعلى)
+"""
+
+from typing import Tuple
+
+from card_detector import MIN_CONFIDENCE
+
+NMS_IOU = 0.45          # أقصى تداخل بين مستطيلين من نفس الصنف
+MERGE_DISTANCE = 7.0    # الزاويتان المتقابلتان: قطر البطاقة ≈ 6 أضعاف زاوية المؤشر
+
+
+def class_pairs(classes):
+    """(i, j) لكل زوجين i < j من نفس الصنف؛ classes مرتبة (الصنف الواحد متجاور)"""
+    import numpy as np
+
+    n = len(classes)
+    starts = np.flatnonzero(np.r_[True, classes[1:] != classes[:-1]])
+    sizes = np.diff(np.r_[starts, n])
+    partners = np.repeat(starts + sizes, sizes) - np.arange(n) - 1
+    i = np.repeat(np.arange(n), partners)
+    first = np.cumsum(partners) - partners
+    j = np.arange(len(i)) - np.repeat(first, partners) + i + 1
+    return i, j
+
+
+def pair_iou(a, b):
+    """IoU بين كل صف في a والصف المقابل في b (مصفوفتا مستطيلات (M, 4))"""
+    import numpy as np
+
+    w = np.minimum(a[:, 2], b[:, 2]) - np.maximum(a[:, 0], b[:, 0])
+    h = np.minimum(a[:, 3], b[:, 3]) - np.maximum(a[:, 1], b[:, 1])
+    inter = np.clip(w, 0, None) * np.clip(h, 0, None)
+    union = ((a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+             + (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1]) - inter)
+    return np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+
+
+def nms(boxes, scores, classes, iou_threshold: float = NMS_IOU):
+    """
+    أرقام المستطيلات الباقية بعد NMS لكل صنف، مرتبة بالثقة
+
+    التداخل يُحسب لأزواج الصنف الواحد فقط دفعة واحدة. نتيجة NMS الجشع
+    (الأقوى أولاً) هي النقطة الثابتة لـ "يبقى من لا يحذفه أقوى منه باقٍ"،
+    والتكرار يستقر بعدد مرات يساوي أطول سلسلة حذف (مرتان أو ثلاث عادة).
+    """
+    import numpy as np
+
+    n = len(boxes)
+    order = np.lexsort((-scores, classes))      # الصنف ثم الثقة من الأعلى
+    i, j = class_pairs(classes[order])
+    sorted_boxes = boxes[order]
+    over = pair_iou(sorted_boxes[i], sorted_boxes[j]) > iou_threshold
+    i, j = i[over], j[over]     # i أقوى من j
+
+    keep = np.ones(n, bool)
+    while True:
+        suppressed = np.zeros(n, bool)
+        suppressed[j[keep[i]]] = True
+        if np.array_equal(~suppressed, keep):
+            break
+        keep = ~suppressed
+    kept = order[keep]
+    return kept[np.argsort(-scores[kept], kind='stable')]
+
+
+def merge_duplicates(boxes, scores, classes, merge_distance: float = MERGE_DISTANCE):
+    """
+    (المستطيلات، الثقة، الأصناف، عدد المدموج في كل نتيجة) بعد دمج البطاقة الواحدة
+
+    المجموعات مكونات مترابطة: المسافة تُقاس لأزواج الصنف الواحد دفعة واحدة،
+    ورقم المجموعة ينتشر (أصغر رقم بين الطرفين) حتى يستقر.
+    """
+    import numpy as np
+
+    n = len(boxes)
+    if n == 0:
+        return boxes, scores, classes, np.zeros(0, np.intp)
+    order = np.lexsort((-scores, classes))
+    boxes, scores, classes = boxes[order], scores[order], classes[order]
+    i, j = class_pairs(classes)
+    centers = (boxes[:, :2] + boxes[:, 2:]) / 2
+    side = np.maximum(boxes[:, 2] - boxes[:, 0], boxes[:, 3] - boxes[:, 1])
+    distance = np.hypot(*(centers[i] - centers[j]).T)
+    near = distance <= merge_distance * np.maximum(side[i], side[j])
+    i, j = i[near], j[near]
+
+    labels = np.arange(n)
+    while True:
+        spread = labels.copy()
+        np.minimum.at(spread, j, labels[i])
+        np.minimum.at(spread, i, labels[j])
+        if np.array_equal(spread, labels):
+            break
+        labels = spread
+
+    grouped = np.argsort(labels, kind='stable')
+    labels = labels[grouped]
+    starts = np.flatnonzero(np.r_[True, labels[1:] != labels[:-1]])
+    members = boxes[grouped]
+    merged = np.hstack([np.minimum.reduceat(members[:, :2], starts),
+                        np.maximum.reduceat(members[:, 2:], starts)])
+    best = np.maximum.reduceat(scores[grouped], starts)
+    counts = np.diff(np.r_[starts, n])
+    result = np.argsort(-best, kind='stable')
+    return merged[result], best[result], classes[grouped][starts][result], counts[result]
+
+
+def filter_detections(boxes, scores, classes, min_confidence: float = MIN_CONFIDENCE,
+                      iou_threshold: float = NMS_IOU,
+                      merge_distance: float = MERGE_DISTANCE) -> Tuple:
+    """
+    المراحل الثلاث على مصفوفات: boxes (N, 4) بالشكل (x0, y0, x1, y1)،
+    scores (N,)، classes (N,) أعداد صحيحة. merge_distance=0 بدون دمج.
+
+    Returns:
+        (المستطيلات، الثقة، الأصناف، عدد المستطيلات المدموجة في كل بطاقة)
+    """
+    import numpy as np
+
+    boxes = np.asarray(boxes, np.float32).reshape(-1, 4)
+    scores = np.asarray(scores, np.float32)
+    classes = np.asarray(classes, np.intp)
+
+    confident = scores >= min_confidence
+    boxes, scores, classes = boxes[confident], scores[confident], classes[confident]
+    if len(boxes) == 0:
+        return boxes, scores, classes, np.zeros(0, np.intp)
+    keep = nms(boxes, scores, classes, iou_threshold)
+    boxes, scores, classes = boxes[keep], scores[keep], classes[keep]
+    if merge_distance <= 0:
+        return boxes, scores, classes, np.ones(len(boxes), np.intp)
+    return merge_duplicates(boxes, scores, classes, merge_distance)
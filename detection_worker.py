@@ -0,0 +1,127 @@
+"""
+كشف البطاقات في خيوط خلفية
+Detection worker - runs CardDetector off the Kivy main thread
+
+الواجهة تسلّم الصورة (submit) وتعود فوراً، وخيط عامل يشغّل detect_cards
+ثم تصل النتيجة إلى الدالة في خيط الواجهة عبر Clock.schedule_once.
+
+لكل طلب رقم جيل: طلب أحدث أو cancel() يلغي كل ما قبله. الطلب المنتظر لا
+يبدأ، والجاري تُهمل نتيجته (detect_cards لا يمكن إيقافه في منتصفه، لذلك
+يوجد أكثر من خيط: الطلب الجديد لا ينتظر انتهاء طلب ملغى).
+الانتظار خانة واحدة: إذا جاءت الصور أسرع من التحليل يُحلَّل الأحدث فقط.
+"""
+
+import threading
+import time
+from typing import Callable, List, Optional
+
+from kivy.clock import Clock
+
+WORKERS = 2
+
+
+class DetectionWorker:
+    """مجموعة خيوط لـ detect_cards مع إلغاء الطلبات القديمة"""
+
+    def __init__(self, detector, workers: int = WORKERS):
+        self.detector = detector
+        self.last_ms = None         # زمن آخر تحليل وصلت نتيجته
+        self.delivered = 0
+        self.cancelled = 0          # طلبات لم تبدأ أو أُهملت نتيجتها
+        self._cond = threading.Condition()
+        self._pending = None
+        self._running = 0
+        self._generation = 0
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._run, name=f'DetectionWorker-{i}', daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, image, callback: Callable[[List], None],
+               analyse: Optional[Callable] = None) -> int:
+        """
+        طلب تحليل يلغي كل الطلبات السابقة
+
+        Args:
+            image: ما يقبله detect_cards، أو دالة بدون معاملات تعيده
+                   (تُستدعى في الخيط العامل، للتحويلات المكلفة)
+            callback: تُستدعى في خيط الواجهة بقائمة DetectedCard
+            analyse: بدل detect_cards (مثلاً detector.locate_cards)
+        """
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("DetectionWorker مغلق")
+            self._generation += 1
+            if self._pending is not None:
+                self.cancelled += 1
+            self._pending = (self._generation, image, callback, analyse)
+            self._cond.notify()
+            return self._generation
+
+    def cancel(self):
+        """إلغاء كل الطلبات (مثلاً عند مغادرة الشاشة)"""
+        with self._cond:
+            self._generation += 1
+            if self._pending is not None:
+                self.cancelled += 1
+                self._pending = None
+
+    @property
+    def busy(self) -> bool:
+        with self._cond:
+            return self._pending is not None or self._running > 0
+
+    def close(self):
+        """إيقاف الخيوط بدون انتظار التحليل الجاري"""
+        with self._cond:
+            self._closed = True
+            self._generation += 1
+            self._pending = None
+            self._cond.notify_all()
+
+    def _stale(self, generation) -> bool:
+        with self._cond:
+            if generation == self._generation:
+                return False
+            self.cancelled += 1
+            return True
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                generation, image, callback, analyse = self._pending
+                self._pending = None
+                self._running += 1
+            try:
+                start = time.perf_counter()
+                if callable(image):
+                    image = image()
+                if self._stale(generation):
+                    continue
+                cards = (analyse or self.detector.detect_cards)(image)
+                elapsed = (time.perf_counter() - start) * 1000
+            except Exception as e:
+                print(f"Detection worker error: {e}")
+                cards, elapsed = [], None
+            finally:
+                with self._cond:
+                    self._running -= 1
+
+            if not self._stale(generation):
+                Clock.schedule_once(
+                    lambda dt, g=generation, c=callback, r=cards, ms=elapsed: self._deliver(g, c, r, ms))
+
+    def _deliver(self, generation, callback, cards, elapsed):
+        # فحص أخير في خيط الواجهة: cancel() ربما جاء بعد انتهاء التحليل
+        if self._stale(generation):
+            return
+        self.delivered += 1
+        self.last_ms = elapsed
+        callback(cards)
@@ -12,6 +12,92 @@ const POINTS = {
     roundTotal: -500  // مجموع الجولة
 };
 
+// ========== محرك القواعد ==========
+// ترتيب البطاقات الخاصة في الترميز (نفس rules_engine.CARD_KEYS)
+const CARD_ORDER = ['spade', 'diamond', 'heart', 'club', 'king'];
+const CARD_PRESENT = 1;              // موجودة
+const CARD_PRESENT_DOUBLED = 2;      // موجودة ودبّلها الخصم
+const CARD_DOUBLED_TO_OPPONENT = 3;  // ناقصة ودبّلها الفريق للخصم
+const FIELD_MAX = 15;                // أقصى قيمة في حقل الأكلات أو الديناري (4 بتات)
+
+// نقاط حالات البطاقات الخاصة (بتان لكل بطاقة)
+function cardPoints(cards, points) {
+    let cardTotal = 0;
+    CARD_ORDER.forEach((card, bit) => {
+        const state = (cards >> (2 * bit)) & 3;
+        const value = card === 'king' ? points.kingHeart : points.queen;
+        if (state === CARD_DOUBLED_TO_OPPONENT) cardTotal += value;
+        else if (state === CARD_PRESENT_DOUBLED) cardTotal -= value * 2;
+        else if (state === CARD_PRESENT) cardTotal -= value;
+    });
+    return cardTotal;
+}
+
+/**
+ * تحويل جدول النقاط إلى جدول نتائج لكل حالات الجولة (مرة واحدة)
+ * الترميز: الأكلات (4 بتات) | الديناري (4 بتات) | حالات البطاقات (بتان لكل بطاقة)
+ */
+function compileRules(points) {
+    const table = new Int32Array(1 << 18);
+    for (let cards = 0; cards < 1 << 10; cards++) {
+        const cardTotal = cardPoints(cards, points);
+        for (let diamonds = 0; diamonds < 16; diamonds++) {
+            for (let tricks = 0; tricks < 16; tricks++) {
+                table[tricks | (diamonds << 4) | (cards << 8)] =
+                    cardTotal - tricks * points.trick - diamonds * points.diamond;
+            }
+        }
+    }
+    return { points, table };
+}
+
+// حالات البطاقات الخاصة في الجولة (10 بتات)
+function encodeCards(round) {
+    let cards = 0;
+    CARD_ORDER.forEach((card, bit) => {
+        const present = card === 'king' ? round.hasKing : round.queens.includes(card);
+        let state = 0;
+        if (present) {
+            state = round.opponentDoubled[card] ? CARD_PRESENT_DOUBLED : CARD_PRESENT;
+        } else if (round.myDoubled[card]) {
+            state = CARD_DOUBLED_TO_OPPONENT;
+        }
+        cards |= state << (2 * bit);
+    });
+    return cards;
+}
+
+function inField(value) {
+    return Number.isInteger(value) && value >= 0 && value <= FIELD_MAX;
+}
+
+// ترميز الجولة الحالية (فهرس في جدول النتائج)، أو -1 إذا خرج حقل عن 4 بتات
+function encodeRound(round) {
+    if (!inField(round.tricks) || !inField(round.diamonds)) return -1;
+    return round.tricks | (round.diamonds << 4) | (encodeCards(round) << 8);
+}
+
+// نقاط الفريق المختار: من الجدول، أو بالحساب المباشر لقيم خارج الترميز
+function roundScore(round, compiled) {
+    const code = encodeRound(round);
+    if (code >= 0) return compiled.table[code];
+    const points = compiled.points;
+    return cardPoints(encodeCards(round), points)
+        - round.tricks * points.trick - round.diamonds * points.diamond;
+}
+
+// القواعد الحالية - تُبنى عند أول حساب وتعاد عند تغيير القواعد فقط
+let activeRules = null;
+
+function useRules(points) {
+    activeRules = compileRules(points);
+    return activeRules;
+}
+
+function rules() {
+    return activeRules || useRules(POINTS);
+}
+
 // ========== حالة اللعبة ==========
 let gameState = {
     team1Name: 'فريقنا',
@@ -273,39 +359,13 @@ function toggleDoublingCard(btn) {
 // ========== حساب النتيجة ==========
 function calculateAndFinish() {
     const round = gameState.currentRound;
-    let selectedTeamScore = 0;
-    
-    // حساب الأكلات
-    selectedTeamScore -= round.tricks * POINTS.trick;
+    const compiled = rules();
     
-    // حساب الديناري
-    selectedTeamScore -= round.diamonds * POINTS.diamond;
-    
-    // حساب البنات
-    round.queens.forEach(suit => {
-        const doubled = round.opponentDoubled[suit];
-        selectedTeamScore -= POINTS.queen * (doubled ? 2 : 1);
-    });
-    
-    // حساب شيخ القبة
-    if (round.hasKing) {
-        const doubled = round.opponentDoubled['king'];
-        selectedTeamScore -= POINTS.kingHeart * (doubled ? 2 : 1);
-    }
-    
-    // حساب التدبيل على الخصم
-    Object.entries(round.myDoubled).forEach(([card, isDoubled]) => {
-        if (isDoubled) {
-            if (card === 'king') {
-                selectedTeamScore += POINTS.kingHeart; // استرداد المضاعفة
-            } else {
-                selectedTeamScore += POINTS.queen;
-            }
-        }
-    });
+    // ترميز الجولة ثم قراءة النتيجة من جدول القواعد
+    const selectedTeamScore = roundScore(round, compiled);
     
     // حساب نقاط الفريق الآخر
-    const otherTeamScore = POINTS.roundTotal - selectedTeamScore;
+    const otherTeamScore = compiled.points.roundTotal - selectedTeamScore;
     
     // تحديد نقاط كل فريق حسب الاختيار
     let team1Score, team2Score;
@@ -389,7 +449,7 @@ function showHistory() {
     // المجموع
     const summary = document.getElementById('total-summary');
     const total = gameState.team1Total + gameState.team2Total;
-    const expected = gameState.roundNumber * POINTS.roundTotal;
+    const expected = gameState.roundNumber * rules().points.roundTotal;
     summary.innerHTML = `
         المجموع: ${gameState.team1Total} + ${gameState.team2Total} = ${total}<br>
         <small style="color: var(--text-secondary)">المتوقع: ${expected}</small>
@@ -670,7 +730,7 @@ function useDetectionResults() {
     if (!detectedResults) return;
     
     // تطبيق النتائج على الجولة الحالية
-    gameState.currentRound.tricks = detectedResults.tricks;
+    gameState.currentRound.tricks = Math.min(13, detectedResults.tricks);
     gameState.currentRound.diamonds = Math.min(13, detectedResults.diamonds);
     gameState.currentRound.queens = detectedResults.queens;
     gameState.currentRound.hasKing = detectedResults.kingOfHearts;
@@ -0,0 +1,83 @@
+"""
+قائمة السجل المعاد استخدام صفوفها
+Virtualized history list - only the visible rows hold widgets
+
+RecycleView ينشئ عناصر للصفوف الظاهرة فقط ويعيد تعبئتها أثناء التمرير.
+صفوف السجل كلها بنفس الارتفاع، لذلك UniformRowLayout يحسب موقع الصف من
+رقمه مباشرة بدل المرور على كل الصفوف (كما يفعل RecycleBoxLayout) عند كل
+إضافة أو تغيير في الحجم: إضافة جولة لسجل من 10 آلاف جولة لا تكلف أكثر
+من إضافتها لسجل من 10 جولات.
+"""
+
+from kivy.metrics import dp
+from kivy.properties import NumericProperty
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.uix.recyclelayout import RecycleLayout
+from kivy.uix.recycleview import RecycleView
+
+
+class UniformRowLayout(RecycleBoxLayout):
+    """تخطيط عمودي لصفوف بارتفاع ثابت (الصف 0 في الأعلى)"""
+
+    row_height = NumericProperty(dp(40))
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('orientation', 'vertical')
+        kwargs.setdefault('size_hint_y', None)
+        super().__init__(**kwargs)
+        self.default_size = (None, self.row_height)
+        self.default_size_hint = (1, None)
+        self._count = 0
+        self._width = None
+        self.bind(minimum_height=self.setter('height'))
+
+    def _step(self):
+        return self.row_height + self.spacing
+
+    def _row_top(self, index):
+        return self.y + self.height - self.padding[1] - index * self._step()
+
+    def compute_layout(self, data, flags):
+        RecycleLayout.compute_layout(self, data, flags)
+        self._changed_views = None
+
+        left, top, right, bottom = self.padding
+        count = len(data)
+        height = top + bottom + max(0, count * self._step() - self.spacing)
+        if self.width != self._width:
+            self.clear_layout()     # العرض تغير: إعادة تحجيم الصفوف الظاهرة
+        self._count, self._width = count, self.width
+        self.minimum_size = left + right, height
+
+    def get_view_index_at(self, pos):
+        index = int((self._row_top(0) - pos[1]) // self._step())
+        return min(max(index, 0), max(self._count - 1, 0))
+
+    def compute_visible_views(self, data, viewport):
+        if not data:
+            return []
+        x, y, w, h = viewport
+        first = self.get_view_index_at((x, y + h))
+        last = self.get_view_index_at((x, y))
+        return list(range(first, last + 1))
+
+    def refresh_view_layout(self, index, layout, view, viewport):
+        left, _, right, _ = self.padding
+        size = [self.width - left - right, self.row_height]
+        pos = [self.x + left, self._row_top(index) - self.row_height]
+        opt = self.view_opts[index]
+        opt['size'], opt['pos'] = size, pos
+        layout['size'], layout['pos'] = list(size), list(pos)
+        super().refresh_view_layout(index, layout, view, viewport)
+
+
+class HistoryList(RecycleView):
+    """قائمة صفوف بارتفاع ثابت؛ on_row_release(index) عند الضغط على صف"""
+
+    def __init__(self, viewclass, row_height=dp(40), spacing=dp(3), on_row_release=None,
+                 **kwargs):
+        self.on_row_release = on_row_release
+        super().__init__(**kwargs)
+        self.layout = UniformRowLayout(row_height=row_height, spacing=spacing)
+        self.add_widget(self.layout)
+        self.viewclass = viewclass
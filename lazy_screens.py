@@ -0,0 +1,83 @@
+"""
+مدير شاشات يبني الشاشات عند الحاجة
+Lazy ScreenManager - screens are declared by name and built on first use
+
+الشاشات تُسجّل باسمها ودالة تنشئها، ولا تُبنى إلا عند أول انتقال إليها
+(sm.current = 'history'). بعد ظهور الشاشة الأولى يمكن بناء الباقي في
+أوقات الفراغ: شاشة واحدة في الإطار، وفقط بعد إطار انتهى ضمن الميزانية،
+حتى لا يتقطع انتقال أو لمس جارٍ.
+"""
+
+import time
+from typing import Callable, Dict
+
+from kivy.clock import Clock
+from kivy.uix.screenmanager import Screen, ScreenManager
+
+PREBUILD_DELAY = 1.0        # ثواني بعد التشغيل قبل البدء بالبناء المسبق
+FRAME_BUDGET = 1 / 40       # إطار أطول من هذا يعني أن التطبيق مشغول
+
+
+class LazyScreenManager(ScreenManager):
+    """ScreenManager مع سجل شاشات تُبنى عند أول استخدام"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._factories: Dict[str, Callable[[], Screen]] = {}
+        self._prebuild_event = None
+        self.build_times: Dict[str, float] = {}     # زمن إنشاء كل شاشة (ms)
+
+    def register(self, name: str, factory: Callable[[], Screen]):
+        """تسجيل شاشة بدون بنائها"""
+        self._factories[name] = factory
+
+    @property
+    def pending(self):
+        """أسماء الشاشات المسجلة التي لم تُبنَ بعد"""
+        return list(self._factories)
+
+    def build_screen(self, name: str) -> Screen:
+        factory = self._factories.pop(name)
+        start = time.perf_counter()
+        screen = factory()
+        if screen.name != name:
+            raise ValueError(f"الشاشة المسجلة باسم {name} اسمها {screen.name}")
+        self.add_widget(screen)
+        self.build_times[name] = (time.perf_counter() - start) * 1000
+        return screen
+
+    # الانتقال (current) والبحث يمران من هنا، فالشاشة تُبنى عند أول طلب
+    def get_screen(self, name):
+        if name in self._factories:
+            return self.build_screen(name)
+        return super().get_screen(name)
+
+    def has_screen(self, name):
+        return name in self._factories or super().has_screen(name)
+
+    # ==================== البناء المسبق ====================
+
+    def prebuild_when_idle(self, delay: float = PREBUILD_DELAY, budget: float = FRAME_BUDGET):
+        """بناء الشاشات المتبقية في الخلفية بعد delay ثانية"""
+        self.cancel_prebuild()
+        self._prebuild_event = Clock.schedule_once(
+            lambda dt: self._start_prebuild(budget), delay
+        )
+
+    def _start_prebuild(self, budget: float):
+        self._prebuild_event = Clock.schedule_interval(
+            lambda dt: self._prebuild_step(dt, budget), 0
+        )
+
+    def _prebuild_step(self, dt: float, budget: float):
+        if not self._factories:
+            self._prebuild_event = None
+            return False
+        if dt > budget:
+            return  # الإطار السابق كان ثقيلاً (انتقال، لمس، أو بناء شاشة سابقة)
+        self.build_screen(next(iter(self._factories)))
+
+    def cancel_prebuild(self):
+        if self._prebuild_event is not None:
+            self._prebuild_event.cancel()
+            self._prebuild_event = None
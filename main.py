@@ -5,7 +5,7 @@ Modern Version
 """
 
 from kivy.app import App
-from kivy.uix.screenmanager import ScreenManager, SlideTransition
+from kivy.uix.screenmanager import SlideTransition
 from kivy.core.window import Window
 from kivy.core.text import LabelBase
 from kivy.utils import platform
@@ -32,12 +32,32 @@ from modern_ui import (
     SettingsScreen
 )
 
-from app_config import POINTS
+from arabic_text import shaping_cache
+from lazy_screens import LazyScreenManager
+from cc_core import rules as rules_engine
+from cc_core.game_log import GameLog
+from cc_core.totals import RoundTotals
+
+# (الاسم، الشاشة) بترتيب البناء المسبق: الأقرب استخداماً بعد الترحيب أولاً
+SCREENS = [
+    ('welcome', WelcomeScreen),
+    ('game', GameScreen),
+    ('counting', CountingScreen),
+    ('doubling', DoublingScreen),
+    ('history', HistoryScreen),
+    ('camera', CameraScreen),
+    ('camera_result', CameraResultScreen),
+    ('counting_from_camera', CountingFromCameraScreen),
+    ('settings', SettingsScreen),
+]
 
 
 class CCCounterApp(App):
     """التطبيق الرئيسي"""
     
+    # بناء باقي الشاشات في أوقات الفراغ بعد ظهور شاشة الترحيب
+    prebuild_screens = True
+    
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.title = "CC Counter"
@@ -49,8 +69,15 @@ class CCCounterApp(App):
         self.team2_total = 0
         self.round_number = 0
         self.history = []
+        self.totals = RoundTotals()     # مجاميع تراكمية تدعم تعديل الجولات
         self.current_round_data = {}
         
+        # سجل الأحداث لاستئناف اللعبة بعد الإغلاق
+        self.game_log = None
+        
+        # أرشيف كل الألعاب السابقة (SQLite، الكتابة في خيط خلفي)
+        self.archive = None
+        
         # إعدادات API
         self.api_key = ""
         self._load_api_key()
@@ -62,20 +89,26 @@ class CCCounterApp(App):
         if platform not in ('android', 'ios'):
             Window.size = (400, 750)
         
+        # نصوص الواجهة المشكّلة من التشغيل السابق
+        try:
+            shaping_cache.load(self._shaping_cache_path())
+        except Exception as e:
+            print(f"Shaping cache error: {e}")
+        
+        # آخر لعبة من سجلها قبل بناء الشاشات
+        self._resume_game()
+        
         # مدير الشاشات
-        self.sm = ScreenManager(transition=SlideTransition())
+        self.sm = LazyScreenManager(transition=SlideTransition())
         self.sm.app = self
         
-        # إضافة الشاشات
-        self.sm.add_widget(WelcomeScreen())
-        self.sm.add_widget(GameScreen())
-        self.sm.add_widget(CameraScreen())
-        self.sm.add_widget(CameraResultScreen())
-        self.sm.add_widget(CountingFromCameraScreen())
-        self.sm.add_widget(CountingScreen())
-        self.sm.add_widget(DoublingScreen())
-        self.sm.add_widget(HistoryScreen())
-        self.sm.add_widget(SettingsScreen())
+        # الشاشات تُبنى عند أول انتقال إليها؛ شاشة الترحيب فقط عند التشغيل
+        for name, screen in SCREENS:
+            self.sm.register(name, screen)
+        self.sm.current = 'welcome'
+        
+        if self.prebuild_screens:
+            self.sm.prebuild_when_idle()
         
         return self.sm
     
@@ -85,11 +118,133 @@ class CCCounterApp(App):
         self.team2_total = 0
         self.round_number = 0
         self.history = []
+        self.totals = RoundTotals()
         self.current_round_data = {}
+        
+        previous_game = self._game_id()
+        if self.game_log:
+            try:
+                self.game_log.start_game(self.team1_name, self.team2_name)
+            except Exception as e:
+                print(f"Game log error: {e}")
+        
+        if previous_game:
+            self._archive('finish_game', previous_game)
+        self._archive_start()
+    
+    def record_round(self, entry):
+        """تسجيل نتيجة جولة منتهية"""
+        self.totals.add(entry['round'], entry['team1'], entry['team2'])
+        self.history.append(entry)
+        self._sync_totals()
+        
+        if self.game_log:
+            try:
+                self.game_log.round_finalized(entry)
+            except Exception as e:
+                print(f"Game log error: {e}")
+        
+        self._archive('add_entry', self._game_id(), entry)
+    
+    def edit_round(self, round_number, team1_score):
+        """تصحيح نتيجة جولة سابقة"""
+        team2_score = rules_engine.active().round_total - team1_score
+        self.totals.edit(round_number, team1_score, team2_score)
+        
+        for entry in self.history:
+            if entry['round'] == round_number:
+                entry['team1'] = team1_score
+                entry['team2'] = team2_score
+                entry.pop('state', None)  # الترميز لم يعد يطابق النتيجة
+                break
+        self._sync_totals()
+        
+        if self.game_log:
+            try:
+                self.game_log.round_edited(round_number, team1_score, team2_score)
+            except Exception as e:
+                print(f"Game log error: {e}")
+        
+        self._archive('edit_round', self._game_id(), round_number, team1_score, team2_score)
+    
+    def delete_round(self, round_number):
+        """حذف جولة من السجل"""
+        self.totals.delete(round_number)
+        self.history = [e for e in self.history if e['round'] != round_number]
+        self._sync_totals()
+        
+        if self.game_log:
+            try:
+                self.game_log.round_deleted(round_number)
+            except Exception as e:
+                print(f"Game log error: {e}")
+        
+        self._archive('delete_round', self._game_id(), round_number)
+    
+    def _sync_totals(self):
+        self.team1_total = self.totals.team1_total
+        self.team2_total = self.totals.team2_total
+    
+    def _game_id(self):
+        """معرّف اللعبة الحالية في سجل الأحداث"""
+        state = self.game_log.state if self.game_log else None
+        return getattr(state, 'game_id', None)
+    
+    def _archive(self, method, *args):
+        """تمرير تغيير للأرشيف (لا ينتظر القرص)"""
+        if not self.archive or not args[0]:
+            return
+        try:
+            getattr(self.archive, method)(*args)
+        except Exception as e:
+            print(f"Archive error: {e}")
+    
+    def _archive_start(self):
+        """تسجيل اللعبة الحالية وجولاتها في الأرشيف (مكررة بلا أثر، بدون قراءة القرص)"""
+        game_id = self._game_id()
+        if not game_id or not self.archive:
+            return
+        self._archive('start_game', game_id, self.team1_name, self.team2_name)
+        for entry in self.history:
+            self._archive('add_entry', game_id, entry)
+    
+    def _resume_game(self):
+        """استئناف آخر لعبة من سجل الأحداث"""
+        try:
+            # sqlite3 قد لا يكون في البناء: التطبيق يعمل بدون أرشيف
+            from cc_core.archive import GameArchive
+            self.archive = GameArchive(os.path.join(self.user_data_dir, 'archive.db'))
+        except Exception as e:
+            print(f"Archive error: {e}")
+        
+        try:
+            self.game_log = GameLog(os.path.join(self.user_data_dir, 'games'))
+            state = self.game_log.resume()
+        except Exception as e:
+            print(f"Game log error: {e}")
+            self.game_log = None    # بدون سجل: الجولات في الذاكرة فقط
+            return
+        
+        if state is None:
+            # التشغيل الأول: لعبة مفتوحة حتى لو اختار المستخدم "متابعة"
+            self.game_log.start_game(self.team1_name, self.team2_name)
+            self._archive_start()
+            return
+        self.team1_name = state.team1_name
+        self.team2_name = state.team2_name
+        self.team1_total = state.team1_total
+        self.team2_total = state.team2_total
+        self.round_number = state.round_number
+        self.history = [dict(entry) for entry in state.history]
+        self.totals = RoundTotals.from_history(self.history)
+        self._archive_start()
+    
+    def _shaping_cache_path(self):
+        return os.path.join(self.user_data_dir, 'shaping_cache.json')
     
     def get_expected_total(self):
         """المجموع المتوقع"""
-        return self.round_number * POINTS['round_total']
+        return len(self.totals) * rules_engine.active().round_total
     
     def _load_api_key(self):
         """تحميل مفتاح API من الملف"""
@@ -106,7 +261,19 @@ class CCCounterApp(App):
         print("  CC Counter - عداد الكومبلكس شراكة")
         print("=" * 50)
     
+    def on_pause(self):
+        # الأحداث محفوظة فوراً، لذلك يمكن للنظام إيقاف التطبيق بأمان
+        return True
+    
     def on_stop(self):
+        if self.game_log:
+            self.game_log.close()
+        if self.archive:
+            self.archive.close()
+        try:
+            shaping_cache.save(self._shaping_cache_path())
+        except Exception as e:
+            print(f"Shaping cache error: {e}")
         print("تم إغلاق التطبيق")
 
 
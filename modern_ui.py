@@ -13,7 +13,10 @@ from kivy.uix.popup import Popup
 from kivy.uix.togglebutton import ToggleButton
 from kivy.uix.textinput import TextInput
 from kivy.uix.widget import Widget
-from kivy.graphics import Color, Rectangle, RoundedRectangle, Line, Ellipse, Triangle
+from kivy.uix.behaviors import ButtonBehavior
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.graphics import (Color, Rectangle, RoundedRectangle, Line, Ellipse, Triangle,
+                           PushMatrix, PopMatrix, Translate)
 from kivy.properties import StringProperty, NumericProperty, BooleanProperty, ListProperty
 from kivy.clock import Clock
 from kivy.core.text import LabelBase
@@ -21,12 +24,16 @@ from kivy.metrics import dp
 from kivy.utils import platform
 
 import os
+from functools import partial
 
-# مكتبات دعم النص العربي
-import arabic_reshaper
-from bidi.algorithm import get_display
+# دعم النص العربي (تشكيل مع ذاكرة مؤقتة)
+from arabic_text import shaping_cache
+from card_atlas import card_atlas
+from history_list import HistoryList
 
-from app_config import COLORS, SUIT_NAMES, POINTS
+from app_config import COLORS, SUIT_NAMES
+from cc_core import rules as rules_engine
+from cc_core.totals import PrefixTotals
 
 # مسار الخط العربي
 FONT_PATH = os.path.join(os.path.dirname(__file__), 'fonts', 'NotoSansArabic.ttf')
@@ -38,8 +45,7 @@ def arabic(text):
     if not text:
         return text
     try:
-        reshaped = arabic_reshaper.reshape(str(text))
-        return get_display(reshaped)
+        return shaping_cache.get(str(text))
     except:
         return str(text)
 
@@ -119,6 +125,10 @@ class CardWidget(ToggleButton):
     suit = StringProperty('heart')
     rank = StringProperty('Q')
     
+    # الرسم من أطلس البطاقات (False: رسم الأشكال مباشرة في كل مرة)
+    use_atlas = True
+    ATLAS_MARGIN = 2    # نصف عرض الإطار يقع خارج البطاقة
+    
     def __init__(self, suit='heart', rank='Q', **kwargs):
         super().__init__(**kwargs)
         self.suit = suit
@@ -130,57 +140,91 @@ class CardWidget(ToggleButton):
         self.size = (dp(70), dp(100))
         self.text = ''
         
-        self.bind(state=self._on_state)
-        self.bind(pos=self._draw, size=self._draw)
-        Clock.schedule_once(lambda dt: self._draw(), 0)
-    
-    def _on_state(self, *args):
-        self._draw()
+        with self.canvas.before:
+            Color(1, 1, 1, 1)
+            self._rect = Rectangle(pos=self.pos, size=(0, 0))
+        
+        # عدة تغييرات في نفس الإطار (الحجم ثم الحالة) = رسم واحد
+        self._redraw = Clock.create_trigger(self._draw)
+        self.bind(state=self._redraw, suit=self._redraw, size=self._redraw)
+        self.bind(pos=self._on_pos)
+        self._redraw()
+    
+    def _on_pos(self, *args):
+        if self.use_atlas:
+            self._rect.pos = (self.x - self.ATLAS_MARGIN, self.y - self.ATLAS_MARGIN)
+        else:
+            self._redraw()
     
     def _draw(self, *args):
-        self.canvas.before.clear()
+        if not self.use_atlas:
+            return self._draw_direct()
+        
+        # الإطار يتجاوز حافة البطاقة، فالصورة أكبر منها بهامش من كل جهة
+        suit, state = self.suit, self.state
+        m = self.ATLAS_MARGIN
+        w, h = self.width + 2 * m, self.height + 2 * m
+        self._rect.texture = card_atlas.texture(
+            (suit, state, int(round(w)), int(round(h))), (w, h),
+            lambda pw, ph: self._paint_at_margin(suit, state, pw, ph)
+        )
+        self._rect.pos = (self.x - m, self.y - m)
+        self._rect.size = (w, h)
+    
+    @classmethod
+    def _paint_at_margin(cls, suit, state, w, h):
+        m = cls.ATLAS_MARGIN
+        Translate(m, m)
+        cls.paint(suit, state, w - 2 * m, h - 2 * m)
+    
+    def _draw_direct(self):
         self.canvas.after.clear()
+        self._rect.size = (0, 0)
+        with self.canvas.after:
+            PushMatrix()
+            Translate(*self.pos)
+            self.paint(self.suit, self.state, *self.size)
+            PopMatrix()
+    
+    @classmethod
+    def paint(cls, suit, state, w, h):
+        """تعليمات رسم البطاقة من (0, 0) في canvas الحالي"""
+        # خلفية البطاقة
+        if state == 'down':
+            Color(0.15, 0.65, 0.3, 1)  # أخضر عند الاختيار
+        else:
+            Color(1, 1, 1, 1)  # أبيض
+        RoundedRectangle(pos=(0, 0), size=(w, h), radius=[dp(8)])
         
-        x, y = self.pos
-        w, h = self.size
-        
-        with self.canvas.before:
-            # خلفية البطاقة
-            if self.state == 'down':
-                Color(0.15, 0.65, 0.3, 1)  # أخضر عند الاختيار
-            else:
-                Color(1, 1, 1, 1)  # أبيض
-            RoundedRectangle(pos=self.pos, size=self.size, radius=[dp(8)])
-            
-            # إطار
-            if self.state == 'down':
-                Color(0.1, 0.5, 0.2, 1)
-            else:
-                Color(0.4, 0.4, 0.4, 1)
-            Line(rounded_rectangle=(x, y, w, h, dp(8)), width=2)
+        # إطار
+        if state == 'down':
+            Color(0.1, 0.5, 0.2, 1)
+        else:
+            Color(0.4, 0.4, 0.4, 1)
+        Line(rounded_rectangle=(0, 0, w, h, dp(8)), width=2)
         
-        with self.canvas.after:
-            # لون الرمز
-            if self.suit in ['heart', 'diamond']:
-                Color(0.9, 0.15, 0.15, 1)  # أحمر
-            else:
-                Color(0.15, 0.15, 0.15, 1)  # أسود
-            
-            # رسم الرمز في المنتصف
-            cx = x + w / 2
-            cy = y + h * 0.55
-            sz = min(w, h) * 0.32
-            
-            if self.suit == 'heart':
-                self._draw_heart(cx, cy, sz)
-            elif self.suit == 'diamond':
-                self._draw_diamond(cx, cy, sz)
-            elif self.suit == 'spade':
-                self._draw_spade(cx, cy, sz)
-            elif self.suit == 'club':
-                self._draw_club(cx, cy, sz)
-    
-    def _draw_heart(self, cx, cy, size):
+        # لون الرمز
+        if suit in ['heart', 'diamond']:
+            Color(0.9, 0.15, 0.15, 1)  # أحمر
+        else:
+            Color(0.15, 0.15, 0.15, 1)  # أسود
+        
+        # رسم الرمز في المنتصف
+        cx = w / 2
+        cy = h * 0.55
+        sz = min(w, h) * 0.32
+        
+        if suit == 'heart':
+            cls._draw_heart(cx, cy, sz)
+        elif suit == 'diamond':
+            cls._draw_diamond(cx, cy, sz)
+        elif suit == 'spade':
+            cls._draw_spade(cx, cy, sz)
+        elif suit == 'club':
+            cls._draw_club(cx, cy, sz)
+    
+    @staticmethod
+    def _draw_heart(cx, cy, size):
         """رسم شكل قلب محسن"""
         r = size * 0.45
         # الدائرتين العلويتين
@@ -193,7 +237,8 @@ class CardWidget(ToggleButton):
             cx, cy - size*0.95
         ])
     
-    def _draw_diamond(self, cx, cy, size):
+    @staticmethod
+    def _draw_diamond(cx, cy, size):
         """رسم شكل ماسة"""
         # مثلثين
         Triangle(points=[
@@ -207,7 +252,8 @@ class CardWidget(ToggleButton):
             cx + size*0.55, cy
         ])
     
-    def _draw_spade(self, cx, cy, size):
+    @staticmethod
+    def _draw_spade(cx, cy, size):
         """رسم شكل بستوني محسن"""
         r = size * 0.4
         # الدائرتين الجانبيتين
@@ -226,7 +272,8 @@ class CardWidget(ToggleButton):
             cx, cy - size*0.95
         ])
     
-    def _draw_club(self, cx, cy, size):
+    @staticmethod
+    def _draw_club(cx, cy, size):
         """رسم شكل سباتي/نادي محسن"""
         r = size * 0.38
         # ثلاث دوائر
@@ -531,6 +578,7 @@ class GameScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.name = 'game'
+        self._shown = {}    # القيم المعروضة حالياً، لتحديث ما تغير فقط
         Clock.schedule_once(lambda dt: self._build(), 0)
     
     def _build(self):
@@ -572,6 +620,31 @@ class GameScreen(Screen):
         scroll.add_widget(self.content)
         layout.add_widget(scroll)
         
+        # نتيجة آخر جولة (تُنشأ مرة واحدة وتُحدّث نصوصها)
+        self.last_box = BoxLayout(orientation='vertical', size_hint_y=None, height=dp(100), padding=dp(10))
+        with self.last_box.canvas.before:
+            Color(*COLORS['card'])
+            self.last_bg = RoundedRectangle(pos=self.last_box.pos, size=self.last_box.size, radius=[dp(10)])
+        self.last_box.bind(pos=lambda *a: setattr(self.last_bg, 'pos', self.last_box.pos),
+                           size=lambda *a: setattr(self.last_bg, 'size', self.last_box.size))
+        
+        self.last_title = ArabicLabel(text="", font_size=dp(14), color=COLORS['text_secondary'])
+        self.last_box.add_widget(self.last_title)
+        
+        row = BoxLayout()
+        self.last_team1 = ArabicLabel(text="")
+        self.last_team2 = ArabicLabel(text="")
+        row.add_widget(self.last_team1)
+        row.add_widget(self.last_team2)
+        self.last_box.add_widget(row)
+        
+        self.empty_lbl = ArabicLabel(
+            text="اضغط لبدء جولة جديدة",
+            color=COLORS['text_secondary'],
+            size_hint_y=None,
+            height=dp(80)
+        )
+        
         # الأزرار
         buttons = BoxLayout(orientation='vertical', size_hint_y=None, height=dp(180), spacing=dp(8))
         
@@ -632,48 +705,52 @@ class GameScreen(Screen):
     def on_enter(self):
         self._refresh()
     
+    def _changed(self, key, value):
+        """True إذا تغيرت القيمة منذ آخر عرض"""
+        if key in self._shown and self._shown[key] == value:
+            return False
+        self._shown[key] = value
+        return True
+    
     def _refresh(self):
         app = self.manager.app
         
-        self.team1_box.set_name(app.team1_name)
-        self.team1_box.set_score(app.team1_total)
-        self.team2_box.set_name(app.team2_name)
-        self.team2_box.set_score(app.team2_total)
-        
-        self.round_lbl.set_text(f"الجولة: {app.round_number}")
+        if self._changed('team1_name', app.team1_name):
+            self.team1_box.set_name(app.team1_name)
+        if self._changed('team1_total', app.team1_total):
+            self.team1_box.set_score(app.team1_total)
+        if self._changed('team2_name', app.team2_name):
+            self.team2_box.set_name(app.team2_name)
+        if self._changed('team2_total', app.team2_total):
+            self.team2_box.set_score(app.team2_total)
         
-        self.content.clear_widgets()
+        if self._changed('round', app.round_number):
+            self.round_lbl.set_text(f"الجولة: {app.round_number}")
         
+        last = None
         if app.history:
-            last = app.history[-1]
-            
-            box = BoxLayout(orientation='vertical', size_hint_y=None, height=dp(100), padding=dp(10))
-            with box.canvas.before:
-                Color(*COLORS['card'])
-                RoundedRectangle(pos=box.pos, size=box.size, radius=[dp(10)])
-            
-            box.add_widget(ArabicLabel(
-                text=f"نتيجة الجولة {last['round']}",
-                font_size=dp(14),
-                color=COLORS['text_secondary']
-            ))
-            
-            row = BoxLayout()
-            t1_color = COLORS['success'] if last['team1'] > last['team2'] else COLORS['text']
-            row.add_widget(ArabicLabel(text=f"{app.team1_name}: {last['team1']}", color=t1_color))
-            
-            t2_color = COLORS['success'] if last['team2'] > last['team1'] else COLORS['text']
-            row.add_widget(ArabicLabel(text=f"{app.team2_name}: {last['team2']}", color=t2_color))
-            box.add_widget(row)
-            
-            self.content.add_widget(box)
-        else:
-            self.content.add_widget(ArabicLabel(
-                text="اضغط لبدء جولة جديدة",
-                color=COLORS['text_secondary'],
-                size_hint_y=None,
-                height=dp(80)
-            ))
+            entry = app.history[-1]
+            last = (entry['round'], entry['team1'], entry['team2'], app.team1_name, app.team2_name)
+        if self._changed('last', last):
+            self._show_last(last)
+    
+    def _show_last(self, last):
+        if last is None:
+            if self.empty_lbl.parent is None:
+                self.content.clear_widgets()
+                self.content.add_widget(self.empty_lbl)
+            return
+        
+        if self.last_box.parent is None:
+            self.content.clear_widgets()
+            self.content.add_widget(self.last_box)
+        
+        round_number, team1, team2, team1_name, team2_name = last
+        self.last_title.set_text(f"نتيجة الجولة {round_number}")
+        self.last_team1.set_text(f"{team1_name}: {team1}")
+        self.last_team1.color = COLORS['success'] if team1 > team2 else COLORS['text']
+        self.last_team2.set_text(f"{team2_name}: {team2}")
+        self.last_team2.color = COLORS['success'] if team2 > team1 else COLORS['text']
     
     def _start_camera_round(self, *args):
         app = self.manager.app
@@ -686,6 +763,23 @@ class GameScreen(Screen):
         self.manager.current = 'counting'
 
 
+# رموز الأنواع في card_detector
+DETECTED_SUITS = {'S': 'spade', 'H': 'heart', 'D': 'diamond', 'C': 'club'}
+
+LIVE_FPS = 12           # إطارات الوضع المباشر في الثانية (أقصى حد)
+LOCATE_WIDTH = 320      # عرض الصورة الرمادية لتتبع أماكن البطاقات بين التصنيفات
+
+
+def detected_summary(codes):
+    """(البنات بأسماء الأنواع، شيخ القبة؟) من رموز مثل QH و KD"""
+    queens = []
+    for code in codes:
+        suit = DETECTED_SUITS.get(code[-1:])
+        if code[:-1] == 'Q' and suit and suit not in queens:
+            queens.append(suit)
+    return queens, 'KH' in codes
+
+
 class CameraScreen(Screen):
     """شاشة الكاميرا للتعرف على البطاقات باستخدام AI"""
     
@@ -693,6 +787,11 @@ class CameraScreen(Screen):
         super().__init__(**kwargs)
         self.name = 'camera'
         self.camera_widget = None
+        self.worker = None      # DetectionWorker عند أول التقاط
+        self.grabber = None     # FrameGrabber: صورة الكاميرا إلى NumPy
+        self.live_event = None  # الوضع المباشر: تحليل متواصل مع تتبع البطاقات
+        self.tracker = None
+        self.locator = None     # FrameGrabber رمادي مصغر لتتبع الأماكن
         self.detected_cards = {'queens': [], 'king': False}
         Clock.schedule_once(lambda dt: self._build(), 0)
     
@@ -718,13 +817,14 @@ class CameraScreen(Screen):
         
         # عرض البطاقات المكتشفة
         self.detected_box = BoxLayout(orientation='vertical', size_hint_y=0.25, spacing=dp(5))
-        self.detected_box.add_widget(ArabicLabel(
+        self.detected_title = ArabicLabel(
             text="البطاقات المكتشفة:",
             font_size=dp(14),
             color=COLORS['text_secondary'],
             size_hint_y=None,
             height=dp(25)
-        ))
+        )
+        self.detected_box.add_widget(self.detected_title)
         self.detected_cards_row = BoxLayout(size_hint_y=None, height=dp(80))
         self.detected_box.add_widget(self.detected_cards_row)
         layout.add_widget(self.detected_box)
@@ -750,6 +850,14 @@ class CameraScreen(Screen):
         manual_btn.bind(on_press=self._go_manual)
         btn_row.add_widget(manual_btn)
         
+        self.live_btn = ArabicButton(
+            text="مباشر",
+            bg_color=COLORS['secondary'],
+            height=dp(45)
+        )
+        self.live_btn.bind(on_press=self._toggle_live)
+        btn_row.add_widget(self.live_btn)
+        
         back_btn = ArabicButton(
             text="رجوع",
             bg_color=COLORS['surface'],
@@ -769,7 +877,10 @@ class CameraScreen(Screen):
     
     def on_enter(self):
         self.detected_cards = {'queens': [], 'king': False}
+        self.manager.app.detected_from_camera = {'queens': [], 'has_king': False}
         self._update_detected_display()
+        # المفتاح ربما تغير في شاشة الإعدادات
+        self.set_api_key(getattr(self.manager.app, 'api_key', ''))
         
         # تشغيل الكاميرا
         if platform in ('android', 'ios'):
@@ -783,6 +894,12 @@ class CameraScreen(Screen):
             ))
     
     def on_leave(self):
+        self._stop_live()
+        if self.worker:
+            self.worker.cancel()
+        if self.grabber:
+            self.grabber.release()
+        self.detected_title.set_text("البطاقات المكتشفة:")
         if self.camera_widget:
             try:
                 self.camera_widget.play = False
@@ -826,12 +943,128 @@ class CameraScreen(Screen):
                 color=COLORS['text_secondary']
             ))
     
+    def _camera_texture(self):
+        return self.camera_widget.texture if self.camera_widget else None
+    
+    def set_api_key(self, api_key):
+        """مفتاح جديد للكاشف (إن كان مبنياً؛ وإلا يُقرأ من التطبيق عند بنائه)"""
+        if self.worker:
+            self.worker.detector.set_api_key(api_key)
+    
+    def _ensure_worker(self):
+        if self.worker is None:
+            from camera_frames import FrameGrabber
+            from card_detector import CardDetector
+            from detection_cache import DetectionCache
+            from detection_worker import DetectionWorker
+            # إعادة تصوير نفس الكومة تعود بالنتيجة السابقة (وتبقى بين التشغيلات)
+            data_dir = getattr(self.manager.app, 'user_data_dir', None)
+            cache = DetectionCache(path=os.path.join(data_dir, 'detection_cache.sqlite')
+                                   if data_dir else None)
+            # مع مفتاح API من الإعدادات يصنّف Roboflow الصورة الملتقطة
+            api_key = getattr(self.manager.app, 'api_key', '')
+            self.worker = DetectionWorker(CardDetector(api_key, rgba=True, cache=cache))
+            self.grabber = FrameGrabber()
+    
     def _capture(self, *args):
-        """التقاط - الانتقال لشاشة اختيار البطاقات"""
-        # حالياً ننتقل للاختيار اليدوي
-        # الـ API يحتاج إعداد من شاشة الإعدادات
+        """التقاط صورة وتحليلها في الخلفية، ثم الانتقال لتأكيد البطاقات"""
+        if self.live_event is not None:
+            # الوضع المباشر: النتائج الثابتة حتى الآن
+            self._stop_live()
+            self._confirm_detected()
+            return
+        
+        texture = self._camera_texture()
+        if texture is None:
+            # بدون كاميرا: الاختيار يدوي
+            self.manager.current = 'camera_result'
+            return
+        
+        self._ensure_worker()
+        # قراءة الإطار (RGBA) فقط في خيط الواجهة، والتحليل في الخلفية
+        # (التقاط جديد يلغي التحليل السابق)
+        self.worker.submit(self.grabber.grab(texture), self._on_detected)
+        self.detected_title.set_text("جاري التحليل...")
+    
+    def _on_detected(self, cards):
+        queens, king = detected_summary([card.card_code for card in cards])
+        self.detected_cards = {'queens': queens, 'king': king}
+        self.detected_title.set_text("البطاقات المكتشفة:")
+        self._update_detected_display()
+        self._confirm_detected()
+    
+    def _confirm_detected(self):
+        # شاشة التأكيد تبدأ بالبطاقات المكتشفة محددة
+        self.manager.app.detected_from_camera = {
+            'queens': list(self.detected_cards['queens']),
+            'has_king': self.detected_cards['king']
+        }
         self.manager.current = 'camera_result'
     
+    # ==================== الوضع المباشر ====================
+    
+    def _toggle_live(self, *args):
+        if self.live_event is None:
+            self._start_live()
+        else:
+            self._stop_live()
+    
+    def _start_live(self):
+        if self._camera_texture() is None:
+            return
+        self._ensure_worker()
+        if self.tracker is None:
+            from camera_frames import FrameGrabber
+            from card_tracker import CardTracker
+            self.tracker = CardTracker()
+            self.locator = FrameGrabber(width=LOCATE_WIDTH, gray=True)
+        self.tracker.clear()
+        self.live_event = Clock.schedule_interval(self._live_tick, 1 / LIVE_FPS)
+        self.live_btn.text = arabic("ايقاف")
+        self.detected_title.set_text("مباشر: وجّه الكاميرا للبطاقات")
+    
+    def _stop_live(self):
+        if self.live_event is None:
+            return
+        self.live_event.cancel()
+        self.live_event = None
+        self.worker.cancel()
+        self.live_btn.text = arabic("مباشر")
+        self.detected_title.set_text("البطاقات المكتشفة:")
+    
+    def _live_tick(self, dt):
+        """إطار واحد فقط قيد التحليل: إطار يصل والعامل مشغول يُتخطى"""
+        texture = self._camera_texture()
+        if texture is None or self.worker.busy:
+            return
+        if self.tracker.needs_detection:
+            # الكشف المحلي فقط: طلب شبكة كل بضعة إطارات أبطأ وأغلى
+            self.worker.submit(self.grabber.grab(texture), self._on_live_cards,
+                               analyse=partial(self.worker.detector.detect_cards, remote=False))
+        else:
+            # الصورة الرمادية يُعاد استخدامها في الإطار التالي: نسخة صغيرة للخيط العامل
+            gray = self.locator.grab(texture).copy()
+            scale = texture.width / gray.shape[1]
+            self.worker.submit(gray, self._on_live_quads,
+                               analyse=partial(self.worker.detector.locate_cards, scale=scale))
+    
+    def _on_live_cards(self, cards):
+        self.tracker.observe(cards)
+        self._show_live()
+    
+    def _on_live_quads(self, quads):
+        self.tracker.follow(quads)
+        self._show_live()
+    
+    def _show_live(self):
+        stable = self.tracker.stable_cards()
+        queens, king = detected_summary([track.code for track in stable])
+        detected = {'queens': queens, 'king': king}
+        if detected != self.detected_cards:
+            self.detected_cards = detected
+            self._update_detected_display()
+        self.detected_title.set_text(f"مباشر: {len(stable)} من {len(self.tracker.tracks)} بطاقة")
+    
     def _go_manual(self, *args):
         self.manager.current = 'counting'
     
@@ -934,10 +1167,12 @@ class CameraResultScreen(Screen):
         self.bg.size = self.size
     
     def on_enter(self):
-        # إعادة تعيين
-        for card in self.queen_cards.values():
-            card.state = 'normal'
-        self.king_card.state = 'normal'
+        # البطاقات التي اكتشفتها الكاميرا محددة، والباقي يحدده اللاعب
+        detected = getattr(self.manager.app, 'detected_from_camera', None) or {}
+        queens = detected.get('queens', [])
+        for suit, card in self.queen_cards.items():
+            card.state = 'down' if suit in queens else 'normal'
+        self.king_card.state = 'down' if detected.get('has_king') else 'normal'
     
     def _confirm(self, *args):
         """تأكيد البطاقات المكتشفة والانتقال للتدبيل"""
@@ -1224,6 +1459,9 @@ class CountingScreen(Screen):
         self.manager.current = 'doubling'
 
 
+DOUBLING_SUITS = ['spade', 'heart', 'diamond', 'club']
+
+
 class DoublingScreen(Screen):
     """شاشة اختيار التدبيل"""
     
@@ -1255,6 +1493,18 @@ class DoublingScreen(Screen):
         scroll.add_widget(self.content)
         self.layout.add_widget(scroll)
         
+        # البطاقات تُنشأ مرة واحدة، وفي كل جولة تُعرض المطلوبة منها فقط
+        self.opponent_box, self.opponent_row = self._section(
+            "هل دبل الخصم اي من هذه؟", "اختر البطاقات التي دبلها الخصم عليك",
+            (0.25, 0.15, 0.15, 1), COLORS['warning']  # لون أحمر داكن
+        )
+        self.my_box, self.my_row = self._section(
+            "هل دبلت انت على الخصم؟", "اختر البطاقات التي دبلتها على الخصم",
+            (0.12, 0.22, 0.12, 1), COLORS['success']  # لون أخضر داكن
+        )
+        self.opponent_cards = self._card_pool(self._on_opponent_card)
+        self.my_cards = self._card_pool(self._on_my_card)
+        
         calc_btn = ArabicButton(
             text="حساب النتيجة",
             bg_color=COLORS['success'],
@@ -1269,168 +1519,220 @@ class DoublingScreen(Screen):
         self.bg.pos = self.pos
         self.bg.size = self.size
     
-    def on_enter(self):
-        self.content.clear_widgets()
-        self.opponent_doubled = {}
-        self.my_doubled = {}
+    def _section(self, title, hint, bg_color, title_color):
+        """صندوق بعنوان وصف بطاقات"""
+        box = BoxLayout(orientation='vertical', size_hint_y=None, padding=dp(10))
+        box.bind(minimum_height=box.setter('height'))
+        
+        with box.canvas.before:
+            Color(*bg_color)
+            box._bg = RoundedRectangle(pos=box.pos, size=box.size, radius=[dp(10)])
+        box.bind(pos=lambda *a: setattr(box._bg, 'pos', box.pos),
+                 size=lambda *a: setattr(box._bg, 'size', box.size))
+        
+        box.add_widget(ArabicLabel(
+            text=title,
+            font_size=dp(14),
+            color=title_color,
+            size_hint_y=None,
+            height=dp(28)
+        ))
+        box.add_widget(ArabicLabel(
+            text=hint,
+            font_size=dp(11),
+            color=COLORS['text_secondary'],
+            size_hint_y=None,
+            height=dp(20)
+        ))
         
+        row = BoxLayout(size_hint_y=None, height=dp(120), spacing=dp(5))
+        box.add_widget(row)
+        return box, row
+    
+    def _card_pool(self, callback):
+        """بطاقة لكل ما يمكن تدبيله (4 ملكات والشايب) مربوطة مرة واحدة"""
+        cards = {}
+        for suit in DOUBLING_SUITS:
+            cards[f"Q_{suit}"] = CardWithRank(suit=suit, rank='Q')
+        cards["K_heart"] = CardWithRank(suit='heart', rank='K')
+        for key, card in cards.items():
+            card._card.doubling_key = key
+            card._card.bind(state=callback)
+        return cards
+    
+    def on_enter(self):
         app = self.manager.app
         data = app.current_round_data
         queens = data.get('queens', [])
         has_king = data.get('has_king', False)
         
-        # ما دبله الخصم علي
-        if queens or has_king:
-            box1 = BoxLayout(orientation='vertical', size_hint_y=None, padding=dp(10))
-            box1.bind(minimum_height=box1.setter('height'))
-            
-            with box1.canvas.before:
-                Color(0.25, 0.15, 0.15, 1)  # لون أحمر داكن
-                box1._bg = RoundedRectangle(pos=box1.pos, size=box1.size, radius=[dp(10)])
-            box1.bind(pos=lambda *a: setattr(box1._bg, 'pos', box1.pos),
-                     size=lambda *a: setattr(box1._bg, 'size', box1.size))
-            
-            box1.add_widget(ArabicLabel(
-                text="هل دبل الخصم اي من هذه؟",
-                font_size=dp(14),
-                color=COLORS['warning'],
-                size_hint_y=None,
-                height=dp(28)
-            ))
-            box1.add_widget(ArabicLabel(
-                text="اختر البطاقات التي دبلها الخصم عليك",
-                font_size=dp(11),
-                color=COLORS['text_secondary'],
-                size_hint_y=None,
-                height=dp(20)
-            ))
-            
-            row1 = BoxLayout(size_hint_y=None, height=dp(120), spacing=dp(5))
-            
-            for suit in queens:
-                card = CardWithRank(suit=suit, rank='Q')
-                card._card.bind(state=lambda inst, val, s=suit: self._set_opponent(s, 'Q', val))
-                row1.add_widget(card)
-                self.opponent_doubled[f"Q_{suit}"] = False
-            
-            if has_king:
-                card = CardWithRank(suit='heart', rank='K')
-                card._card.bind(state=lambda inst, val: self._set_opponent('heart', 'K', val))
-                row1.add_widget(card)
-                self.opponent_doubled["K_heart"] = False
-            
-            box1.add_widget(row1)
-            self.content.add_widget(box1)
-        
-        # ما دبلته أنا على الخصم
-        all_suits = ['spade', 'heart', 'diamond', 'club']
-        missing = [s for s in all_suits if s not in queens]
-        missing_king = not has_king
+        # ما دبله الخصم علي: الأوراق التي أكلتها
+        opponent = [f"Q_{s}" for s in queens] + (["K_heart"] if has_king else [])
+        # ما دبلته أنا على الخصم: الباقي
+        mine = [f"Q_{s}" for s in DOUBLING_SUITS if s not in queens]
+        if not has_king:
+            mine.append("K_heart")
         
-        if missing or missing_king:
-            box2 = BoxLayout(orientation='vertical', size_hint_y=None, padding=dp(10))
-            box2.bind(minimum_height=box2.setter('height'))
-            
-            with box2.canvas.before:
-                Color(0.12, 0.22, 0.12, 1)  # لون أخضر داكن
-                box2._bg = RoundedRectangle(pos=box2.pos, size=box2.size, radius=[dp(10)])
-            box2.bind(pos=lambda *a: setattr(box2._bg, 'pos', box2.pos),
-                     size=lambda *a: setattr(box2._bg, 'size', box2.size))
-            
-            box2.add_widget(ArabicLabel(
-                text="هل دبلت انت على الخصم؟",
-                font_size=dp(14),
-                color=COLORS['success'],
-                size_hint_y=None,
-                height=dp(28)
-            ))
-            box2.add_widget(ArabicLabel(
-                text="اختر البطاقات التي دبلتها على الخصم",
-                font_size=dp(11),
-                color=COLORS['text_secondary'],
-                size_hint_y=None,
-                height=dp(20)
-            ))
-            
-            row2 = BoxLayout(size_hint_y=None, height=dp(120), spacing=dp(5))
-            
-            for suit in missing:
-                card = CardWithRank(suit=suit, rank='Q')
-                card._card.bind(state=lambda inst, val, s=suit: self._set_mine(s, 'Q', val))
-                row2.add_widget(card)
-                self.my_doubled[f"Q_{suit}"] = False
-            
-            if missing_king:
-                card = CardWithRank(suit='heart', rank='K')
-                card._card.bind(state=lambda inst, val: self._set_mine('heart', 'K', val))
-                row2.add_widget(card)
-                self.my_doubled["K_heart"] = False
-            
-            box2.add_widget(row2)
-            self.content.add_widget(box2)
+        self.content.clear_widgets()
+        self.opponent_doubled = self._show_cards(self.opponent_box, self.opponent_row,
+                                                 self.opponent_cards, opponent)
+        self.my_doubled = self._show_cards(self.my_box, self.my_row, self.my_cards, mine)
+    
+    def _show_cards(self, box, row, cards, keys):
+        """عرض بطاقات keys فقط وإلغاء اختيارها؛ يعيد قاموس الاختيار"""
+        keys = list(dict.fromkeys(k for k in keys if k in cards))
+        row.clear_widgets()
+        for key in keys:
+            cards[key].state = 'normal'
+            row.add_widget(cards[key])
+        if keys:
+            self.content.add_widget(box)
+        return dict.fromkeys(keys, False)
     
-    def _set_opponent(self, suit, rank, state):
-        self.opponent_doubled[f"{rank}_{suit}"] = (state == 'down')
+    def _on_opponent_card(self, card, state):
+        if card.doubling_key in self.opponent_doubled:
+            self.opponent_doubled[card.doubling_key] = (state == 'down')
     
-    def _set_mine(self, suit, rank, state):
-        self.my_doubled[f"{rank}_{suit}"] = (state == 'down')
+    def _on_my_card(self, card, state):
+        if card.doubling_key in self.my_doubled:
+            self.my_doubled[card.doubling_key] = (state == 'down')
     
     def _calculate(self, *args):
         app = self.manager.app
         data = app.current_round_data
         
-        score = 0
-        
-        # الأكلات
-        score -= data['tricks'] * POINTS['trick']
-        
-        # الديناري
-        score -= data['diamonds'] * POINTS['diamond']
-        
-        # البنات
-        for suit in data['queens']:
-            if self.opponent_doubled.get(f"Q_{suit}", False):
-                score -= POINTS['queen'] * 2
-            else:
-                score -= POINTS['queen']
-        
-        # شيخ القبة
-        if data['has_king']:
-            if self.opponent_doubled.get("K_heart", False):
-                score -= POINTS['king_heart'] * 2
-            else:
-                score -= POINTS['king_heart']
-        
-        # مكافأة التدبيل على الخصم
-        for key, val in self.my_doubled.items():
-            if val:
-                if key.startswith('Q_'):
-                    score += POINTS['queen']
-                elif key.startswith('K_'):
-                    score += POINTS['king_heart']
-        
-        team2 = POINTS['round_total'] - score
+        # ترميز الجولة ثم قراءة النتيجة من جدول القواعد الحالية
+        rules = rules_engine.active()
+        code, score = rules.score_keys(
+            data['tricks'],
+            data['diamonds'],
+            data['queens'],
+            data['has_king'],
+            self.opponent_doubled,
+            self.my_doubled
+        )
         
-        app.team1_total += score
-        app.team2_total += team2
+        team2 = rules.round_total - score
         
-        app.history.append({
+        app.record_round({
             'round': app.round_number,
             'team1': score,
-            'team2': team2
+            'team2': team2,
+            'state': code
         })
         
         self.manager.current = 'game'
 
 
+class HistoryRow(RecycleDataViewBehavior, ButtonBehavior, BoxLayout):
+    """صف في جدول السجل يمكن الضغط عليه (يُعاد استخدامه أثناء التمرير)"""
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.index = None
+        self.rv = None
+        with self.canvas.before:
+            Color(*COLORS['card'])
+            self._bg = RoundedRectangle(pos=self.pos, size=self.size, radius=[dp(5)])
+        self.bind(pos=self._update_bg, size=self._update_bg)
+        
+        self.round_lbl = Label(color=COLORS['text'], size_hint_x=0.15)
+        self.team1_lbl = Label(size_hint_x=0.425, font_size=dp(16), markup=True, halign='center')
+        self.team2_lbl = Label(size_hint_x=0.425, font_size=dp(16), markup=True, halign='center')
+        self.add_widget(self.round_lbl)
+        self.add_widget(self.team1_lbl)
+        self.add_widget(self.team2_lbl)
+    
+    def _update_bg(self, *args):
+        self._bg.pos = self.pos
+        self._bg.size = self.size
+    
+    def refresh_view_attrs(self, rv, index, data):
+        """تعبئة الصف ببيانات جولة (بدون إنشاء عناصر جديدة)"""
+        self.index = index
+        self.rv = rv
+        self.round_lbl.text = data['round']
+        self.team1_lbl.text = data['team1']
+        self.team1_lbl.color = data['team1_color']
+        self.team2_lbl.text = data['team2']
+        self.team2_lbl.color = data['team2_color']
+    
+    def on_release(self):
+        if self.rv is not None and self.rv.on_row_release:
+            self.rv.on_row_release(self.index)
+
+
+class PastGameRow(RecycleDataViewBehavior, ButtonBehavior, BoxLayout):
+    """صف لعبة محفوظة في الأرشيف: التاريخ والفريقان بمجموعيهما"""
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.index = None
+        self.rv = None
+        with self.canvas.before:
+            Color(*COLORS['card'])
+            self._bg = RoundedRectangle(pos=self.pos, size=self.size, radius=[dp(5)])
+        self.bind(pos=self._update_bg, size=self._update_bg)
+        
+        self.date_lbl = Label(color=COLORS['text_secondary'], size_hint_x=0.25, font_size=dp(12))
+        self.team1_lbl = ArabicLabel(size_hint_x=0.375, font_size=dp(14))
+        self.team2_lbl = ArabicLabel(size_hint_x=0.375, font_size=dp(14))
+        self.add_widget(self.date_lbl)
+        self.add_widget(self.team1_lbl)
+        self.add_widget(self.team2_lbl)
+    
+    def _update_bg(self, *args):
+        self._bg.pos = self.pos
+        self._bg.size = self.size
+    
+    def refresh_view_attrs(self, rv, index, data):
+        self.index = index
+        self.rv = rv
+        self.date_lbl.text = data['date']
+        self.team1_lbl.set_text(data['team1'])
+        self.team2_lbl.set_text(data['team2'])
+    
+    def on_release(self):
+        if self.rv is not None and self.rv.on_row_release:
+            self.rv.on_row_release(self.index)
+
+
+def past_game_row(game):
+    """بيانات صف لعبة من list_games"""
+    from datetime import datetime
+    return {
+        'date': datetime.fromtimestamp(game['started_at']).strftime("%Y-%m-%d"),
+        'team1': f"{game['team1_name']} {game['team1_total']}",
+        'team2': f"{game['team2_name']} {game['team2_total']}",
+    }
+
+
+def history_row(entry, running):
+    """بيانات صف: نقاط الجولة + المجموع حتى الجولة بخط صغير"""
+    team1, team2 = entry['team1'], entry['team2']
+    return {
+        'round': str(entry['round']),
+        'team1': f"{team1} [size=11sp][color=888888]{running[0]}[/color][/size]",
+        'team2': f"{team2} [size=11sp][color=888888]{running[1]}[/color][/size]",
+        'team1_color': COLORS['success'] if team1 > team2 else COLORS['text'],
+        'team2_color': COLORS['success'] if team2 > team1 else COLORS['text'],
+    }
+
+
 class HistoryScreen(Screen):
     """شاشة السجل"""
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.name = 'history'
+        self._source = None             # قائمة app.history المعروضة حالياً
+        self.prefix = PrefixTotals()    # المجموع حتى كل صف
+        self._games = []                # الألعاب السابقة المعروضة من الأرشيف
+        self._more = False              # في الأرشيف صفحة بعد آخر لعبة معروضة
         Clock.schedule_once(lambda dt: self._build(), 0)
     
+    PAGE_SIZE = 20
+    
     def _build(self):
         with self.canvas.before:
             Color(*COLORS['background'])
@@ -1439,18 +1741,39 @@ class HistoryScreen(Screen):
         
         layout = BoxLayout(orientation='vertical', padding=dp(10), spacing=dp(8))
         
-        layout.add_widget(ArabicLabel(
+        self.title_lbl = ArabicLabel(
             text="سجل الجولات",
             font_size=dp(20),
             size_hint_y=None,
             height=dp(40)
-        ))
+        )
+        layout.add_widget(self.title_lbl)
         
-        scroll = ScrollView(size_hint_y=0.75)
-        self.table = BoxLayout(orientation='vertical', spacing=dp(3), size_hint_y=None)
-        self.table.bind(minimum_height=self.table.setter('height'))
-        scroll.add_widget(self.table)
-        layout.add_widget(scroll)
+        # العنوان
+        header = BoxLayout(size_hint_y=None, height=dp(35))
+        header.add_widget(Label(text="#", color=COLORS['text'], size_hint_x=0.15))
+        self.team1_header = ArabicLabel(text="", size_hint_x=0.425, font_size=dp(13))
+        self.team2_header = ArabicLabel(text="", size_hint_x=0.425, font_size=dp(13))
+        header.add_widget(self.team1_header)
+        header.add_widget(self.team2_header)
+        layout.add_widget(header)
+        
+        # الجولات (اضغط على الجولة لتعديلها)
+        self.table = HistoryList(HistoryRow, size_hint_y=0.75, on_row_release=self._row_pressed)
+        layout.add_widget(self.table)
+        # الألعاب السابقة (آخر صف "المزيد" يجلب الصفحة التالية)
+        self.past = HistoryList(PastGameRow, row_height=dp(45), size_hint_y=0.75,
+                                on_row_release=self._game_pressed)
+        self.layout = layout
+        
+        self.empty_lbl = ArabicLabel(
+            text="لا توجد جولات",
+            color=COLORS['text_secondary'],
+            size_hint_y=None,
+            height=0,
+            opacity=0
+        )
+        layout.add_widget(self.empty_lbl)
         
         self.total_lbl = ArabicLabel(
             text="",
@@ -1460,13 +1783,22 @@ class HistoryScreen(Screen):
         )
         layout.add_widget(self.total_lbl)
         
+        buttons = BoxLayout(size_hint_y=None, height=dp(45), spacing=dp(8))
+        self.past_btn = ArabicButton(
+            text="ألعاب سابقة",
+            bg_color=COLORS['surface'],
+            height=dp(45)
+        )
+        self.past_btn.bind(on_press=lambda x: self._toggle_past())
+        buttons.add_widget(self.past_btn)
         back_btn = ArabicButton(
             text="رجوع",
             bg_color=COLORS['primary'],
             height=dp(45)
         )
         back_btn.bind(on_press=lambda x: setattr(self.manager, 'current', 'game'))
-        layout.add_widget(back_btn)
+        buttons.add_widget(back_btn)
+        layout.add_widget(buttons)
         
         self.add_widget(layout)
     
@@ -1475,44 +1807,166 @@ class HistoryScreen(Screen):
         self.bg.size = self.size
     
     def on_enter(self):
-        self.table.clear_widgets()
         app = self.manager.app
+        history = app.history
+        self._show_list(self.table)
+        self.title_lbl.set_text("سجل الجولات")
+        self.past_btn.text = arabic("ألعاب سابقة")
+        self.empty_lbl.set_text("لا توجد جولات")
+        
+        self.team1_header.set_text(app.team1_name)
+        self.team2_header.set_text(app.team2_name)
+        
+        if history is self._source and len(history) >= len(self.prefix):
+            # نفس اللعبة: إضافة الجولات الجديدة فقط
+            self._update_rows(len(self.prefix))
+        else:
+            self._source = history
+            self._update_rows(0)
         
-        # العنوان
-        header = BoxLayout(size_hint_y=None, height=dp(35))
-        header.add_widget(Label(text="#", color=COLORS['text'], size_hint_x=0.15))
-        header.add_widget(ArabicLabel(text=app.team1_name, size_hint_x=0.425, font_size=dp(13)))
-        header.add_widget(ArabicLabel(text=app.team2_name, size_hint_x=0.425, font_size=dp(13)))
-        self.table.add_widget(header)
-        
-        # الجولات
-        for entry in app.history:
-            row = BoxLayout(size_hint_y=None, height=dp(40))
-            with row.canvas.before:
-                Color(*COLORS['card'])
-                RoundedRectangle(pos=row.pos, size=row.size, radius=[dp(5)])
-            
-            row.add_widget(Label(text=str(entry['round']), color=COLORS['text'], size_hint_x=0.15))
-            
-            c1 = COLORS['success'] if entry['team1'] > entry['team2'] else COLORS['text']
-            row.add_widget(Label(text=str(entry['team1']), color=c1, size_hint_x=0.425, font_size=dp(16)))
-            
-            c2 = COLORS['success'] if entry['team2'] > entry['team1'] else COLORS['text']
-            row.add_widget(Label(text=str(entry['team2']), color=c2, size_hint_x=0.425, font_size=dp(16)))
-            
-            self.table.add_widget(row)
+        empty = not history
+        self.empty_lbl.height = dp(80) if empty else 0
+        self.empty_lbl.opacity = 1 if empty else 0
         
-        if not app.history:
-            self.table.add_widget(ArabicLabel(
-                text="لا توجد جولات",
-                color=COLORS['text_secondary'],
-                size_hint_y=None,
-                height=dp(80)
-            ))
-        
-        expected = app.round_number * POINTS['round_total']
         actual = app.team1_total + app.team2_total
         self.total_lbl.set_text(f"المجموع الكلي: {app.team1_total} + {app.team2_total} = {actual}")
+    
+    def _update_rows(self, start):
+        """إعادة حساب الصفوف من start فما بعد (المجاميع من الصف السابق)"""
+        history = self._source
+        self.prefix.update_from(start, ((e['team1'], e['team2']) for e in history[start:]))
+        rows = [history_row(history[i], self.prefix[i]) for i in range(start, len(history))]
+        data = self.table.data
+        if start == len(data):
+            data.extend(rows)
+        else:
+            self.table.data = data[:start] + rows
+    
+    def _show_list(self, view):
+        """عرض جدول الجولات أو جدول الألعاب السابقة في نفس المكان"""
+        other = self.past if view is self.table else self.table
+        if other.parent is self.layout:
+            index = self.layout.children.index(other)
+            self.layout.remove_widget(other)
+            self.layout.add_widget(view, index=index)
+    
+    def _toggle_past(self):
+        if self.past.parent is self.layout:
+            self.on_enter()
+        else:
+            self._show_past_games()
+    
+    def _show_past_games(self, before=None):
+        """صفحة من الألعاب المحفوظة في الأرشيف (الأحدث أولاً)"""
+        archive = getattr(self.manager.app, 'archive', None)
+        games = []
+        if archive is not None:
+            try:
+                games = archive.list_games(limit=self.PAGE_SIZE, before=before)
+            except Exception as e:
+                print(f"Archive error: {e}")
+        
+        if before is None:
+            self._games = []
+            self._show_list(self.past)
+            self.title_lbl.set_text("الألعاب السابقة")
+            self.past_btn.text = arabic("الجولات")
+            self.team1_header.set_text("الفريق الأول")
+            self.team2_header.set_text("الفريق الثاني")
+        self._games.extend(games)
+        self._more = len(games) == self.PAGE_SIZE
+        
+        rows = [past_game_row(game) for game in self._games]
+        if self._more:
+            rows.append({'date': '', 'team1': "المزيد", 'team2': ''})
+        self.past.data = rows
+        
+        empty = not self._games
+        self.empty_lbl.set_text("لا توجد ألعاب محفوظة")
+        self.empty_lbl.height = dp(80) if empty else 0
+        self.empty_lbl.opacity = 1 if empty else 0
+        self.total_lbl.set_text(f"الألعاب: {len(self._games)}{'+' if self._more else ''}")
+    
+    def _game_pressed(self, index):
+        if self._more and index == len(self._games):
+            last = self._games[-1]
+            self._show_past_games(before=(last['started_at'], last['id']))
+    
+    def _row_pressed(self, index):
+        if index is not None and index < len(self._source):
+            self._edit_round(self._source[index])
+    
+    def _edit_round(self, entry):
+        """نافذة تعديل أو حذف جولة سابقة"""
+        app = self.manager.app
+        round_number = entry['round']
+        team1_sum, team2_sum = app.totals.cumulative(round_number)
+        
+        content = BoxLayout(orientation='vertical', padding=dp(10), spacing=dp(8))
+        content.add_widget(ArabicLabel(
+            text=f"المجموع حتى هذه الجولة: {team1_sum} / {team2_sum}",
+            font_size=dp(13),
+            color=COLORS['text_secondary'],
+            size_hint_y=None,
+            height=dp(25)
+        ))
+        content.add_widget(ArabicLabel(
+            text=f"نقاط {app.team1_name}",
+            font_size=dp(14),
+            size_hint_y=None,
+            height=dp(25)
+        ))
+        score_input = TextInput(
+            text=str(entry['team1']),
+            multiline=False,
+            input_filter='int',
+            halign='center',
+            font_size=dp(18),
+            size_hint_y=None,
+            height=dp(45)
+        )
+        content.add_widget(score_input)
+        
+        buttons = BoxLayout(size_hint_y=None, height=dp(45), spacing=dp(8))
+        save_btn = ArabicButton(text="حفظ", bg_color=COLORS['success'], height=dp(45))
+        delete_btn = ArabicButton(text="حذف", bg_color=COLORS['danger'], height=dp(45))
+        cancel_btn = ArabicButton(text="الغاء", bg_color=COLORS['surface'], height=dp(45))
+        buttons.add_widget(save_btn)
+        buttons.add_widget(delete_btn)
+        buttons.add_widget(cancel_btn)
+        content.add_widget(buttons)
+        
+        popup = Popup(
+            title=arabic(f"تعديل الجولة {round_number}"),
+            title_font=ARABIC_FONT or 'Roboto',
+            content=content,
+            size_hint=(0.9, None),
+            height=dp(260)
+        )
+        
+        def save(*args):
+            try:
+                team1_score = int(score_input.text)
+            except ValueError:
+                return
+            app.edit_round(round_number, team1_score)
+            popup.dismiss()
+            # الجولة عُدّلت في مكانها: إعادة حساب ما بعدها فقط
+            self._update_rows(self._source.index(entry))
+            self.on_enter()
+        
+        def delete(*args):
+            index = self._source.index(entry)
+            app.delete_round(round_number)
+            popup.dismiss()
+            self._source = app.history
+            self._update_rows(index)
+            self.on_enter()
+        
+        save_btn.bind(on_press=save)
+        delete_btn.bind(on_press=delete)
+        cancel_btn.bind(on_press=popup.dismiss)
+        popup.open()
 
 
 class SettingsScreen(Screen):
@@ -1705,6 +2159,10 @@ class SettingsScreen(Screen):
         except:
             pass
         
+        # الكاشف المبني في شاشة الكاميرا يستخدم المفتاح الجديد فوراً
+        if 'camera' not in self.manager.pending and self.manager.has_screen('camera'):
+            self.manager.get_screen('camera').set_api_key(key)
+        
         self.status_lbl.set_text("تم حفظ المفتاح بنجاح ✓")
         self.status_lbl.color = COLORS['success']
         
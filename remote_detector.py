@@ -0,0 +1,446 @@
+"""
+الكشف البعيد عن البطاقات (Roboflow)
+Remote card detector - pooled keep-alive HTTP client with adaptive JPEG uploads
+
+مثل analyzeImage في docs/app.js: صورة JPEG بـ base64 إلى نموذج Roboflow
+والرد قائمة predictions (المركز والأبعاد والثقة واسم البطاقة). الفرق:
+- الاتصالات تبقى مفتوحة (keep-alive) في مجموعة صغيرة تتشاركها خيوط
+  DetectionWorker: مصافحة TCP/TLS مرة واحدة لا مع كل صورة
+- مهلة للاتصال وأخرى للرد، وإعادة المحاولة عند أخطاء الشبكة و 429/5xx
+  بانتظار يتضاعف (أو Retry-After)؛ المفتاح الخاطئ (4xx) لا يُعاد
+- الصورة تُصغّر وتُخفض جودتها حتى يدخل الطلب في MAX_UPLOAD بايت،
+  والإحداثيات تعود لحجم الصورة الأصلية
+- الرد يُنقّى (detection_filter): الثقة و NMS لكل صنف ودمج زاويتي البطاقة
+
+ReplayServer خادم محلي بدل Roboflow يعيد ردوداً مسجلة (last_response أو
+ملف JSON) للاختبار وقياس الزمن بدون إنترنت أو مفتاح:
+
+    python remote_detector.py recorded.json --port 8766 --latency 120
+    CardDetector(api_key='test', remote_url='http://127.0.0.1:8766/playing-cards/1')
+"""
+
+import argparse
+import base64
+import http.client
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from card_detector import DetectedCard, MIN_CONFIDENCE, RANKS, SUITS
+from detection_filter import MERGE_DISTANCE, NMS_IOU, filter_detections
+
+ROBOFLOW_URL = 'https://detect.roboflow.com/playing-cards-ow27d/4'
+
+MAX_UPLOAD = 96 * 1024      # أقصى حجم للطلب (JPEG بـ base64) بالبايت
+UPLOAD_WIDTH = 1024         # النموذج يصغّر الصورة على الخادم: الأعرض حجم بلا فائدة
+MIN_UPLOAD_WIDTH = 320      # لا تصغير بعده حتى لو تجاوز الطلب الحد
+JPEG_QUALITIES = (80, 65, 50)   # 80 مثل analyzeImage
+POOL_SIZE = 2               # اتصالات مفتوحة (= خيوط DetectionWorker)
+CONNECT_TIMEOUT = 5.0       # ثوانٍ لفتح الاتصال
+READ_TIMEOUT = 15.0         # ثوانٍ لانتظار الرد
+RETRIES = 2                 # محاولات إضافية بعد الأولى
+BACKOFF = 0.5               # انتظار أول إعادة، ويتضاعف
+MAX_BACKOFF = 4.0
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# الخادم أغلق اتصالاً خاملاً: يُعاد الطلب على اتصال جديد بدون احتساب محاولة
+STALE_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+SUIT_NAMES = {'SPADE': 'S', 'HEART': 'H', 'DIAMOND': 'D', 'CLUB': 'C'}
+RANK_NAMES = {'ACE': 'A', 'JACK': 'J', 'QUEEN': 'Q', 'KING': 'K'}
+
+
+class RemoteError(Exception):
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+def encode_upload(image, budget: int = MAX_UPLOAD,
+                  max_width: int = UPLOAD_WIDTH) -> Tuple[bytes, float, int, int]:
+    """
+    (الطلب بـ base64، نسبة الأصل إلى المرفوعة، العرض، الجودة)
+
+    أعلى جودة تدخل في budget عند العرض الحالي، وإلا تصغير بنسبة الحجم الزائد
+    (حجم JPEG يتناسب تقريباً مع عدد البكسلات) وإعادة المحاولة.
+    """
+    import cv2
+
+    h, w = image.shape[:2]
+    width = min(w, max_width)
+    while True:
+        small = image if width == w else cv2.resize(
+            image, (width, max(1, round(h * width / w))), interpolation=cv2.INTER_AREA)
+        for quality in JPEG_QUALITIES:
+            ok, jpeg = cv2.imencode('.jpg', small, [cv2.IMWRITE_JPEG_QUALITY, quality])
+            if not ok:
+                raise RemoteError("تعذر ترميز الصورة")
+            size = (len(jpeg) + 2) // 3 * 4
+            if size <= budget:
+                break
+        if size <= budget or width <= MIN_UPLOAD_WIDTH:
+            return base64.b64encode(jpeg), w / width, width, quality
+        width = max(MIN_UPLOAD_WIDTH, int(width * min(0.9, (budget / size) ** 0.5)))
+
+
+def card_code(label: str) -> Optional[Tuple[str, str]]:
+    """(الرتبة، النوع) من اسم الصنف: "QH" أو "10d" أو "Queen of Hearts"، أو None"""
+    label = label.strip().upper()
+    rank, suit = label[:-1], label[-1:]
+    if rank in RANKS and suit in SUITS:
+        return rank, suit
+    words = label.replace('_', ' ').replace('-', ' ').split()
+    if len(words) >= 2:
+        rank = RANK_NAMES.get(words[0], words[0])
+        suit = SUIT_NAMES.get(words[-1].rstrip('S'))
+        if rank in RANKS and suit:
+            return rank, suit
+    return None
+
+
+def parse_predictions(data: Dict, scale: float = 1.0, min_confidence: float = MIN_CONFIDENCE,
+                      iou_threshold: float = NMS_IOU,
+                      merge_distance: float = MERGE_DISTANCE) -> List[DetectedCard]:
+    """رد Roboflow إلى DetectedCard بإحداثيات الصورة الأصلية، بعد filter_detections"""
+    import numpy as np
+
+    predictions = data.get('predictions', [])
+    labels = [str(pred.get('class', '')) for pred in predictions]
+    parsed = {label: card_code(label) for label in set(labels)}
+    codes = sorted({code for code in parsed.values() if code is not None})
+    if not codes:
+        return []
+    index = {code: i for i, code in enumerate(codes)}
+    rows = [(pred['x'], pred['y'], pred['width'], pred['height'], pred.get('confidence', 0))
+            for pred, label in zip(predictions, labels) if parsed[label] is not None]
+    classes = [index[parsed[label]] for label in labels if parsed[label] is not None]
+
+    values = np.array(rows, np.float32)
+    half = values[:, 2:4] / 2
+    boxes = np.hstack([values[:, :2] - half, values[:, :2] + half]) * scale
+    boxes, scores, classes, _ = filter_detections(
+        boxes, values[:, 4], classes, min_confidence, iou_threshold, merge_distance)
+
+    cards = []
+    for (x0, y0, x1, y1), score, cls in zip(boxes.tolist(), scores.tolist(), classes.tolist()):
+        rank, suit = codes[cls]
+        corners = [(x0, y0), (x1, y0), (x1, y1), (x0, y1)]
+        cards.append(DetectedCard(rank + suit, rank, suit, score, corners))
+    return cards
+
+
+# ==================== الاتصالات ====================
+
+class ConnectionPool:
+    """اتصالات مفتوحة لمضيف واحد: الخيط يأخذ اتصالاً خاملاً أو يفتح جديداً"""
+
+    def __init__(self, url: str, size: int = POOL_SIZE,
+                 connect_timeout: float = CONNECT_TIMEOUT, read_timeout: float = READ_TIMEOUT):
+        parts = urlsplit(url)
+        self.https = parts.scheme == 'https'
+        self.host = parts.hostname
+        self.port = parts.port
+        self.size = size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.opened = 0
+        self.reused = 0
+        self._idle: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+
+    def acquire(self) -> Tuple[http.client.HTTPConnection, bool]:
+        """(الاتصال، هل كان مفتوحاً من قبل)"""
+        with self._lock:
+            if self._idle:
+                self.reused += 1
+                return self._idle.pop(), True
+        cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+        conn = cls(self.host, self.port, timeout=self.connect_timeout)
+        conn.connect()
+        conn.sock.settimeout(self.read_timeout)
+        with self._lock:
+            self.opened += 1
+        return conn, False
+
+    def release(self, conn):
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+class RemoteDetector:
+    """كشف البطاقات بنموذج Roboflow عبر اتصالات مفتوحة (آمن لأكثر من خيط)"""
+
+    def __init__(self, api_key: str, url: str = ROBOFLOW_URL, budget: int = MAX_UPLOAD,
+                 max_width: int = UPLOAD_WIDTH, retries: int = RETRIES,
+                 backoff: float = BACKOFF, min_confidence: float = MIN_CONFIDENCE,
+                 pool_size: int = POOL_SIZE, connect_timeout: float = CONNECT_TIMEOUT,
+                 read_timeout: float = READ_TIMEOUT, iou_threshold: float = NMS_IOU,
+                 merge_distance: float = MERGE_DISTANCE):
+        self.api_key = api_key
+        self.url = url
+        self.budget = budget
+        self.max_width = max_width
+        self.retries = retries
+        self.backoff = backoff
+        self.min_confidence = min_confidence
+        self.iou_threshold = iou_threshold      # NMS لكل صنف (detection_filter)
+        self.merge_distance = merge_distance    # دمج زاويتي البطاقة الواحدة
+        self.pool = ConnectionPool(url, pool_size, connect_timeout, read_timeout)
+        self.path = urlsplit(url).path or '/'
+        self.last_response = None   # آخر رد ناجح (للتسجيل وإعادته في ReplayServer)
+        self.last_upload = None     # (العرض، الجودة، البايتات) لآخر صورة
+        self.requests = 0
+        self.retried = 0
+        self.failures = 0
+        self.bytes_sent = 0
+        self.request_ms = 0.0
+        self._stats_lock = threading.Lock()
+
+    def detect(self, image) -> List[DetectedCard]:
+        """البطاقات في صورة BGR؛ RemoteError إذا فشلت كل المحاولات"""
+        body, scale, width, quality = encode_upload(image, self.budget, self.max_width)
+        self.last_upload = (width, quality, len(body))
+        start = time.perf_counter()
+        data = self._post(body)
+        with self._stats_lock:
+            self.requests += 1
+            self.bytes_sent += len(body)
+            self.request_ms += (time.perf_counter() - start) * 1000
+        self.last_response = data
+        return parse_predictions(data, scale, self.min_confidence,
+                                 self.iou_threshold, self.merge_distance)
+
+    def close(self):
+        self.pool.close()
+
+    def stats(self) -> Dict:
+        return {
+            'requests': self.requests,
+            'retries': self.retried,
+            'failures': self.failures,
+            'connections': self.pool.opened,
+            'reused': self.pool.reused,
+            'bytes_sent': self.bytes_sent,
+            'mean_ms': self.request_ms / self.requests if self.requests else 0.0,
+        }
+
+    def _post(self, body: bytes) -> Dict:
+        target = f"{self.path}?api_key={self.api_key}"
+        headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+        attempt = 0
+        while True:
+            delay = None
+            try:
+                conn, reused = self.pool.acquire()
+            except OSError as e:
+                error = RemoteError(f"تعذر الاتصال: {e}")
+            else:
+                try:
+                    conn.request('POST', target, body, headers)
+                    response = conn.getresponse()
+                    payload = response.read()
+                except (OSError, http.client.HTTPException) as e:
+                    conn.close()
+                    if reused and isinstance(e, STALE_ERRORS):
+                        continue
+                    error = RemoteError(f"خطأ في الشبكة: {e}")
+                else:
+                    if response.will_close:
+                        conn.close()
+                    else:
+                        self.pool.release(conn)
+                    if response.status == 200:
+                        try:
+                            return json.loads(payload)
+                        except ValueError:
+                            raise self._fail(RemoteError("رد غير صالح", response.status))
+                    error = RemoteError(f"API Error: {response.status}", response.status)
+                    if response.status not in RETRY_STATUSES:
+                        raise self._fail(error)
+                    delay = _retry_after(response.getheader('Retry-After'))
+
+            if attempt >= self.retries:
+                raise self._fail(error)
+            attempt += 1
+            with self._stats_lock:
+                self.retried += 1
+            if delay is None:
+                delay = self.backoff * 2 ** (attempt - 1) * random.uniform(0.5, 1.0)
+            time.sleep(min(delay, MAX_BACKOFF))
+
+    def _fail(self, error: RemoteError) -> RemoteError:
+        with self._stats_lock:
+            self.failures += 1
+        return error
+
+
+def _retry_after(value) -> Optional[float]:
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+# ==================== خادم الإعادة ====================
+
+class ReplayServer:
+    """
+    خادم محلي بدل Roboflow: يعيد الردود المسجلة بالترتيب (ثم من البداية)
+
+    الإحداثيات تُحوَّل من حجم الصورة المسجل (image.width) إلى حجم الصورة
+    المرفوعة فعلاً. للقياس: handshake ثوانٍ عند فتح كل اتصال (مصافحة
+    TCP/TLS عبر الشبكة)، و latency لكل طلب، و bandwidth بايت/ثانية للرفع.
+    failures: ردود تسبق الردود المسجلة، رقم حالة HTTP أو 'drop' (إغلاق بدون رد).
+    """
+
+    def __init__(self, responses, host: str = '127.0.0.1', port: int = 0,
+                 latency: float = 0.0, handshake: float = 0.0,
+                 bandwidth: Optional[float] = None, failures=()):
+        self.responses = [responses] if isinstance(responses, dict) else list(responses)
+        self.latency = latency
+        self.handshake = handshake
+        self.bandwidth = bandwidth
+        self.failures = list(failures)
+        self.requests = 0
+        self.connections = 0
+        self.bytes_received = 0
+        self.api_keys = set()
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/playing-cards/1"
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self._httpd.serve_forever,
+                                        name='ReplayServer', daemon=True)
+        self._thread.start()
+        return self.url
+
+    def serve_forever(self):
+        self._httpd.serve_forever()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _next(self, body: bytes):
+        """(الحالة، الرد) للطلب التالي"""
+        with self._lock:
+            index = self.requests
+            self.requests += 1
+            self.bytes_received += len(body)
+            if self.failures:
+                return self.failures.pop(0), None
+        recorded = self.responses[index % len(self.responses)]
+        return 200, _rescale(recorded, body)
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'   # keep-alive
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+                time.sleep(server.handshake)
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                body = self.rfile.read(length)
+                query = parse_qs(urlsplit(self.path).query)
+                with server._lock:
+                    server.api_keys.update(query.get('api_key', []))
+                delay = server.latency
+                if server.bandwidth:
+                    delay += len(body) / server.bandwidth
+                time.sleep(delay)
+
+                status, data = server._next(body)
+                if status == 'drop':
+                    self.close_connection = True
+                    return
+                payload = json.dumps(data if data is not None else {'message': 'replayed failure'}).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def _rescale(recorded: Dict, body: bytes) -> Dict:
+    """الرد المسجل بإحداثيات الصورة المرفوعة (مثل النموذج الحقيقي)"""
+    image = recorded.get('image')
+    size = _jpeg_size(base64.b64decode(body)) if image else None
+    if size is None:
+        return recorded
+    width, height = size
+    fx = width / image['width']
+    fy = height / image['height']
+    scaled = dict(recorded, image={'width': width, 'height': height})
+    scaled['predictions'] = [
+        dict(p, x=p['x'] * fx, y=p['y'] * fy, width=p['width'] * fx, height=p['height'] * fy)
+        for p in recorded.get('predictions', [])
+    ]
+    return scaled
+
+
+def _jpeg_size(jpeg: bytes) -> Optional[Tuple[int, int]]:
+    """(العرض، الارتفاع) من ترويسة SOF بدون فك الصورة"""
+    i = 2
+    while i + 9 < len(jpeg) and jpeg[i] == 0xFF:
+        marker = jpeg[i + 1]
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            return (int.from_bytes(jpeg[i + 7:i + 9], 'big'),
+                    int.from_bytes(jpeg[i + 5:i + 7], 'big'))
+        i += 2 + int.from_bytes(jpeg[i + 2:i + 4], 'big')
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="خادم محلي يعيد ردود Roboflow مسجلة")
+    parser.add_argument('responses', help="ملف JSON: رد واحد أو قائمة ردود")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--latency', type=float, default=0.0, help="ms لكل طلب")
+    parser.add_argument('--handshake', type=float, default=0.0, help="ms لكل اتصال جديد")
+    args = parser.parse_args()
+
+    with open(args.responses, encoding='utf-8') as f:
+        responses = json.load(f)
+    server = ReplayServer(responses, args.host, args.port,
+                          args.latency / 1000, args.handshake / 1000)
+    print(f"Replaying {len(server.responses)} responses on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,7 @@ from kivy.uix.label import Label
 from kivy.uix.popup import Popup
 from kivy.uix.togglebutton import ToggleButton
 from kivy.uix.image import Image
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
 from kivy.graphics import Color, Rectangle, RoundedRectangle
 from kivy.properties import StringProperty, NumericProperty, BooleanProperty, ListProperty
 from kivy.clock import Clock
@@ -21,21 +22,34 @@ from kivy.metrics import dp
 import os
 import tempfile
 
-# مكتبات دعم النص العربي
-import arabic_reshaper
-from bidi.algorithm import get_display
+# دعم النص العربي (تشكيل مع ذاكرة مؤقتة)
+from arabic_text import shaping_cache
+
+from cc_core import rules as rules_engine
+from cc_core.totals import PrefixTotals
+from history_list import HistoryList
+from app_config import SUIT_NAMES
 
 # مسار الخط العربي
 FONT_PATH = os.path.join(os.path.dirname(__file__), 'fonts', 'NotoSansArabic.ttf')
 ARABIC_FONT = 'Arabic' if os.path.exists(FONT_PATH) else None
 
 
+# أسماء الأنواع العربية في هذه الشاشات -> مفاتيح محرك القواعد
+SUIT_KEYS = {name: suit for suit, name in SUIT_NAMES.items()}
+
+
+def engine_key(key):
+    """تحويل مفتاح مثل "Q_قبة" أو "K_قبة" إلى مفتاح المحرك ("Q_heart" أو "K_heart")"""
+    rank, suit = key.split('_', 1)
+    return 'K_heart' if rank == 'K' else f"Q_{SUIT_KEYS.get(suit, suit)}"
+
+
 def arabic(text):
     """تحويل النص العربي ليظهر بشكل صحيح"""
     if not text:
         return text
-    reshaped = arabic_reshaper.reshape(text)
-    return get_display(reshaped)
+    return shaping_cache.get(text)
 
 
 class RTLLabel(Label):
@@ -173,27 +187,28 @@ class HomeScreen(Screen):
         self.manager.current = 'history'
     
     def show_rules(self, instance):
-        rules_text = """
+        rules = rules_engine.active()
+        rules_text = f"""
 📜 قواعد العدّ:
 
 🃏 الأكلات:
-• كل أكلة (4 ورقات) = -15 نقطة
+• كل أكلة (4 ورقات) = -{rules.trick} نقطة
 
 ♦️ الديناري:
-• كل ورقة ديناري = -10 نقاط
+• كل ورقة ديناري = -{rules.diamond} نقاط
 
 👸 البنات (Q):
-• كل بنت عادية = -25 نقطة
-• كل بنت مدبلة = -50 نقطة
+• كل بنت عادية = -{rules.queen} نقطة
+• كل بنت مدبلة = -{rules.queen * 2} نقطة
 
 👑 شيخ القبة (K ♥):
-• عادي = -75 نقطة
-• مدبل = -150 نقطة
+• عادي = -{rules.king_heart} نقطة
+• مدبل = -{rules.king_heart * 2} نقطة
 
 ✨ التدبيل للخصم:
 إذا دبّلت ورقة والخصم أكلها:
-• بنت = +25 نقطة لك
-• شيخ القبة = +75 نقطة لك
+• بنت = +{rules.queen} نقطة لك
+• شيخ القبة = +{rules.king_heart} نقطة لك
         """
         
         popup = Popup(
@@ -383,8 +398,9 @@ class ManualInputScreen(Screen):
         self.add_widget(main_layout)
     
     def increase_cards(self, instance):
-        self.total_cards += 4  # زيادة بأكلة كاملة
-        self.cards_label.text = str(self.total_cards)
+        if self.total_cards < 52:   # 13 أكلة كحد NumberSelector
+            self.total_cards += 4  # زيادة بأكلة كاملة
+            self.cards_label.text = str(self.total_cards)
     
     def decrease_cards(self, instance):
         if self.total_cards >= 4:
@@ -392,8 +408,9 @@ class ManualInputScreen(Screen):
             self.cards_label.text = str(self.total_cards)
     
     def increase_diamonds(self, instance):
-        self.diamond_count += 1
-        self.diamond_label.text = str(self.diamond_count)
+        if self.diamond_count < 13:
+            self.diamond_count += 1
+            self.diamond_label.text = str(self.diamond_count)
     
     def decrease_diamonds(self, instance):
         if self.diamond_count > 0:
@@ -679,47 +696,41 @@ class ResultScreen(Screen):
         queens = data.get('queens', [])
         has_king = data.get('has_king_heart', False)
         
-        # نقاط الأكلات
+        # النقاط من جدول القواعد الحالية (نفس حساب الشاشات الحديثة)
+        rules = rules_engine.active()
         tricks = total_cards // 4
-        tricks_points = -tricks * 15
-        
-        # نقاط الديناري
-        diamond_points = -diamond_count * 10
+        code, total = rules.score_keys(
+            tricks,
+            diamond_count,
+            [SUIT_KEYS.get(q['suit'], q['suit']) for q in queens],
+            has_king,
+            {engine_key(k): v for k, v in doubled_by.items()},
+            {engine_key(k): v for k, v in doubled_to.items()}
+        )
+        tricks_points, diamond_points, queens_points, king_points, bonus_points = \
+            rules.breakdown(code)
         
-        # نقاط البنات
-        queens_points = 0
+        # تفاصيل البنات
         queens_details = []
         for queen in queens:
             suit = queen['suit']
             is_doubled = doubled_by.get(f"Q_{suit}", False)
-            value = -50 if is_doubled else -25
-            queens_points += value
+            value = -rules.queen * (2 if is_doubled else 1)
             doubled_text = " (مدبلة)" if is_doubled else ""
             queens_details.append(f"Q {suit}{doubled_text}: {value}")
         
-        # نقاط شيخ القبة
-        king_points = 0
+        # تفاصيل شيخ القبة
         king_detail = ""
         if has_king:
             is_doubled = doubled_by.get("K_قبة", False)
-            king_points = -150 if is_doubled else -75
             doubled_text = " (مدبل)" if is_doubled else ""
             king_detail = f"K قبة{doubled_text}: {king_points}"
         
-        # مكافأة التدبيل للخصم (موجب)
-        bonus_points = 0
-        bonus_details = []
-        for key, is_doubled in doubled_to.items():
-            if is_doubled:
-                if key.startswith("Q_"):
-                    bonus_points += 25
-                    bonus_details.append(f"{key}: +25")
-                elif key.startswith("K_"):
-                    bonus_points += 75
-                    bonus_details.append(f"{key}: +75")
-        
-        # المجموع
-        total = tricks_points + diamond_points + queens_points + king_points + bonus_points
+        # تفاصيل مكافأة التدبيل للخصم (موجب)
+        bonus_details = [
+            f"{key}: +{rules.card_value(engine_key(key))}"
+            for key, is_doubled in doubled_to.items() if is_doubled
+        ]
         
         # === عرض النتائج ===
         results = [
@@ -755,8 +766,7 @@ class ResultScreen(Screen):
         
         # === نقاط الفريقين ===
         # مجموع الجولة للفريقين يجب أن يساوي -500
-        ROUND_TOTAL = -500
-        team2_score = ROUND_TOTAL - total
+        team2_score = rules.round_total - total
         
         # نقاط فريقك
         team1_row = BoxLayout(size_hint_y=None, height=dp(60))
@@ -817,6 +827,37 @@ class ResultScreen(Screen):
         self.manager.current = 'home'
 
 
+def score_color(score):
+    return (0.2, 0.8, 0.2, 1) if score > -250 else (0.8, 0.2, 0.2, 1)
+
+
+class HistoryRoundRow(RecycleDataViewBehavior, BoxLayout):
+    """صف جولة في السجل (يُعاد استخدامه أثناء التمرير)"""
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.round_lbl = Label(font_size=dp(16), size_hint_x=0.3)
+        self.team1_lbl = Label(font_size=dp(18), size_hint_x=0.35, markup=True, halign='center')
+        self.team2_lbl = Label(font_size=dp(18), size_hint_x=0.35, markup=True, halign='center')
+        self.add_widget(self.round_lbl)
+        self.add_widget(self.team1_lbl)
+        self.add_widget(self.team2_lbl)
+    
+    def refresh_view_attrs(self, rv, index, data):
+        self.round_lbl.text = data['round']
+        self.team1_lbl.text = data['team1']
+        self.team1_lbl.color = data['team1_color']
+        self.team2_lbl.text = data['team2']
+        self.team2_lbl.color = data['team2_color']
+
+
+def round_scores(entry):
+    """نقاط الفريقين في جولة (مع دعم السجل القديم)"""
+    team1 = entry.get('team1_score', entry.get('total', 0))
+    team2 = entry.get('team2_score', rules_engine.active().round_total - team1)
+    return team1, team2
+
+
 class HistoryScreen(Screen):
     """شاشة السجل"""
     
@@ -838,13 +879,36 @@ class HistoryScreen(Screen):
         )
         main_layout.add_widget(title)
         
-        # منطقة السجل
-        scroll = ScrollView(size_hint_y=0.8)
+        # منطقة السجل: جولات اللعبة الحالية أو الألعاب السابقة
+        self.body = BoxLayout(size_hint_y=0.8)
+        main_layout.add_widget(self.body)
+        
+        self.rounds_view = BoxLayout(orientation='vertical', spacing=dp(5))
+        header = BoxLayout(size_hint_y=None, height=dp(40))
+        header.add_widget(RTLLabel(text="الجولة", halign='center', size_hint_x=0.3))
+        header.add_widget(RTLLabel(text="فريقك", halign='center', size_hint_x=0.35))
+        header.add_widget(RTLLabel(text="الخصم", halign='center', size_hint_x=0.35))
+        self.rounds_view.add_widget(header)
+        self.rounds_list = HistoryList(HistoryRoundRow, row_height=dp(50), spacing=dp(5))
+        self.rounds_view.add_widget(self.rounds_list)
+        self.totals_row = BoxLayout(size_hint_y=None, height=dp(50))
+        self.totals_row.add_widget(RTLLabel(text="المجموع:", halign='center', size_hint_x=0.3, font_size=dp(16)))
+        self.team1_total_lbl = Label(font_size=dp(20), size_hint_x=0.35, bold=True)
+        self.team2_total_lbl = Label(font_size=dp(20), size_hint_x=0.35, bold=True)
+        self.totals_row.add_widget(self.team1_total_lbl)
+        self.totals_row.add_widget(self.team2_total_lbl)
+        self.rounds_view.add_widget(self.totals_row)
+        
+        self.empty_label = RTLLabel(text="لا يوجد سجل بعد", halign='center')
+        
+        scroll = ScrollView()
         self.history_content = BoxLayout(orientation='vertical', spacing=dp(5), size_hint_y=None)
         self.history_content.bind(minimum_height=self.history_content.setter('height'))
-        
         scroll.add_widget(self.history_content)
-        main_layout.add_widget(scroll)
+        self.past_view = scroll
+        
+        self._source = None             # قائمة app.history المعروضة حالياً
+        self.prefix = PrefixTotals()    # المجموع حتى كل جولة
         
         # المجموع الكلي
         self.total_label = RTLLabel(
@@ -865,6 +929,12 @@ class HistoryScreen(Screen):
         )
         controls.add_widget(clear_btn)
         
+        past_btn = StyledButton(
+            text="🗂️ ألعاب سابقة",
+            on_press=self.show_past_games
+        )
+        controls.add_widget(past_btn)
+        
         back_btn = StyledButton(
             text="🔙 رجوع",
             on_press=self.go_back
@@ -875,76 +945,105 @@ class HistoryScreen(Screen):
         
         self.add_widget(main_layout)
     
-    def on_enter(self):
-        """تحديث السجل عند الدخول"""
-        self.history_content.clear_widgets()
-        
-        app = self.manager.app
-        history = getattr(app, 'history', [])
+    PAGE_SIZE = 20
+    
+    def show_past_games(self, instance, before=None):
+        """صفحة من الألعاب المحفوظة في الأرشيف (الأحدث أولاً)"""
+        archive = getattr(self.manager.app, 'archive', None)
+        if archive is None:
+            return
+        try:
+            games = archive.list_games(limit=self.PAGE_SIZE, before=before)
+        except Exception as e:
+            print(f"Archive error: {e}")
+            return
+        
+        if before is None:
+            self._show(self.past_view)
+            self.history_content.clear_widgets()
+            self.history_content.add_widget(RTLLabel(
+                text="الألعاب السابقة",
+                font_size=dp(20),
+                halign='center',
+                size_hint_y=None,
+                height=dp(40)
+            ))
+        elif self.history_content.children:
+            # إزالة زر "المزيد" السابق
+            self.history_content.remove_widget(self.history_content.children[0])
         
-        team1_total = 0
-        team2_total = 0
-        round_count = len(history)
-        
-        # عنوان الجدول
-        if history:
-            header = BoxLayout(size_hint_y=None, height=dp(40))
-            header.add_widget(RTLLabel(text="الجولة", halign='center', size_hint_x=0.3))
-            header.add_widget(RTLLabel(text="فريقك", halign='center', size_hint_x=0.35))
-            header.add_widget(RTLLabel(text="الخصم", halign='center', size_hint_x=0.35))
-            self.history_content.add_widget(header)
-        
-        for i, entry in enumerate(history, 1):
-            team1 = entry.get('team1_score', entry.get('total', 0))  # دعم السجل القديم
-            team2 = entry.get('team2_score', -500 - team1)
-            team1_total += team1
-            team2_total += team2
-            
+        from datetime import datetime
+        for game in games:
             row = BoxLayout(size_hint_y=None, height=dp(50))
-            
-            # رقم الجولة
-            row.add_widget(Label(text=f"{i}", font_size=dp(16), size_hint_x=0.3))
-            
-            # نقاط فريقك
-            color1 = (0.2, 0.8, 0.2, 1) if team1 > -250 else (0.8, 0.2, 0.2, 1)
-            row.add_widget(Label(text=str(team1), font_size=dp(18), size_hint_x=0.35, color=color1))
-            
-            # نقاط الخصم
-            color2 = (0.2, 0.8, 0.2, 1) if team2 > -250 else (0.8, 0.2, 0.2, 1)
-            row.add_widget(Label(text=str(team2), font_size=dp(18), size_hint_x=0.35, color=color2))
-            
+            date = datetime.fromtimestamp(game['started_at']).strftime("%Y-%m-%d")
+            row.add_widget(Label(text=date, font_size=dp(14), size_hint_x=0.3))
+            row.add_widget(RTLLabel(
+                text=f"{game['team1_name']} {game['team1_total']}",
+                halign='center', size_hint_x=0.35
+            ))
+            row.add_widget(RTLLabel(
+                text=f"{game['team2_name']} {game['team2_total']}",
+                halign='center', size_hint_x=0.35
+            ))
             self.history_content.add_widget(row)
         
-        if not history:
+        if not games and before is None:
             self.history_content.add_widget(RTLLabel(
-                text="لا يوجد سجل بعد",
+                text="لا توجد ألعاب محفوظة",
                 halign='center',
                 size_hint_y=None,
                 height=dp(100)
             ))
-        else:
-            # خط فاصل
-            self.history_content.add_widget(RTLLabel(
-                text="─" * 40,
-                halign='center',
+        elif len(games) == self.PAGE_SIZE:
+            last = (games[-1]['started_at'], games[-1]['id'])
+            self.history_content.add_widget(StyledButton(
+                text="المزيد",
                 size_hint_y=None,
-                height=dp(20)
+                height=dp(50),
+                on_press=lambda btn: self.show_past_games(btn, before=last)
             ))
-            
-            # صف المجاميع
-            totals_row = BoxLayout(size_hint_y=None, height=dp(50))
-            totals_row.add_widget(RTLLabel(text="المجموع:", halign='center', size_hint_x=0.3, font_size=dp(16)))
-            
-            color1 = (0.2, 0.8, 0.2, 1) if team1_total > team2_total else (0.8, 0.2, 0.2, 1)
-            totals_row.add_widget(Label(text=str(team1_total), font_size=dp(20), size_hint_x=0.35, color=color1, bold=True))
-            
-            color2 = (0.2, 0.8, 0.2, 1) if team2_total > team1_total else (0.8, 0.2, 0.2, 1)
-            totals_row.add_widget(Label(text=str(team2_total), font_size=dp(20), size_hint_x=0.35, color=color2, bold=True))
-            
-            self.history_content.add_widget(totals_row)
+    
+    def _show(self, view):
+        if view.parent is not self.body:
+            self.body.clear_widgets()
+            self.body.add_widget(view)
+    
+    def on_enter(self):
+        """تحديث السجل عند الدخول (الجولات الجديدة فقط إن كانت نفس اللعبة)"""
+        app = self.manager.app
+        history = getattr(app, 'history', [])
+        
+        if history is self._source and len(history) >= len(self.prefix):
+            start = len(self.prefix)
+        else:
+            self._source, start = history, 0
+        scores = [round_scores(entry) for entry in history[start:]]
+        self.prefix.update_from(start, scores)
+        rows = [
+            {'round': str(i + 1),
+             'team1': f"{team1} [size=12sp][color=888888]{self.prefix[i][0]}[/color][/size]",
+             'team2': f"{team2} [size=12sp][color=888888]{self.prefix[i][1]}[/color][/size]",
+             'team1_color': score_color(team1),
+             'team2_color': score_color(team2)}
+            for i, (team1, team2) in enumerate(scores, start)
+        ]
+        data = self.rounds_list.data
+        if start == len(data):
+            data.extend(rows)
+        else:
+            self.rounds_list.data = data[:start] + rows
+        
+        team1_total, team2_total = self.prefix.totals
+        self._show(self.rounds_view if history else self.empty_label)
+        
+        win, lose = (0.2, 0.8, 0.2, 1), (0.8, 0.2, 0.2, 1)
+        self.team1_total_lbl.text = str(team1_total)
+        self.team1_total_lbl.color = win if team1_total > team2_total else lose
+        self.team2_total_lbl.text = str(team2_total)
+        self.team2_total_lbl.color = win if team2_total > team1_total else lose
         
         # المجموع المتوقع
-        expected_total = round_count * -500
+        expected_total = len(history) * rules_engine.active().round_total
         actual_total = team1_total + team2_total
         
         self.total_label.text = f"المجموع الكلي: {actual_total} (المتوقع: {expected_total})"